@@ -3,7 +3,7 @@ import { v } from "convex/values";
 import { Doc, Id } from "../_generated/dataModel";
 import { internal } from "../_generated/api";
 import { callChatWithJsonSchema, DEFAULT_CHAT_MODEL } from "./openai";
-import agentSkills from "../skills/agentSkills.generated.json";
+import { SKILL_SHARD_BY_KEY, loadSkillShard } from "../skills/generated";
 
 type AgentSkillSeed = {
     skillKey: string;
@@ -13,11 +13,27 @@ type AgentSkillSeed = {
     inputSchema: string;
     outputSchema: string;
     prompt: string;
+    promptPrefix?: string;
     guidelines: string;
+    runtimeContent?: string;
+    runtimeSystemPrompt?: string;
+    runtimeOutputSchema?: object;
+};
+
+// Positions into `skills`, written by skill_toolchain.catalog.
+type AgentSkillsIndex = {
+    byKey: Record<string, number>;
+    byStage: Record<string, number[]>;
+    byChannel: Record<string, number[]>;
+    byTool: Record<string, number[]>;
 };
 
 type AgentSkillsGeneratedJson = {
+    globalPrompt?: string;
+    categoryPrompts?: Record<string, string>;
     skills: AgentSkillSeed[];
+    meta?: { promptMode?: "materialized" | "composed" };
+    index?: AgentSkillsIndex;
 };
 
 function buildSkillPrompt(prompt: string, guidelines: string) {
@@ -27,18 +43,39 @@ function buildSkillPrompt(prompt: string, guidelines: string) {
     return blocks.join("\n\n");
 }
 
-function getGeneratedAgentSkillByKey(skillKey: string) {
-    const generated = agentSkills as unknown as AgentSkillsGeneratedJson | AgentSkillSeed[];
-    const skills = Array.isArray(generated) ? generated : generated.skills;
+function composeGeneratedPrompt(generated: AgentSkillsGeneratedJson | AgentSkillSeed[], skill: AgentSkillSeed) {
+    // Composed registries store shared blocks once; see skill_toolchain/registry.py.
+    if (Array.isArray(generated) || generated.meta?.promptMode !== "composed") return skill.prompt;
+    return (
+        (skill.promptPrefix ?? "") +
+        (generated.globalPrompt ?? "") +
+        (generated.categoryPrompts?.[skill.stage] ?? "") +
+        (skill.prompt ?? "")
+    );
+}
+
+// Loads only the stage shard holding this skill instead of the whole registry.
+async function getGeneratedAgentSkillByKey(skillKey: string) {
+    const shard = SKILL_SHARD_BY_KEY[skillKey];
+    if (!shard) return null;
+    const generated = (await loadSkillShard(shard)) as unknown as AgentSkillsGeneratedJson;
+    const skills = generated.skills;
     if (!Array.isArray(skills)) return null;
-    const found = skills.find((s) => s.skillKey === skillKey);
+    const position = generated.index?.byKey[skillKey];
+    const indexed = position === undefined ? undefined : skills[position];
+    // Fall back to a scan if the index is missing or stale.
+    const found = indexed?.skillKey === skillKey ? indexed : skills.find((s) => s.skillKey === skillKey);
     if (!found) return null;
     return {
         key: found.skillKey,
         skillKey: found.skillKey,
-        content: buildSkillPrompt(found.prompt, found.guidelines),
+        content: found.runtimeContent ?? buildSkillPrompt(composeGeneratedPrompt(generated, found), found.guidelines),
         inputSchemaJson: found.inputSchema || "{}",
         outputSchemaJson: found.outputSchema || "{}",
+        // Pre-rendered by skill_toolchain.runtime (runtimeOutputSchema is the
+        // compiled minimal schema); absent when not emitted.
+        runtimeSystemPrompt: found.runtimeSystemPrompt,
+        runtimeOutputSchema: found.runtimeOutputSchema,
     } as const;
 }
 
@@ -132,10 +169,16 @@ export const getSkillByKey = internalQuery({
     },
 });
 
+export function buildSkillSystemPrompt(promptContent: string, outputSchema: unknown) {
+    return `${promptContent}\n\nRESPONSE FORMAT INSTRUCTIONS:\nYou must output a valid JSON object.\nThe object must strictly follow this JSON Schema structure:\n\`\`\`json\n${JSON.stringify(outputSchema, null, 2)}\n\`\`\`\nDo not include the schema keys (like "properties", "type", "required") in your output unless they are part of the data. Output only the instance data.`;
+}
+
+type PreRenderedSkill = { runtimeSystemPrompt?: string; runtimeOutputSchema?: object };
+
 // Main runner logic
 export async function runSkillLogic(
     ctx: any, // ActionCtx
-    skillDef: Doc<"skills"> | { key?: string; skillKey?: string; content?: string; inputSchema?: string; outputSchema?: string; inputSchemaJson?: string; outputSchemaJson?: string }, 
+    skillDef: Doc<"skills"> | { key?: string; skillKey?: string; content?: string; inputSchema?: string; outputSchema?: string; inputSchemaJson?: string; outputSchemaJson?: string } & PreRenderedSkill, 
     input: any
 ): Promise<SkillRunResult> {
     
@@ -153,9 +196,10 @@ export async function runSkillLogic(
 
     // 2. Call LLM
     try {
-        const outputSchema = JSON.parse(outputSchemaRaw);
+        const preRendered = skillDef as PreRenderedSkill;
+        const outputSchema = preRendered.runtimeOutputSchema ?? JSON.parse(outputSchemaRaw);
         const promptContent = skillDef.content || "You are a helpful assistant.";
-        const fullPrompt = `${promptContent}\n\nRESPONSE FORMAT INSTRUCTIONS:\nYou must output a valid JSON object.\nThe object must strictly follow this JSON Schema structure:\n\`\`\`json\n${JSON.stringify(outputSchema, null, 2)}\n\`\`\`\nDo not include the schema keys (like "properties", "type", "required") in your output unless they are part of the data. Output only the instance data.`;
+        const fullPrompt = preRendered.runtimeSystemPrompt ?? buildSkillSystemPrompt(promptContent, outputSchema);
 
         console.log(`[Skill:${skillKey}] Invoking LLM...`);
         
@@ -197,7 +241,7 @@ export async function runSkill(ctx: any, args: SkillRunInput) {
     // Be resilient in dev: if the database skill is missing or stale, fall back
     // to the generated skill definition (so UI features don't silently degrade).
     if (!skill) {
-        const generated = getGeneratedAgentSkillByKey(args.skillKey);
+        const generated = await getGeneratedAgentSkillByKey(args.skillKey);
         if (!generated) {
             throw new Error(`Skill not found: ${args.skillKey}`);
         }
@@ -208,7 +252,7 @@ export async function runSkill(ctx: any, args: SkillRunInput) {
         args.skillKey === "ux.suggestionsPanel" &&
         !outputSchemaRequiresField(skill.outputSchemaJson || skill.outputSchema || "", "suggestions")
     ) {
-        const generated = getGeneratedAgentSkillByKey(args.skillKey);
+        const generated = await getGeneratedAgentSkillByKey(args.skillKey);
         if (generated) {
             return await runSkillLogic(ctx, generated, args.input);
         }
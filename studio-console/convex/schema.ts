@@ -1660,6 +1660,7 @@ export default defineSchema({
         metadataJson: v.string(), // e.g. {"phase":"planning", "channel": "structured"}
         enabled: v.optional(v.boolean()),
         version: v.optional(v.number()),
+        contentHash: v.optional(v.string()), // set by seedAgentSkills from the generated registry
     })
         .index("by_key", ["key"])
         .index("by_skillKey", ["skillKey"])
@@ -0,0 +1,51 @@
+// Generated by `python -m skill_toolchain.shards`. Do not edit.
+
+export const SKILL_SHARDS = ["critique", "cross", "ideation", "planning", "printing", "procurement", "retro", "scheduling", "solutioning", "trello"] as const;
+
+export type SkillShard = (typeof SKILL_SHARDS)[number];
+
+export const SKILL_SHARD_BY_KEY: Record<string, SkillShard> = {
+    "accounting.costModelAndQuoteDraft": "planning",
+    "changeset.builder": "cross",
+    "critique.critic": "critique",
+    "ideation.elementsGenerator": "ideation",
+    "image.generator": "solutioning",
+    "planning.masterPlan": "planning",
+    "printing.fileQA": "printing",
+    "printing.printSpecBuilder": "printing",
+    "procurement.procurementPlanner": "procurement",
+    "questions.pack5": "cross",
+    "retro.closeoutAndLearnings": "retro",
+    "router.stageChannelSkill": "cross",
+    "scheduling.ganttOptimizer": "scheduling",
+    "solutioning.methodOptions": "solutioning",
+    "tasks.builderAndOptimizer": "planning",
+    "trello.syncPack": "trello",
+    "ux.suggestionsPanel": "cross",
+    "ux.threadSummarizer": "cross",
+};
+
+export async function loadSkillShard(shard: SkillShard) {
+    switch (shard) {
+        case "critique":
+            return (await import("./critique.json")).default;
+        case "cross":
+            return (await import("./cross.json")).default;
+        case "ideation":
+            return (await import("./ideation.json")).default;
+        case "planning":
+            return (await import("./planning.json")).default;
+        case "printing":
+            return (await import("./printing.json")).default;
+        case "procurement":
+            return (await import("./procurement.json")).default;
+        case "retro":
+            return (await import("./retro.json")).default;
+        case "scheduling":
+            return (await import("./scheduling.json")).default;
+        case "solutioning":
+            return (await import("./solutioning.json")).default;
+        case "trello":
+            return (await import("./trello.json")).default;
+    }
+}
@@ -10,13 +10,16 @@ type AgentSkillSeed = {
     inputSchema: string;
     outputSchema: string;
     prompt: string;
+    promptPrefix?: string;
     guidelines: string;
+    contentHash?: string; // stamped by `python -m skill_toolchain.manifest stamp`
 };
 
 type AgentSkillsGeneratedJson = {
     globalPrompt?: string;
     categoryPrompts?: Record<string, string>;
     skills: AgentSkillSeed[];
+    meta?: { promptMode?: "materialized" | "composed" };
 };
 
 function buildSkillPrompt(prompt: string, guidelines: string) {
@@ -27,6 +30,17 @@ function buildSkillPrompt(prompt: string, guidelines: string) {
     return blocks.join("\n\n");
 }
 
+function composeGeneratedPrompt(generated: AgentSkillsGeneratedJson | AgentSkillSeed[], skill: AgentSkillSeed) {
+    // Composed registries store shared blocks once; see skill_toolchain/registry.py.
+    if (Array.isArray(generated) || generated.meta?.promptMode !== "composed") return skill.prompt;
+    return (
+        (skill.promptPrefix ?? "") +
+        (generated.globalPrompt ?? "") +
+        (generated.categoryPrompts?.[skill.stage] ?? "") +
+        (skill.prompt ?? "")
+    );
+}
+
 export async function seedAgentSkills(ctx: MutationCtx) {
     const generated = agentSkills as unknown as AgentSkillsGeneratedJson | AgentSkillSeed[];
     const skills = Array.isArray(generated) ? generated : generated.skills;
@@ -54,7 +68,10 @@ export async function seedAgentSkills(ctx: MutationCtx) {
                 .withIndex("by_name", (q) => q.eq("name", name))
                 .first());
 
-        const content = buildSkillPrompt(skill.prompt, skill.guidelines);
+        // Unchanged since the last seed: skip the write entirely.
+        if (existing && skill.contentHash && existing.contentHash === skill.contentHash) continue;
+
+        const content = buildSkillPrompt(composeGeneratedPrompt(generated, skill), skill.guidelines);
         const patch = {
             name,
             skillKey: skill.skillKey,
@@ -67,7 +84,8 @@ export async function seedAgentSkills(ctx: MutationCtx) {
             outputSchemaJson: skill.outputSchema || "",
             toolPolicyJson: JSON.stringify({ allowedTools: skill.allowedTools }),
             enabled: true,
-            version: 1,
+            version: existing ? (existing.version ?? 0) + 1 : 1,
+            contentHash: skill.contentHash,
         } as const;
 
         if (!existing) {
@@ -1,46 +1,41 @@
-import json
-from pathlib import Path
+"""v2 skill prompts: thin renderers over the compiled v2 template pack.
 
-IN_PATH = Path("convex/skills/agentSkills.generated.json")
-OUT_PATH = IN_PATH  # in-place replacement
+The text (COMMON_HEADER, hand-written prompts, questions-pack focus and the
+family rules auto_prompt falls back to) lives in
+skill_toolchain/templates/v2.json; see skill_toolchain.templatepack. Only the
+entries for the skills being rendered are decoded.
+"""
 
-COMMON_HEADER = """You are Studio Agent for Eliran’s real-world production studio in Israel (pop-ups, installations, set builds, props, printing, logistics, rentals).
+from skill_toolchain.templatepack import load_pack
 
-GLOBAL OPERATING RULES (non-negotiable)
-- This prompt is written in English. When you write user-facing narrative, write in Hebrew by default.
-- Currency: ₪ (NIS) unless the project explicitly uses a different currency.
-- Production reality: lead times, vendor availability, weekends/holidays, traffic, and last-minute site constraints are real. Plan buffers.
-- Canonical structure: Project → Elements → Tasks → Accounting → Quote.
-  - Every Task maps to exactly one Element (or project overhead).
-  - Every Accounting line maps to exactly one Element (or project overhead).
-  - Quote is a snapshot of the exact Approved Elements set at generation time.
-- Source of truth: Approved Elements are grounding truth. Never overwrite approved truth directly.
-  - If new info conflicts with approved elements, flag a conflict and ask for a decision.
-- Never do destructive edits directly.
-  - When edits are required: propose a pending ChangeSet (patchOps) for user approval.
-  - Prefer tombstone/unlink over remove.
-- Estimation discipline:
-  - Use studio catalog/rates/price memory first. If missing, estimate with ranges and label "הערכה" + assumptions.
-  - Avoid fake precision. Call out unknown measurements, unclear site access, or missing artwork.
-  - Separate Labor (Studio) vs Labor (Install). Include friction hours (loading, cleanup, fixes).
-- Printing discipline:
-  - Brand/print-critical work requires proof and often test print. QA must pass before ordering.
-  - Never claim print readiness without spec + file QA.
-- Rentals discipline:
-  - Rentals include reserve→confirm→pickup→condition photos→install→return→deposit release.
-- Safety discipline:
-  - Flag stability/anchors, sharp edges, crowd interaction, electrical, fire lanes, and heavy lifts.
-  - When uncertain, recommend a qualified safety/engineering check.
+_pack = None
+
+
+def pack():
+    global _pack
+    if _pack is None:
+        _pack = load_pack("v2")
+    return _pack
+
+
+def header() -> str:
+    return pack().get("meta", "header")
 
-OUTPUT RULE
-- Output MUST be valid JSON that matches the provided outputSchema exactly.
-- Do NOT include any prose outside the JSON object.
-"""
+
+def __getattr__(name: str):
+    # The tables these names used to hold, built on demand for older callers.
+    if name == "COMMON_HEADER":
+        return header()
+    if name == "PROMPTS":
+        return {key: manual_prompt(key) for key in pack().keys("prompts")}
+    if name == "FOCUS_BY_QUESTIONS_PACK":
+        return {key: questions_focus(key) for key in pack().keys("focus")}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def make_prompt(*, skill_key: str, goal: str, when_use: str, when_not: str, process: str, quality: str) -> str:
     return (
-        COMMON_HEADER.strip()
+        header().strip()
         + "\n\nSKILL\n"
         + f"- skillKey: {skill_key}\n"
         + f"- Goal: {goal.strip()}\n\n"
@@ -57,7 +52,7 @@ def make_prompt(*, skill_key: str, goal: str, when_use: str, when_not: str, proc
 
 def make_questions_pack_prompt(skill_key: str, focus: str) -> str:
     return (
-        COMMON_HEADER.strip()
+        header().strip()
         + "\n\nSKILL\n"
         + f"- skillKey: {skill_key}\n"
         + "- Goal: Ask exactly 5 high-impact questions that unblock the next studio step without wasting time.\n\n"
@@ -74,327 +69,60 @@ def make_questions_pack_prompt(skill_key: str, focus: str) -> str:
     )
 
 
-PROMPTS: dict[str, str] = {
-    # controller/router/ux
-    "controller.autonomousPlanner": make_prompt(
-        skill_key="controller.autonomousPlanner",
-        goal="Drive the studio MVP loop end-to-end (clarify → elements → tasks → procurement/printing gates → cost model → quote → critique → improve), stopping at question/approval gates.",
-        when_use="- Use when the user asks what’s next or requests a plan/quote/tasks, or the workspace is missing multiple core artifacts.",
-        when_not="- Do NOT use for single narrow actions when a dedicated skill exists (e.g., printing QA, trello sync).\n- Do NOT proceed when quote/build blockers exist; ask questions instead.",
-        process=(
-            "1) Read workspace state: brief, elements (Approved?), tasks, accounting, printing/procurement status, schedule constraints.\n"
-            "2) Identify the biggest blocker (often: measurements/site access, approvals, print spec/files).\n"
-            "3) If blocked: return mode=ask_questions with exactly 5 questions (or route to the appropriate questionsPack5).\n"
-            "4) If edits are required: return mode=pending_changeset with patchOps (no destructive edits).\n"
-            "5) Otherwise: return mode=run_skill with the smallest next skill that creates the next missing artifact.\n"
-            "6) Self-critique: tasks↔accounting consistency, print proof gates, rentals steps, safety/site constraints.\n"
-            "7) assistantSummary in Hebrew: what changed, what’s blocked, what’s next."
-        ),
-        quality="- Never advance to quote/procurement if Approved Elements are missing or scope is unclear.\n- Don’t double count labor; avoid orphan purchases.\n- Enforce printing and rentals gating.",
-    ),
-    "router.stageChannelSkill": make_prompt(
-        skill_key="router.stageChannelSkill",
-        goal="Route userMessage to the best stage + channel + next skill based on workspace gaps (avoid rework).",
-        when_use="- Use whenever you need to decide what skill should run next.",
-        when_not="- Do NOT generate plans/tasks/prices here; route only.",
-        process=(
-            "1) Classify intent: clarify, ideation, planning/tasks, solutioning detail, procurement/prices, scheduling, printing, trello, critique, retro.\n"
-            "2) Detect blockers: missing measurements, install window/site access, approvals, print specs/files, missing approved scope.\n"
-            "3) If blockers exist: pick the appropriate *questionsPack5* and set channel=structured_questions.\n"
-            "4) Otherwise: pick the smallest next skill that advances the next artifact.\n"
-            "5) Respect uiPins unless unsafe/destructive."
-        ),
-        quality="- Never hallucinate missing workspace facts; list as missingCritical.\n- Prefer printing stage when artwork/בית דפוס is mentioned.\n- Prefer procurement when lead times/purchases are involved.",
-    ),
-    "router.scopeResolver": make_prompt(
-        skill_key="router.scopeResolver",
-        goal="Resolve whether the request targets project, elements, tasks, accounting/quote, procurement, printing, trello, or knowledge.",
-        when_use="- Use when the user message is ambiguous and you must know which entities it targets.",
-        when_not="- Do NOT invent IDs. If mapping is uncertain, keep scope broad and explain ambiguity.",
-        process=(
-            "1) Extract mentions and keywords (quote, buy, print, install, trello).\n"
-            "2) Fuzzy match to knownElements/knownTasks; never fabricate IDs.\n"
-            "3) If multiple candidates: return low confidence and explain what collides.\n"
-            "4) Output scope + elementIds/taskIds + confidence + notes."
-        ),
-        quality="- elementIds/taskIds must be empty if not confidently mapped.\n- Notes must say what to clarify.",
-    ),
-    "ux.suggestedActionsTop3": make_prompt(
-        skill_key="ux.suggestedActionsTop3",
-        goal="Suggest 3 concrete next actions (buttons) and a ranked fallback list, aligned to studio blockers.",
-        when_use="- Use after any step to keep the operator moving.",
-        when_not="- Do NOT suggest actions that require missing critical inputs unless it’s a question pack.",
-        process=(
-            "1) Identify the single biggest blocker (measurements, approvals, print spec/files, missing tasks/accounting).\n"
-            "2) Choose 3 diverse but relevant skills.\n"
-            "3) If pendingChangeSet exists, prioritize reviewer/apply suggestions.\n"
-            "4) Explain why in production terms (lead time, install window, proof gate)."
-        ),
-        quality="- Exactly 3 suggestions.\n- Avoid 3 question packs unless everything is blocked.",
-    ),
-    "ux.threadSummarizer": make_prompt(
-        skill_key="ux.threadSummarizer",
-        goal="Maintain a short rolling summary in Hebrew plus pending decisions and confirmed decisions.",
-        when_use="- Use to keep the operator oriented.",
-        when_not="- Do NOT add new ideas; summarize only.",
-        process="1) Summarize facts/decisions in Hebrew (5–10 lines).\n2) List pending decisions/questions.\n3) List confirmed decisions.\n4) Keep it scanable.",
-        quality="- No speculation.\n- Don’t invent facts.",
-    ),
 
-    # ideation
-    "ideation.questionsPack5": make_questions_pack_prompt(
-        "ideation.questionsPack5",
-        "- Unlock 2–3 viable concept directions + ROM budget.\n- Ask about: goal/audience, location & footprint, deadline + install window, budget band, style refs + brand assets ownership, site constraints (no drilling/fire rules/access hours).",
-    ),
-    "ideation.elementIdeas": make_prompt(
-        skill_key="ideation.elementIdeas",
-        goal="Generate buildable concept directions as Elements (build vs print vs rental), optimized for fast install/strike and transport.",
-        when_use="- Use once the brief exists (even partial).",
-        when_not="- Do NOT propose unsafe/unbuildable ideas; state assumptions if dimensions/site rules are missing.",
-        process="1) Propose 3 directions (WOW/modular/lean).\n2) For each: list Elements and likely method (build/print/rental/outsource).\n3) Call out install approach and risks.\n4) Flag printing proof/test-print needs.\n5) Recommend one direction.",
-        quality="- Buildable in Israel with real lead times.\n- Include at least one reuse/modular option.\n- Label assumptions as הַעֲרָכָה.",
-    ),
-    "ideation.romBudgetEstimator": make_prompt(
-        skill_key="ideation.romBudgetEstimator",
-        goal="Estimate ROM budget ranges per concept with real cost drivers and explicit uncertainty.",
-        when_use="- Use after concept directions exist to choose feasibility.",
-        when_not="- Do NOT output single-point costs when sizes/quantities are unknown.",
-        process="1) For each concept: Low/Mid/High (₪) and bucket breakdown.\n2) List top cost drivers.\n3) List assumptions + what to confirm next.",
-        quality="- Ranges over fake precision.\n- State scaling assumptions when size/quantity missing.",
-    ),
-    "ideation.styleConstraintsExtractor": make_prompt(
-        skill_key="ideation.styleConstraintsExtractor",
-        goal="Extract structured style + operational constraints from references for planning/printing.",
-        when_use="- Use when you have references (text/links/notes) and need a normalized style brief.",
-        when_not="- Do NOT invent brand rules; mark hypotheses clearly.",
-        process="1) Extract finish level/materials vibe/palette hints.\n2) Extract site/operational constraints (no drilling, outdoor, crowd touch).\n3) Output keywords for printing substrates/finishes/vendors.",
-        quality="- Phrase uncertain items as hypotheses.\n- Never fabricate a guideline document.",
-    ),
+def manual_prompt(skill_key: str) -> str | None:
+    """The hand-written prompt for `skill_key`, if it has one."""
+    entry = pack().get("prompts", skill_key)
+    if entry is None:
+        return None
+    if "focus" in entry:
+        return make_questions_pack_prompt(skill_key, entry["focus"])
+    return make_prompt(skill_key=skill_key, **entry)
+
+
+def questions_focus(skill_key: str) -> str | None:
+    return pack().get("focus", skill_key)
 
-    # planning
-    "planning.questionsPack5": make_questions_pack_prompt(
-        "planning.questionsPack5",
-        "- Lock scope enough for a quote that survives install day.\n- Ask about: final dimensions/qty, site access + install/strike window, approval owner + deadline, printing specs/files ownership, budget tolerance for options.",
-    ),
-    "planning.milestonesPhasesBuilder": make_prompt(
-        skill_key="planning.milestonesPhasesBuilder",
-        goal="Build studio-real phases + milestones with measurable acceptance, including printing and rentals gating.",
-        when_use="- Use once elements exist to create the production skeleton.",
-        when_not="- Do NOT invent dates; define ordering and acceptance criteria.",
-        process="1) Build phases from intake→install→strike/return→retro.\n2) Define milestones with acceptance criteria (proof approved, prints delivered, rentals confirmed).\n3) List dependencies + top risks.",
-        quality="- Include proof/test-print milestones when graphics matter.\n- Include rentals reserve/confirm/pickup/return steps.",
-    ),
-    "planning.taskBreakdownQuoteLevel": make_prompt(
-        skill_key="planning.taskBreakdownQuoteLevel",
-        goal="Generate quote-ready tasks mapped to elements with estimates, deps, purchase flags, and a ChangeSet.",
-        when_use="- Use after elements exist to create/refine the first task plan.",
-        when_not="- Do NOT delete tasks; tombstone if needed. Avoid ultra-micro steps.",
-        process="1) Create tasks by phase per element.\n2) Include QA tasks (finish/test assembly/print proof).\n3) Include install logistics tasks (tools/parking/access).\n4) Set estimates + needsPurchase.\n5) Output proposedChangeSet (patchOps).",
-        quality="- Tasks must map to exactly one element or overhead.\n- Include packaging/loading steps.\n- No impossible ordering (QA before ordering prints).",
-    ),
-}
 
-# For full coverage, we auto-generate a studio-specific prompt for every skill,
-# while preserving the manual prompts above when present.
-FOCUS_BY_QUESTIONS_PACK = {
-    "ideation.questionsPack5": "- Unlock 2–3 viable concept directions + ROM budget.\n- Ask about: goal/audience, location & footprint, deadline + install window, budget band, style refs + brand assets ownership, site constraints (no drilling/fire rules/access hours).",
-    "planning.questionsPack5": "- Lock scope enough for a quote that survives install day.\n- Ask about: final dimensions/qty, site access + install/strike window, approval owner + deadline, printing specs/files ownership.",
-    "solutioning.questionsPack5": "- Eliminate execution uncertainty for a specific element (mounting, structure, finish, tolerances, transport, safety).\n- Ask about: attachment method, weight/size, finish expectation, environment (indoor/outdoor), on-site access/tools.",
-    "printing.questionsPack5": "- Unblock print ordering safely.\n- Ask about: substrate, size/qty, finish (matte/gloss/lam), mounting method, deadlines, file ownership (who provides artwork), proof/test-print expectation.",
-    "retro.questionsPack5": "- Capture what happened and why for studio learning.\n- Ask about: what went well, what broke, biggest time sink, biggest surprise cost, what checklist/task would prevent it next time.",
-    "image.questionsPack5": "- Gather exactly what is needed to generate the requested image asset.\n- Ask about: purpose (client vs internal), style refs, dimensions/aspect ratio, key elements to show, what must be accurate vs illustrative.",
-}
+def _matches(match: dict, skill_key: str, stage: str) -> bool:
+    if "prefixes" in match and not skill_key.startswith(tuple(match["prefixes"])):
+        return False
+    return "stages" not in match or stage in match["stages"]
 
 
 def auto_prompt(skill_key: str, stage: str) -> str:
-    if skill_key in PROMPTS:
-        return PROMPTS[skill_key]
+    prompt = manual_prompt(skill_key)
+    if prompt is not None:
+        return prompt
 
     if skill_key.endswith(".questionsPack5"):
         return make_questions_pack_prompt(
-            skill_key,
-            FOCUS_BY_QUESTIONS_PACK.get(
-                skill_key,
-                "- Ask the 5 highest-impact questions to unblock the next step.\n- Prefer measurable constraints over open-ended chat.",
-            ),
-        )
-
-    # Skill-specific families (more specific than stage defaults)
-    if skill_key.startswith("accounting."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Handle studio accounting/quote artifacts with element-level traceability and honest uncertainty.",
-            when_use="- Use when building cost models, drafting quotes, ingesting actuals, or analyzing deltas.",
-            when_not="- Do NOT include unapproved scope in quotes.\n- Do NOT fabricate exact prices; use ranges and label assumptions.",
-            process="1) Keep mapping: line item → element/overhead.\n2) Separate Labor Studio vs Labor Install + friction.\n3) Carry printing/rentals deposits and return steps explicitly.\n4) Output only schema JSON.",
-            quality="- No double counting.\n- Clear assumptions/exclusions for client-facing outputs.",
-        )
-
-    if skill_key.startswith("tasks."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Refine tasks into studio-executable steps with realistic dependencies, estimates, and QC/packaging coverage.",
-            when_use="- Use when tasks are vague, missing DoD, missing dependencies, or missing typical studio steps.",
-            when_not="- Do NOT delete tasks; propose ChangeSet edits.\n- Do NOT change approved scope without flagging a change request.",
-            process="1) Fix titles (verb + object), estimates, and DoD.\n2) Add dependencies (proof→order→deliver→install; cure times).\n3) Add missing tasks (packaging/loading, condition photos for rentals, return/deposit release).\n4) Output only schema JSON.",
-            quality="- Practical granularity; avoid micro-tasks.\n- Traceable to elements.",
-        )
-
-    if skill_key.startswith("elements."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Create/update Elements as deliverables that reflect studio reality (build/print/rental/outsource), preserving approvals via ChangeSets.",
-            when_use="- Use when converting a brief into elements or proposing element edits.",
-            when_not="- Do NOT overwrite Approved Elements directly; propose ChangeSets.",
-            process="1) Define elements as concrete deliverables with measurable acceptance.\n2) Attach likely method (build/print/rental/outsource) and key constraints.\n3) Flag missing measurements and site rules.\n4) Output only schema JSON.",
-            quality="- Elements must be quotable and taskable.\n- Conflicts with approved truth must be flagged.",
-        )
-
-    if skill_key.startswith("changeset.") or skill_key.startswith("reconcile."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Propose/review non-destructive ChangeSets that preserve history and keep artifacts consistent (elements↔tasks↔accounting).",
-            when_use="- Use when edits are needed or inconsistencies exist.",
-            when_not="- Do NOT apply destructive ops directly; propose patchOps and require approval.",
-            process="1) Identify inconsistencies and root cause.\n2) Propose minimal patchOps with clear summary and riskFlags.\n3) Prefer tombstone/unlink over remove.\n4) Output only schema JSON.",
-            quality="- No orphan tasks/accounting lines.\n- Safe, minimal diffs.",
-        )
-
-    if skill_key.startswith("quality."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Validate prompts/outputs against schemas and studio rules; report precise failures and safe corrections.",
-            when_use="- Use when outputs look wrong, schema validation fails, or prompts drift from studio rules.",
-            when_not="- Do NOT change data directly; propose corrections in the format required by schema.",
-            process="1) Validate required keys/types and additionalProperties constraints.\n2) Check for studio-rule violations (destructive edits, missing proof gates, missing rentals steps).\n3) Output errors with exact paths and suggested fixes.",
-            quality="- Precise, minimal, schema-grounded feedback.",
-        )
-
-    if skill_key.startswith("research."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Plan research queries that will actually unblock purchasing/printing/method choices.",
-            when_use="- Use before online research to avoid time waste.",
-            when_not="- Do NOT pretend research was performed.",
-            process="1) Identify what must be answered (spec, price, ETA, method).\n2) Produce targeted queries and evaluation criteria.\n3) Output only schema JSON.",
-            quality="- Queries must be actionable and tied to decisions.",
-        )
-
-    if skill_key.startswith("logistics.") or skill_key.startswith("safety."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Plan install/site logistics and safety checks for temporary builds in public spaces.",
-            when_use="- Use when planning install day, site constraints, anchors, heavy lifts, electrical, crowd flow.",
-            when_not="- Do NOT claim compliance if requirements are unknown; flag missing info and recommend qualified checks.",
-            process="1) Gather site constraints (access hours, elevator, parking, no drilling, fire lanes, permits).\n2) Produce checklists and risk mitigations.\n3) Ensure rentals and printing delivery timing is aligned.\n4) Output only schema JSON.",
-            quality="- Safety-first.\n- Concrete checklist items, not vague warnings.",
-        )
-
-    if skill_key.startswith("image."):
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Generate image-generation instructions/prompts that are faithful to the studio element and client context (not fantasy renders).",
-            when_use="- Use when the user needs an illustration/render/tech sketch/diagram/mockup.",
-            when_not="- Do NOT invent physical constraints; ask questions if dimensions/mounting are unknown.",
-            process="1) Clarify purpose (client-facing vs internal tech).\n2) Encode constraints: dimensions/aspect, materials vibe, key elements, what must be accurate.\n3) Include annotations/labels in Hebrew where appropriate; keep part numbers in English.\n4) Output only schema JSON.",
-            quality="- Avoid misleading realism if details are unknown; label as illustrative.",
-        )
-
-    if stage == "printing":
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Advance printing workflow safely (spec → file QA → vendor pack → order tracking) without skipping proof gates.",
-            when_use="- Use when print deliverables exist or artwork/specs are being discussed.",
-            when_not="- Do NOT claim readiness or order prints without spec + QA + (when needed) proof/test-print.",
-            process="1) Identify what is being printed and for which element.\n2) Ensure spec is complete (substrate, size, qty, finish, mounting).\n3) Enforce proof/QA gates before ordering.\n4) Output only schema JSON.",
-            quality="- Be explicit about missing print-critical inputs.\n- Never skip proof/test-print when brand-critical.",
-        )
-
-    if stage == "procurement":
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Advance procurement realistically: lead times, deposits, deliveries/pickups, and gating dependencies.",
-            when_use="- Use when materials/vendors/rentals need to be purchased or coordinated.",
-            when_not="- Do NOT invent vendor names or claim research ran unless the tool actually ran.",
-            process="1) Convert needs into a deduped list mapped to elements/tasks.\n2) Flag lead-time items and gating (approval, proof, measurements).\n3) Include rentals reserve/confirm/pickup/return/deposit steps when relevant.\n4) Output only schema JSON.",
-            quality="- Everything maps to element or overhead.\n- Respect printing and approval gates.",
-        )
-
-    if stage == "scheduling":
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Produce a realistic schedule/critical path that respects lead times, proofs, cure times, and install windows.",
-            when_use="- Use when the user asks for timeline, dates, or dependencies.",
-            when_not="- Do NOT invent hard dates if install window is unknown; schedule relative to Install Day.",
-            process="1) Identify install/strike constraints (or flag missing).\n2) Build dependencies (proof before print order; deliveries before install).\n3) Add buffers for Israel reality.\n4) Output only schema JSON.",
-            quality="- No impossible ordering.\n- Explicitly account for printing and rentals gating.",
-        )
-
-    if stage == "trello":
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Translate studio plan (elements/tasks/status) into Trello-safe sync artifacts without losing traceability.",
-            when_use="- Use when the user requests Trello export/sync/board mapping.",
-            when_not="- Do NOT destroy or overwrite cards blindly; validate mapping and propose changes safely.",
-            process="1) Map Elements→lists/labels and Tasks→cards/checklists as defined by schema.\n2) Preserve IDs/links for future sync.\n3) Validate plan before executing.\n4) Output only schema JSON.",
-            quality="- No duplicate card creation when IDs already exist.\n- Keep element/task traceability.",
+            skill_key, questions_focus(skill_key) or pack().get("meta", "defaultFocus")
         )
 
-    if stage == "critique":
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Critique plans for studio realism: missing steps, wrong assumptions, gating issues, safety/site constraints.",
-            when_use="- Use before committing to a quote/order/build.",
-            when_not="- Do NOT rewrite everything; identify issues, severity, and minimal fixes.",
-            process="1) Check consistency: elements↔tasks↔accounting.\n2) Check printing/rentals/safety gating.\n3) Output prioritized critique and recommended fixes.",
-            quality="- Actionable and specific.\n- Don’t invent facts; flag missing inputs.",
-        )
-
-    if stage == "retro":
-        return make_prompt(
-            skill_key=skill_key,
-            goal="Capture lessons learned and update studio memory for future quoting/execution.",
-            when_use="- Use after project completion or major milestone.",
-            when_not="- Do NOT blame; focus on systems/checklists/rates.",
-            process="1) Summarize what happened (Hebrew).\n2) Identify repeatable lessons (pricing, checklists, vendor lead times, printing issues).\n3) Propose memory updates in schema.\n4) Output only schema JSON.",
-            quality="- Tie lessons to concrete events/cost/time deltas.\n- Keep changes non-destructive.",
-        )
+    # Families are ordered most specific first; the last one matches everything.
+    for family in pack().get("meta", "families"):
+        if _matches(family["match"], skill_key, stage):
+            fields = {k: v.replace("{stage}", stage) for k, v in family["fields"].items()}
+            return make_prompt(skill_key=skill_key, **fields)
+    raise ValueError(f"No v2 template family matches {skill_key} ({stage})")
 
-    if stage in ("ideation", "planning", "solutioning"):
-        return make_prompt(
-            skill_key=skill_key,
-            goal=f"Advance the {stage} stage with studio-real decisions that reduce rework and keep artifacts consistent.",
-            when_use="- Use when this stage is active and you need a structured artifact output.",
-            when_not="- Do NOT guess critical constraints; ask for missing blockers.\n- Do NOT do destructive edits; propose ChangeSets.",
-            process="1) Read constraints and Approved Elements truth.\n2) Produce the smallest artifact that unblocks production.\n3) Flag risks and missing blockers.\n4) Output only schema JSON.",
-            quality="- Studio-realistic (lead times, access, proofs).\n- Traceable to elements/tasks/accounting.",
-        )
-
-    return make_prompt(
-        skill_key=skill_key,
-        goal="Execute this skill in a studio-real way while preserving traceability and safety gating.",
-        when_use="- Use when this specific skill is selected.",
-        when_not="- Do NOT output prose outside schema JSON.",
-        process="1) Interpret inputs carefully.\n2) Apply studio rules (non-destructive edits, printing/rentals/safety gates).\n3) Output only schema JSON.",
-        quality="- Strict schema compliance.\n- No hallucinated facts.",
-    )
 
-
-def main() -> None:
-    raw = IN_PATH.read_text(encoding="utf-8")
-    skills = json.loads(raw)
-    if not isinstance(skills, list):
-        raise SystemExit(f"Expected top-level array in {IN_PATH}, got {type(skills)}")
-
-    for s in skills:
+def render_registry(registry: dict) -> None:
+    for s in registry["skills"]:
         skill_key = s.get("skillKey")
         if not isinstance(skill_key, str) or not skill_key:
             raise SystemExit("One or more entries are missing a valid skillKey")
         stage = s.get("stage") or "cross"
         s["prompt"] = auto_prompt(skill_key, stage)
 
-    OUT_PATH.write_text(json.dumps(skills, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
+def main() -> None:
+    # Kept for muscle memory; the build pipeline owns reading and writing the registry.
+    from skill_toolchain.compiler import build
+
+    result = build(generator="v2")
+    print(f"Rendered {len(result['rendered'])} skill(s) with v2 templates.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
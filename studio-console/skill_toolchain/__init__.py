@@ -0,0 +1,6 @@
+"""Python toolchain for building and inspecting convex/skills/agentSkills.generated.json.
+
+Run from the studio-console directory: `python -m skill_toolchain <command>` (see
+__main__.py), or a module directly, e.g. `python -m skill_toolchain.compiler`.
+Paths come from skill-toolchain.json (see config.py).
+"""
@@ -0,0 +1,64 @@
+"""Single entry point for the toolchain: `python -m skill_toolchain <command> [args]`.
+
+Each command forwards its arguments to one module's `main()`, which is only
+imported once the command is chosen, so `inspect` and `stats` never load the
+template tables, schema compiler or benchmark code.
+
+    python -m skill_toolchain build --manifest
+    python -m skill_toolchain build --generator update_skills
+    python -m skill_toolchain inspect --stage planning
+    python -m skill_toolchain stats
+    python -m skill_toolchain diff old.json new.json
+"""
+
+import importlib
+import sys
+
+# command -> (module, leading arguments, help)
+COMMANDS = {
+    "build": ("skill_toolchain.compiler", [], "incrementally render and write the registry"),
+    "split": ("skill_toolchain.shards", [], "write per-stage shards of the registry"),
+    "inspect": ("skill_toolchain.catalog", [], "query skills by key, stage, channel or tool"),
+    "stats": ("skill_toolchain.tokens", [], "prompt/schema sizes and token budgets"),
+    "diff": ("skill_toolchain.manifest", ["diff"], "compare two registry files"),
+    "bench": ("skill_toolchain.bench", [], "benchmark the toolchain at several catalog sizes"),
+    "watch": ("skill_toolchain.watch", [], "rebuild whenever the sources change"),
+    "variants": ("skill_toolchain.variants", [], "render every prompt variant and compare them"),
+    "spec": ("skill_toolchain.specs", [], "compile the spec markdown into a registry"),
+    "store": ("skill_toolchain.blobs", [], "content-addressed registry versions"),
+    "cache": ("skill_toolchain.rendercache", [], "inspect or clear the render cache"),
+    "json": ("skill_toolchain.canonical", [], "check, fix or benchmark canonical JSON artifacts"),
+    "templates": ("skill_toolchain.templatepack", [], "compile or inspect the generators' template packs"),
+    "stream": ("skill_toolchain.streaming", [], "run pipeline stages over a registry in constant memory"),
+    "serve": ("skill_toolchain.standin", [], "serve an OpenAI-compatible stand-in for load tests"),
+    "load": ("skill_toolchain.loadtest", [], "replay skill invocations and report latency percentiles"),
+    "replay": ("skill_toolchain.replay", [], "inspect, trim or clear recorded model responses"),
+    "eval": ("skill_toolchain.evaluate", [], "check skill outputs against schemas and golden outputs"),
+    "corpus": ("skill_toolchain.sampling", [], "generate seeded JSONL instances of the skill schemas"),
+    "mode": ("skill_toolchain.registry", [], "switch the registry between composed and materialized"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: python -m skill_toolchain <command> [args]", "", "commands:"]
+    lines += [f"  {name:10} {help_text}" for name, (_, _, help_text) in COMMANDS.items()]
+    lines += ["", "Run a command with --help for its options."]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        raise SystemExit(f"Unknown command {command!r}\n\n{usage()}")
+    module_name, leading, _ = COMMANDS[command]
+    # The module parses sys.argv itself; its usage line shows the unified command.
+    sys.argv = [f"python -m skill_toolchain {command}", *leading, *rest]
+    importlib.import_module(module_name).main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Crash-safe artifact writes and the build lock.
+
+A build writes several files that only make sense together: the registry,
+its shards and index.ts, the manifest and the build state. Inside
+`artifact_group()` those writes are staged instead of applied; when the
+block exits cleanly every file is written to a temp file next to its target
+and fsynced, and only then are all of them renamed over their targets (and
+their directories fsynced). An exception or a kill before that point leaves
+every target as it was; a file is never seen half-written.
+
+Outside a group, `write` replaces a single file the same way. `read` sees
+the writes staged so far, so later stages of a group can build on earlier
+ones.
+
+`build_lock()` is an advisory lock (.skillbuild/build.lock by default, see
+config.py) held for a whole read-modify-write of the registry, so parallel
+builds, watch mode and the one-off scripts run one after another instead of
+interleaving. It is re-entrant within a process.
+"""
+
+import contextlib
+import errno
+import os
+import sys
+import time
+from pathlib import Path
+
+from skill_toolchain.config import configured_path
+
+LOCK_PATH = configured_path("lock")
+LOCK_POLL_SECONDS = 0.1
+
+_groups: list["ArtifactGroup"] = []
+_locks: dict[Path, int] = {}
+
+
+def _key(path: Path) -> Path:
+    return Path(os.path.abspath(path))
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name == "nt":  # directories cannot be opened for fsync on Windows; renames are durable there
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_temp(path: Path, data: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return tmp
+
+
+def _read(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+class ArtifactGroup:
+    """Writes and removals staged until `commit`, then applied together."""
+
+    def __init__(self):
+        self.writes: dict[Path, bytes] = {}
+        self.removals: set[Path] = set()
+
+    def current(self, path: Path) -> bytes | None:
+        path = _key(path)
+        if path in self.writes:
+            return self.writes[path]
+        return None if path in self.removals else _read(path)
+
+    def write(self, path: Path, data: bytes) -> None:
+        path = _key(path)
+        self.removals.discard(path)
+        self.writes[path] = data
+
+    def remove(self, path: Path) -> None:
+        path = _key(path)
+        self.writes.pop(path, None)
+        self.removals.add(path)
+
+    def commit(self) -> None:
+        staged: list[tuple[Path, Path]] = []
+        try:
+            for path, data in self.writes.items():
+                staged.append((_write_temp(path, data), path))
+            while staged:
+                tmp, path = staged[0]
+                os.replace(tmp, path)
+                staged.pop(0)
+        finally:
+            for tmp, _ in staged:
+                tmp.unlink(missing_ok=True)
+        for path in self.removals:
+            path.unlink(missing_ok=True)
+        for directory in {p.parent for p in [*self.writes, *self.removals]}:
+            if directory.exists():
+                _fsync_dir(directory)
+
+
+@contextlib.contextmanager
+def artifact_group():
+    """Stage every `write`/`remove` in the block and apply them together when it exits cleanly.
+
+    A group opened inside another one joins it.
+    """
+    if _groups:
+        yield _groups[-1]
+        return
+    group = ArtifactGroup()
+    _groups.append(group)
+    try:
+        yield group
+    finally:
+        _groups.pop()
+    group.commit()
+
+
+def write(path: Path, data: bytes) -> bool:
+    """Write `data` unless the file already holds exactly it; returns whether it was written.
+
+    Unchanged files keep their mtime, so watchers and make-style checks see no change.
+    """
+    path = Path(path)
+    if _groups:
+        if _groups[-1].current(path) == data:
+            return False
+        _groups[-1].write(path, data)
+        return True
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = _write_temp(path, data)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+    return True
+
+
+def read(path: Path, *, staged: bool = True) -> bytes:
+    """Contents of `path`, as the enclosing group will leave it unless `staged=False`.
+
+    A stage that rewrites a file another stage of the same group reads (the
+    spec merge before a build in watch mode) must read it through here.
+    """
+    if staged and _groups:
+        data = _groups[-1].current(path)
+        if data is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+        return data
+    return Path(path).read_bytes()
+
+
+def is_staged(path: Path) -> bool:
+    """Whether the enclosing group has a pending write or removal for `path`."""
+    if not _groups:
+        return False
+    key = _key(path)
+    return key in _groups[-1].writes or key in _groups[-1].removals
+
+
+def remove(path: Path) -> None:
+    if _groups:
+        _groups[-1].remove(path)
+    else:
+        Path(path).unlink(missing_ok=True)
+
+
+@contextlib.contextmanager
+def atomic_open(path: Path, *, encoding: str = "utf-8", newline: str = "\n"):
+    """Text file handle whose contents replace `path` only once the block completes."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding=encoding, newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def _try_lock(fd: int) -> bool:
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    import fcntl
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _holder(path: Path) -> str:
+    try:
+        pid = path.read_text(encoding="utf-8").strip()
+    except OSError:  # Windows refuses reads of the locked byte
+        pid = ""
+    return f"pid {pid}" if pid else "another process"
+
+
+@contextlib.contextmanager
+def build_lock(path: Path = LOCK_PATH, *, timeout: float | None = None):
+    """Hold the advisory build lock for the block, waiting for other holders first."""
+    path = _key(path)
+    if path in _locks:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        start = time.monotonic()
+        waiting = False
+        while not _try_lock(fd):
+            if timeout is not None and time.monotonic() - start >= timeout:
+                raise SystemExit(f"Timed out after {timeout:g}s waiting for the build lock {path} ({_holder(path)})")
+            if not waiting:
+                print(f"Waiting for the build lock {path} ({_holder(path)})...", file=sys.stderr)
+                waiting = True
+            time.sleep(LOCK_POLL_SECONDS)
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, f"{os.getpid()}\n".encode("ascii"))
+        _locks[path] = fd
+        try:
+            yield
+        finally:
+            del _locks[path]
+            _unlock(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,198 @@
+"""Benchmarks for the skill-prompt toolchain at several catalog sizes.
+
+Synthetic registries are generated from the real artifact (skills are cloned
+round-robin with new keys and per-skill text), then each stage is timed:
+
+- load: json.loads + normalize_registry
+- render: v2 `make_prompt`, v2 `auto_prompt`, v1 `prompt_block` (when the
+  v1 module compiles)
+- factor: `factoring.factor_prompts`
+- serialize: json.dumps(indent=2, ensure_ascii=False)
+- write: serialize + write to a temp file
+- write.canonical: the same through `canonical.dump_bytes` (what
+  dump_registry does), with whichever encoder backend is active
+
+Each scale runs in its own subprocess so peak RSS is per scale. Results are
+written as JSON (default .skillbuild/bench/results.json); pass --baseline to
+compare against an earlier run and fail on regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from skill_toolchain.canonical import dump_bytes, write_json
+from skill_toolchain.registry import REGISTRY_PATH, load_registry, normalize_registry
+
+DEFAULT_SCALES = [18, 70, 1000, 10000]
+RESULTS_PATH = Path(".skillbuild/bench/results.json")
+
+
+def synthetic_registry(base: dict, count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    templates = base["skills"]
+    skills = []
+    for i in range(count):
+        src = templates[i % len(templates)]
+        key = f"{src.get('stage') or 'cross'}.synthetic{i:05d}"
+        prompt = (src.get("prompt") or "").replace(src["skillKey"], key)
+        # Per-skill tail so prompts are not byte-identical clones.
+        prompt += f"\n\nVARIANT\n- seed: {rng.getrandbits(32):08x}\n"
+        skills.append({**src, "skillKey": key, "prompt": prompt})
+    return {**base, "skills": skills}
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _load_v1():
+    # rewrite_agent_skills_prompts.py is currently truncated mid-file and does
+    # not compile; its stage is skipped until it does.
+    try:
+        import rewrite_agent_skills_prompts as v1
+    except SyntaxError:
+        return None
+    return v1
+
+
+def run_scale(registry_path: Path, count: int, repeat: int) -> dict:
+    import rewrite_agent_skills_prompts_v2 as v2
+    from skill_toolchain.factoring import factor_prompts
+
+    raw = json.dumps(synthetic_registry(load_registry(registry_path, materialize=True), count), ensure_ascii=False)
+    timings: dict[str, float] = {}
+
+    timings["load"], registry = _timed(lambda: normalize_registry(json.loads(raw)), repeat)
+    skills = registry["skills"]
+
+    timings["render.make_prompt"], _ = _timed(
+        lambda: [
+            v2.make_prompt(
+                skill_key=s["skillKey"], goal="g", when_use="u", when_not="n", process="p", quality="q"
+            )
+            for s in skills
+        ],
+        repeat,
+    )
+    timings["render.auto_prompt"], _ = _timed(
+        lambda: [v2.auto_prompt(s["skillKey"], s.get("stage") or "cross") for s in skills], repeat
+    )
+    v1 = _load_v1()
+    if v1 is not None:
+        timings["render.prompt_block"], _ = _timed(
+            lambda: [v1.prompt_block(s["skillKey"], "g", "u", "n", "i", "p", "q") for s in skills], repeat
+        )
+    timings["factor"], _ = _timed(lambda: factor_prompts(skills), repeat)
+    timings["serialize"], text = _timed(lambda: json.dumps(registry, ensure_ascii=False, indent=2), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "agentSkills.generated.json"
+        timings["write"], _ = _timed(
+            lambda: target.write_text(json.dumps(registry, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"),
+            repeat,
+        )
+        timings["write.canonical"], _ = _timed(
+            lambda: target.write_bytes(dump_bytes(registry, shape="registry")), repeat
+        )
+
+    return {
+        "skills": count,
+        "artifactBytes": len(text.encode("utf-8")),
+        "seconds": {k: round(v, 6) for k, v in timings.items()},
+        "peakRssKb": _peak_rss_kb(),
+    }
+
+
+def run_all(registry_path: Path, scales: list[int], repeat: int) -> dict:
+    results = []
+    for count in scales:
+        # A fresh interpreter per scale keeps peak RSS meaningful.
+        out = subprocess.run(
+            [sys.executable, "-m", "skill_toolchain.bench", "--registry", str(registry_path),
+             "--repeat", str(repeat), "--child", str(count)],
+            capture_output=True,
+            text=True,
+            cwd=os.getcwd(),
+        )
+        if out.returncode != 0:
+            raise SystemExit(f"Benchmark at {count} skills failed:\n{out.stderr}")
+        results.append(json.loads(out.stdout))
+        row = results[-1]
+        print(f"{count:>6} skills: " + ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in row["seconds"].items())
+              + f", peakRss={row['peakRssKb']}KB", file=sys.stderr)
+    return {
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def regressions(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    before = {r["skills"]: r for r in baseline.get("results", [])}
+    found = []
+    for row in current["results"]:
+        old = before.get(row["skills"])
+        if not old:
+            continue
+        for stage, seconds in row["seconds"].items():
+            prev = old["seconds"].get(stage)
+            # Ignore sub-millisecond stages: timer noise dominates there.
+            if prev and seconds > 0.001 and seconds > prev * (1 + tolerance):
+                found.append(f"{row['skills']} skills / {stage}: {prev * 1000:.1f}ms -> {seconds * 1000:.1f}ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the skill-prompt toolchain.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_scale(args.registry, args.child, args.repeat)))
+        return
+
+    report = run_all(args.registry, args.scales, args.repeat)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    write_json(args.out, report)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        found = regressions(json.loads(args.baseline.read_text(encoding="utf-8")), report, args.tolerance)
+        for line in found:
+            print(f"  regression: {line}")
+        if found:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Content-addressed store for registry versions.
+
+Large values (prompts, guidelines, schemas, runtime fields, global and
+category prompts) are stored once, zlib-compressed, under their sha256:
+
+    .skillbuild/store/objects/ab/cdef...   blob: the value's text or JSON
+    .skillbuild/store/objects/12/3456...   skill tree: the skill with large
+                                           values replaced by {"$blob": h}
+                                           or {"$json": h} references
+    .skillbuild/store/versions/<name>.json header refs + [skillKey, tree] list
+
+A version costs one small file plus whatever blobs are new. Two versions
+are diffed by comparing tree hashes; only the trees of changed skills are
+read, and blob contents are never needed. `checkout` rebuilds the object
+shape registry that `dump_registry` writes.
+
+    python -m skill_toolchain.blobs put convex/skills/agentSkills.generated.json --name current
+    python -m skill_toolchain.blobs diff current candidate
+    python -m skill_toolchain.blobs checkout candidate --out /tmp/candidate.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+
+from skill_toolchain.canonical import dumps
+from skill_toolchain.registry import dump_registry, load_registry
+
+STORE_DIR = Path(".skillbuild/store")
+# Values shorter than this are kept inline; a reference would not be smaller.
+MIN_BLOB_CHARS = 64
+
+
+class BlobStore:
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.versions = self.root / "versions"
+        self.written = 0
+        self.reused = 0
+
+    def _path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            self.reused += 1
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(zlib.compress(data, 6))
+        os.replace(tmp, path)
+        self.written += 1
+        return digest
+
+    def get(self, digest: str) -> str:
+        try:
+            return zlib.decompress(self._path(digest).read_bytes()).decode("utf-8")
+        except FileNotFoundError:
+            raise ValueError(f"Missing object {digest} in {self.root}") from None
+
+    def _ref(self, value):
+        if isinstance(value, str):
+            return {"$blob": self.put(value)} if len(value) >= MIN_BLOB_CHARS else value
+        if isinstance(value, (dict, list)):
+            raw = dumps(value, indent=None)
+            if len(raw) >= MIN_BLOB_CHARS:
+                return {"$json": self.put(raw)}
+        return value
+
+    def _deref(self, value):
+        if isinstance(value, dict) and len(value) == 1:
+            if "$blob" in value:
+                return self.get(value["$blob"])
+            if "$json" in value:
+                return json.loads(self.get(value["$json"]))
+        return value
+
+    def put_registry(self, registry: dict, name: str | None = None) -> str:
+        """Store `registry` as a version; returns its name (the root hash if not given)."""
+        skills = []
+        for s in registry["skills"]:
+            tree = {k: self._ref(v) for k, v in s.items()}
+            skills.append([s.get("skillKey"), self.put(dumps(tree, shape="skill", indent=None))])
+        version = {
+            "globalPrompt": self._ref(registry["globalPrompt"]),
+            "categoryPrompts": {k: self._ref(v) for k, v in registry["categoryPrompts"].items()},
+            "meta": registry["meta"],
+            "skills": skills,
+        }
+        if "index" in registry:
+            version["index"] = self._ref(registry["index"])
+        raw = dumps(version)
+        name = name or hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+        self.versions.mkdir(parents=True, exist_ok=True)
+        (self.versions / f"{name}.json").write_bytes(raw.encode("utf-8"))
+        return name
+
+    def version(self, name: str) -> dict:
+        path = self.versions / f"{name}.json"
+        if not path.exists():
+            raise SystemExit(f"No version {name!r} in {self.root} (have: {', '.join(self.list_versions()) or 'none'})")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def list_versions(self) -> list[str]:
+        return sorted(p.stem for p in self.versions.glob("*.json")) if self.versions.exists() else []
+
+    def checkout(self, name: str) -> dict:
+        version = self.version(name)
+        skills = []
+        for _, tree in version["skills"]:
+            skills.append({k: self._deref(v) for k, v in json.loads(self.get(tree)).items()})
+        registry = {
+            "globalPrompt": self._deref(version["globalPrompt"]),
+            "categoryPrompts": {k: self._deref(v) for k, v in version["categoryPrompts"].items()},
+            "skills": skills,
+            "meta": version["meta"],
+        }
+        if "index" in version:
+            registry["index"] = self._deref(version["index"])
+        return registry
+
+    def diff(self, old_name: str, new_name: str) -> dict:
+        old, new = self.version(old_name), self.version(new_name)
+        old_trees, new_trees = dict(old["skills"]), dict(new["skills"])
+        changed = {}
+        for key, tree in new_trees.items():
+            prev = old_trees.get(key)
+            if prev is None or prev == tree:
+                continue
+            a, b = json.loads(self.get(prev)), json.loads(self.get(tree))
+            changed[key] = sorted(k for k in a.keys() | b.keys() if a.get(k) != b.get(k))
+        header = [k for k in ("globalPrompt", "categoryPrompts", "meta", "index") if old.get(k) != new.get(k)]
+        return {
+            "added": sorted(k for k in new_trees if k not in old_trees),
+            "removed": sorted(k for k in old_trees if k not in new_trees),
+            "changed": changed,
+            "header": header,
+        }
+
+    def stats(self) -> dict:
+        files = [p for p in self.objects.rglob("*") if p.is_file()] if self.objects.exists() else []
+        return {
+            "versions": len(self.list_versions()),
+            "objects": len(files),
+            "objectBytes": sum(p.stat().st_size for p in files),
+            "versionBytes": sum(p.stat().st_size for p in self.versions.glob("*.json")) if self.versions.exists() else 0,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Content-addressed store for registry versions.")
+    parser.add_argument("--store", type=Path, default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    put = sub.add_parser("put", help="store registry files as versions")
+    put.add_argument("registries", type=Path, nargs="+")
+    put.add_argument("--name", help="version name (single registry only; default: root hash)")
+    co = sub.add_parser("checkout", help="rebuild a version as a registry file")
+    co.add_argument("name")
+    co.add_argument("--out", type=Path, required=True)
+    diff = sub.add_parser("diff", help="compare two versions")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    sub.add_parser("list", help="list versions and store size")
+    args = parser.parse_args()
+
+    store = BlobStore(args.store)
+    if args.command == "put":
+        if args.name and len(args.registries) > 1:
+            raise SystemExit("--name needs exactly one registry")
+        logical = 0
+        for path in args.registries:
+            name = store.put_registry(load_registry(path), args.name)
+            logical += path.stat().st_size
+            print(f"{name:24} <- {path}")
+        print(f"{store.written} new objects, {store.reused} already stored ({logical} bytes of input)")
+    elif args.command == "checkout":
+        dump_registry(store.checkout(args.name), args.out)
+        print(f"Wrote {args.name} to {args.out}")
+    elif args.command == "diff":
+        result = store.diff(args.old, args.new)
+        for label in ("added", "removed"):
+            print(f"{label:8} {len(result[label])}")
+            for key in result[label]:
+                print(f"  {key}")
+        print(f"{'changed':8} {len(result['changed'])}")
+        for key, fields in sorted(result["changed"].items()):
+            print(f"  {key}: {', '.join(fields)}")
+        if result["header"]:
+            print(f"header   {', '.join(result['header'])}")
+    else:
+        for name in store.list_versions():
+            print(name)
+        stats = store.stats()
+        print(
+            f"{stats['versions']} versions, {stats['objects']} objects, "
+            f"{stats['objectBytes'] + stats['versionBytes']} bytes on disk"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Canonical, byte-stable JSON for generated artifacts.
+
+Every artifact the toolchain writes goes through `dumps`/`write_json`, so
+the same data always produces the same bytes, whichever script wrote it and
+on whichever OS:
+
+- key order: declared for known shapes (registry, skill, index, manifest),
+  sorted everywhere else; keys a declared shape does not list follow its
+  declared keys, sorted. Parsed schemas (SCHEMA_KEYS) are the exception:
+  their order is kept, since property order is the order the model writes
+  fields in (see schemas.py);
+- layout: `indent=2`, UTF-8 without escaping non-ASCII, one trailing "\\n",
+  LF line endings (files are written as bytes, never in text mode), and
+  files that would not change are left alone;
+- compact form (`indent=None`) for hashing and JSONL lines.
+
+orjson is used as the encoder when installed (SKILL_TOOLCHAIN_JSON=stdlib
+turns it off), but only after a probe shows it produces the same bytes as
+the stdlib encoder, and never for values holding floats, whose text the two
+format differently.
+
+    python -m skill_toolchain.canonical check convex/skills/*.json
+    python -m skill_toolchain.canonical bench --skills 10000
+"""
+
+import json
+import os
+from pathlib import Path
+
+from skill_toolchain import artifacts
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+REGISTRY_KEYS = ("globalPrompt", "categoryPrompts", "skills", "meta", "index")
+# The order the build stages add fields in: rendered fields, runtime fields
+# (runtime.RUNTIME_FIELDS), then the content hash.
+SKILL_KEYS = (
+    "skillKey", "stage", "channel", "allowedTools", "inputSchema", "outputSchema",
+    "prompt", "promptPrefix", "guidelines",
+    "runtimeContent", "runtimeSystemPrompt", "runtimeOutputSchema", "contentHash",
+)
+# Skill fields holding a parsed JSON Schema, written in their own key order.
+SCHEMA_KEYS = ("runtimeOutputSchema",)
+INDEX_KEYS = ("byKey", "byStage", "byChannel", "byTool")
+MANIFEST_KEYS = ("skills", "added", "changed", "removed")
+
+_orjson_ok: bool | None = None
+
+
+class _Walk:
+    """Rebuilds dicts in canonical order and notes whether floats were seen."""
+
+    def __init__(self):
+        self.floats = False
+
+    def value(self, v):
+        if isinstance(v, dict):
+            return {k: self.value(v[k]) for k in sorted(v)}
+        if isinstance(v, (list, tuple)):
+            return [self.value(x) for x in v]
+        if isinstance(v, float):
+            self.floats = True
+        return v
+
+    def opaque(self, v):
+        """`v` with its key order kept."""
+        if isinstance(v, dict):
+            return {k: self.opaque(x) for k, x in v.items()}
+        if isinstance(v, (list, tuple)):
+            return [self.opaque(x) for x in v]
+        if isinstance(v, float):
+            self.floats = True
+        return v
+
+    def declared(self, d: dict, keys: tuple, nested: dict | None = None) -> dict:
+        nested = nested or {}
+        out = {}
+        for k in keys:
+            if k in d:
+                out[k] = nested[k](d[k]) if k in nested else self.value(d[k])
+        for k in sorted(d):
+            if k not in out:
+                out[k] = self.value(d[k])
+        return out
+
+    def skill(self, s: dict) -> dict:
+        return self.declared(s, SKILL_KEYS, {k: self.opaque for k in SCHEMA_KEYS})
+
+    def index(self, index):
+        return self.declared(index, INDEX_KEYS) if isinstance(index, dict) else self.value(index)
+
+    def skills(self, items: list) -> list:
+        return [self.skill(s) if isinstance(s, dict) else self.value(s) for s in items]
+
+    def registry(self, r: dict) -> dict:
+        return self.declared(r, REGISTRY_KEYS, {"skills": self.skills, "index": self.index})
+
+
+SHAPES = {
+    "registry": _Walk.registry,
+    "skill": _Walk.skill,
+    "index": _Walk.index,
+    "manifest": lambda walk, m: walk.declared(m, MANIFEST_KEYS),
+    None: _Walk.value,
+}
+
+
+def canonicalize(value, shape: str | None = None):
+    """`value` with every dict in canonical key order (see SHAPES for declared shapes)."""
+    return SHAPES[shape](_Walk(), value)
+
+
+def _stdlib(value, indent: int | None) -> bytes:
+    if indent is None:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(value, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def _orjson(value, indent: int | None) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+def _orjson_usable() -> bool:
+    global _orjson_ok
+    if _orjson_ok is None:
+        _orjson_ok = False
+        if orjson is not None and os.environ.get("SKILL_TOOLCHAIN_JSON", "").lower() != "stdlib":
+            probe = {"a": ["א \x00\x1f\x7f\"\\/\n\t", 0, -1, 2 ** 40, True, None, [], {}], "b": {"c": ""}}
+            try:
+                _orjson_ok = all(_orjson(probe, i) == _stdlib(probe, i) for i in (None, 2))
+            except (TypeError, ValueError):
+                pass
+    return _orjson_ok
+
+
+def backend() -> str:
+    return "orjson" if _orjson_usable() else "stdlib"
+
+
+def dump_bytes(value, *, shape: str | None = None, indent: int | None = 2) -> bytes:
+    """Canonical encoding of `value`; indented output ends with a newline."""
+    return _dump(value, shape, indent, _orjson_usable())
+
+
+def _dump(value, shape: str | None, indent: int | None, fast: bool) -> bytes:
+    walk = _Walk()
+    value = SHAPES[shape](walk, value)
+    raw = None
+    if fast and indent in (None, 2) and not walk.floats:
+        try:
+            raw = _orjson(value, indent)
+        except TypeError:  # e.g. integers beyond 64 bits
+            raw = None
+    if raw is None:
+        raw = _stdlib(value, indent)
+    return raw if indent is None else raw + b"\n"
+
+
+def dumps(value, *, shape: str | None = None, indent: int | None = 2) -> str:
+    return dump_bytes(value, shape=shape, indent=indent).decode("utf-8")
+
+
+def write_bytes(path: Path, data: bytes) -> bool:
+    """Write `data` unless the file already holds exactly it; returns whether it was written.
+
+    The write is atomic, and is deferred to the end of an enclosing
+    `artifacts.artifact_group()`.
+    """
+    return artifacts.write(path, data)
+
+
+def write_json(path: Path, value, *, shape: str | None = None) -> bool:
+    return write_bytes(path, dump_bytes(value, shape=shape))
+
+
+def write_text(path: Path, text: str) -> bool:
+    """Write generated text (e.g. a TS module) as UTF-8 with LF line endings."""
+    return write_bytes(path, text.replace("\r\n", "\n").encode("utf-8"))
+
+
+def _shape_for(path: Path, value) -> str | None:
+    if path.name.endswith(".manifest.json"):
+        return "manifest"
+    if isinstance(value, dict) and isinstance(value.get("skills"), list):
+        return "registry"
+    return None
+
+
+def _check(paths: list[Path]) -> int:
+    bad = 0
+    for path in paths:
+        data = path.read_bytes()
+        value = json.loads(data)
+        if dump_bytes(value, shape=_shape_for(path, value)) != data:
+            print(f"not canonical: {path}")
+            bad += 1
+    return bad
+
+
+def _bench(registry_path: Path, count: int, repeat: int) -> None:
+    import hashlib
+    import tempfile
+    import time
+
+    from skill_toolchain.bench import synthetic_registry
+    from skill_toolchain.registry import load_registry
+
+    registry = synthetic_registry(load_registry(registry_path, materialize=True), count)
+    runs = {"json.dumps (indent=2)": lambda: (json.dumps(registry, ensure_ascii=False, indent=2) + "\n").encode("utf-8")}
+    usable = _orjson_usable()
+    runs["canonical/stdlib"] = lambda: _dump(registry, "registry", 2, False)
+    if usable:
+        runs["canonical/orjson"] = lambda: _dump(registry, "registry", 2, True)
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "registry.json"
+        print(f"{count} skills, best of {repeat}")
+        outputs = {}
+        for name, encode in runs.items():
+            best = float("inf")
+            for _ in range(repeat):
+                if target.exists():
+                    target.unlink()
+                start = time.perf_counter()
+                data = encode()
+                target.write_bytes(data)
+                best = min(best, time.perf_counter() - start)
+            outputs[name] = hashlib.sha256(data).hexdigest()
+            print(f"  {name:24} {best * 1000:8.1f}ms  {len(data) / best / 1e6:7.1f} MB/s  ({len(data)} bytes)")
+    if len({v for k, v in outputs.items() if k.startswith("canonical/")}) > 1:
+        raise SystemExit("canonical encoders disagree on this registry")
+    if not usable:
+        print("  (orjson not installed or not byte-identical here; canonical output uses the stdlib encoder)")
+
+
+def main() -> None:
+    import argparse
+
+    from skill_toolchain.registry import REGISTRY_PATH
+
+    parser = argparse.ArgumentParser(description="Check, rewrite or benchmark canonical JSON artifacts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="fail if any file is not in canonical form")
+    check.add_argument("paths", type=Path, nargs="+")
+    fix = sub.add_parser("fix", help="rewrite files in canonical form")
+    fix.add_argument("paths", type=Path, nargs="+")
+    bench = sub.add_parser("bench", help="write throughput on a synthetic registry")
+    bench.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    bench.add_argument("--skills", type=int, default=10000)
+    bench.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        _bench(args.registry, args.skills, args.repeat)
+    elif args.command == "check":
+        if _check(args.paths):
+            raise SystemExit(1)
+        print(f"{len(args.paths)} file(s) canonical ({backend()} encoder)")
+    else:
+        for path in args.paths:
+            value = json.loads(path.read_bytes())
+            print(f"{'rewrote' if write_json(path, value, shape=_shape_for(path, value)) else 'unchanged'}  {path}")
+
+
+if __name__ == "__main__":
+    main()
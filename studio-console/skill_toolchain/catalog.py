@@ -0,0 +1,158 @@
+"""Indexed, compact in-memory view of a skill registry.
+
+`SkillRegistry` holds one `SkillRecord` (`__slots__`, no per-record dict)
+per skill, with string values shared across records: stages, channels,
+tool names and repeated schemas/guidelines are stored once. Lookups by
+skillKey, stage, channel and allowed tool are dict hits; prompts are
+composed only when asked for. It backs `python -m skill_toolchain inspect`
+and the index the build writes; the generators rewrite every skill in one
+pass and have no lookups to index.
+
+The same positional index is written into the artifact (and into each
+shard) as a top-level `index` field, so TS consumers can skip
+`skills.find`:
+
+    {"byKey": {key: i}, "byStage": {stage: [i, ...]},
+     "byChannel": {channel: [i, ...]}, "byTool": {tool: [i, ...]}}
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from skill_toolchain.registry import REGISTRY_PATH, is_composed, load_registry
+
+CORE_FIELDS = (
+    "skillKey", "stage", "channel", "allowedTools",
+    "inputSchema", "outputSchema", "prompt", "promptPrefix", "guidelines",
+)
+
+
+class SkillRecord:
+    __slots__ = (*CORE_FIELDS, "extra", "fields")
+
+    def __init__(self, skill: dict, shared: dict):
+        def share(value):
+            return shared.setdefault(value, value) if isinstance(value, str) else value
+
+        for name in CORE_FIELDS:
+            setattr(self, name, share(skill.get(name)))
+        self.allowedTools = tuple(share(t) for t in skill.get("allowedTools") or ())
+        extra = {k: share(v) for k, v in skill.items() if k not in CORE_FIELDS}
+        self.extra = extra or None
+        # Original key order, shared between records with the same layout.
+        fields = tuple(skill)
+        self.fields = shared.setdefault(fields, fields)
+
+    def to_dict(self) -> dict:
+        out = {}
+        for name in self.fields:
+            if name == "allowedTools":
+                out[name] = list(self.allowedTools)
+            elif name in CORE_FIELDS:
+                out[name] = getattr(self, name)
+            else:
+                out[name] = self.extra[name]
+        return out
+
+    def __repr__(self) -> str:
+        return f"SkillRecord({self.skillKey!r}, stage={self.stage!r}, channel={self.channel!r})"
+
+
+class SkillRegistry:
+    def __init__(self, registry: dict):
+        shared: dict = {}
+        self.globalPrompt = registry["globalPrompt"]
+        self.categoryPrompts = registry["categoryPrompts"]
+        self.composed = is_composed(registry)
+        self.records = [SkillRecord(s, shared) for s in registry["skills"]]
+        self._by_key: dict[str, int] = {}
+        self._by_stage: dict[str, list[int]] = {}
+        self._by_channel: dict[str, list[int]] = {}
+        self._by_tool: dict[str, list[int]] = {}
+        for i, r in enumerate(self.records):
+            self._by_key.setdefault(r.skillKey, i)
+            self._by_stage.setdefault(r.stage or "", []).append(i)
+            self._by_channel.setdefault(r.channel or "", []).append(i)
+            for tool in r.allowedTools:
+                self._by_tool.setdefault(tool, []).append(i)
+
+    @classmethod
+    def load(cls, path: Path = REGISTRY_PATH) -> "SkillRegistry":
+        return cls(load_registry(path))
+
+    def get(self, skill_key: str) -> SkillRecord | None:
+        i = self._by_key.get(skill_key)
+        return None if i is None else self.records[i]
+
+    def query(
+        self, *, stage: str | None = None, channel: str | None = None, tool: str | None = None
+    ) -> list[SkillRecord]:
+        """Skills matching every given filter, in registry order."""
+        picks = [
+            set(index.get(value, ()))
+            for index, value in ((self._by_stage, stage), (self._by_channel, channel), (self._by_tool, tool))
+            if value is not None
+        ]
+        if not picks:
+            return list(self.records)
+        return [self.records[i] for i in sorted(set.intersection(*picks))]
+
+    def prompt(self, record: SkillRecord) -> str:
+        """Full prompt for `record`, composed on demand (see registry.compose_prompt)."""
+        if not self.composed:
+            return record.prompt or ""
+        return (
+            (record.promptPrefix or "")
+            + self.globalPrompt
+            + self.categoryPrompts.get(record.stage or "", "")
+            + (record.prompt or "")
+        )
+
+    def index(self) -> dict:
+        return {
+            "byKey": dict(self._by_key),
+            "byStage": {k: list(v) for k, v in self._by_stage.items()},
+            "byChannel": {k: list(v) for k, v in self._by_channel.items()},
+            "byTool": {k: list(v) for k, v in self._by_tool.items()},
+        }
+
+
+def build_index(registry: dict) -> dict:
+    return SkillRegistry(registry).index()
+
+
+def attach_index(registry: dict) -> bool:
+    """Set `registry["index"]`; returns whether it changed."""
+    index = build_index(registry)
+    changed = registry.get("index") != index
+    registry["index"] = index
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query skills by key, stage, channel or allowed tool.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--key")
+    parser.add_argument("--stage")
+    parser.add_argument("--channel")
+    parser.add_argument("--tool")
+    parser.add_argument("--json", action="store_true", help="with --key: print the stored record as JSON")
+    args = parser.parse_args()
+
+    skills = SkillRegistry.load(args.registry)
+    if args.key:
+        record = skills.get(args.key)
+        if record is None:
+            raise SystemExit(f"No skill {args.key!r}")
+        if args.json:
+            print(json.dumps(record.to_dict(), ensure_ascii=False, indent=2))
+            return
+        print(skills.prompt(record))
+        return
+    for r in skills.query(stage=args.stage, channel=args.channel, tool=args.tool):
+        print(f"{r.skillKey:40} {r.stage or '-':12} {r.channel or '-':14} {', '.join(r.allowedTools)}")
+
+
+if __name__ == "__main__":
+    main()
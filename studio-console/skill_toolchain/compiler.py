@@ -0,0 +1,383 @@
+"""Incremental compiler for the skill registry.
+
+Replaces the full rewrite done by `rewrite_agent_skills_prompts_v2.main()`:
+every skill's render inputs are hashed and stored in a build state file, and
+only skills whose hash changed since the last build are re-rendered. When
+nothing changed the registry file is not touched at all.
+
+The state also records the digest of every prompt the build generated. A
+prompt that was never generated, or was edited since, is hand-written and is
+kept when its render inputs change; only `--force` replaces it.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+from pathlib import Path
+
+import rewrite_agent_skills_prompts_v2 as templates
+from skill_toolchain import artifacts
+from skill_toolchain.artifacts import artifact_group, build_lock, is_staged
+from skill_toolchain.canonical import write_json
+from skill_toolchain.catalog import attach_index
+from skill_toolchain.config import configured_path, load_config
+from skill_toolchain.manifest import build_manifest, manifest_path, skill_hashes, stamp_content_hashes, write_manifest
+from skill_toolchain.registry import (
+    REGISTRY_PATH,
+    compose_registry,
+    dump_registry,
+    is_composed,
+    load_registry,
+    materialize_registry,
+)
+from skill_toolchain.rendercache import RenderCache
+from skill_toolchain.runtime import has_runtime_fields, strip_runtime_fields
+from skill_toolchain.shards import SHARD_DIR, write_shards
+from skill_toolchain.tokens import analyze_skill, check_budgets, load_budgets
+
+STATE_PATH = configured_path("state")
+
+
+def template_fingerprint() -> str:
+    # Covers the shared header, the family rules and the rendering code, but
+    # not the per-skill prompt/focus entries: those are hashed separately below.
+    parts = [
+        templates.pack().digests["meta"],
+        inspect.getsource(templates.make_prompt),
+        inspect.getsource(templates.make_questions_pack_prompt),
+        inspect.getsource(templates.auto_prompt),
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def skill_input_hash(skill: dict, fingerprint: str) -> str:
+    # Only what `auto_prompt` reads: the schemas feed the runtime fields, which
+    # every build refreshes anyway, not the prompt.
+    skill_key = skill["skillKey"]
+    payload = {
+        "template": fingerprint,
+        "skillKey": skill_key,
+        "stage": skill.get("stage") or "cross",
+        "prompt": templates.manual_prompt(skill_key),
+        "focus": templates.questions_focus(skill_key),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def prompt_digest(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def load_state(path: Path = STATE_PATH) -> tuple[dict[str, str], dict[str, str]]:
+    """(input hashes, generated prompt digests) from the last build, both by skill key."""
+    if not path.exists():
+        return {}, {}
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}, {}
+    if not isinstance(state, dict):
+        return {}, {}
+    return state.get("skills", {}), state.get("generated", {})
+
+
+def save_state(hashes: dict[str, str], generated: dict[str, str], path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = {"template": template_fingerprint(), "skills": hashes, "generated": generated}
+    write_json(path, body)
+
+
+def _render(skill: dict, digest: str, cache: RenderCache | None) -> str:
+    prompt = cache.get(digest) if cache else None
+    if prompt is None:
+        prompt = templates.auto_prompt(skill["skillKey"], skill.get("stage") or "cross")
+        if cache:
+            cache.put(digest, prompt)
+    return prompt
+
+
+def check_sizes(registry_bytes: int, shard_sizes: dict[str, int], budgets: dict) -> list[str]:
+    """Artifacts over their `sizeBudgets` (bytes for the registry and for each shard)."""
+    failures = []
+    limit = budgets.get("registry")
+    if limit is not None and registry_bytes > limit:
+        failures.append(f"registry: {registry_bytes} bytes > budget {limit}")
+    limit = budgets.get("shard")
+    for name, size in sorted(shard_sizes.items()):
+        if name.endswith(".json") and limit is not None and size > limit:
+            failures.append(f"shard {name}: {size} bytes > budget {limit}")
+    return failures
+
+
+def compile_skills(
+    skills: list[dict],
+    previous: dict[str, str],
+    generated: dict[str, str] | None = None,
+    *,
+    force: bool = False,
+    cache: RenderCache | None = None,
+) -> tuple[dict[str, str], dict[str, str], list[str], list[str]]:
+    """Re-render prompts in place for changed skills.
+
+    `generated` maps skill keys to the digest of the prompt the last build
+    generated for them. A changed skill is only re-rendered when its prompt
+    is still that output (or empty); hand-written and hand-edited prompts
+    are kept.
+
+    Without a previous state (a fresh clone, CI, a deleted state file) the
+    existing prompts are adopted as the baseline rather than re-rendered;
+    those that match the current template output are recorded as generated.
+    `force` re-renders every skill.
+
+    Returns (hashes, generated digests, rendered keys, untouched keys).
+    """
+    fingerprint = template_fingerprint()
+    generated = generated or {}
+    hashes: dict[str, str] = {}
+    provenance: dict[str, str] = {}
+    rendered: list[str] = []
+    untouched: list[str] = []
+    adopt = not previous and not force
+
+    for s in skills:
+        skill_key = s.get("skillKey")
+        if not isinstance(skill_key, str) or not skill_key:
+            raise SystemExit("One or more entries are missing a valid skillKey")
+        digest = skill_input_hash(s, fingerprint)
+        hashes[skill_key] = digest
+        current = s.get("prompt") or ""
+        if skill_key in generated:
+            provenance[skill_key] = generated[skill_key]
+        if adopt and current and current == _render(s, digest, cache):
+            provenance[skill_key] = prompt_digest(current)
+        was_generated = provenance.get(skill_key) == prompt_digest(current)
+        if not force and current and (adopt or previous.get(skill_key) == digest or not was_generated):
+            untouched.append(skill_key)
+            continue
+        s["prompt"] = _render(s, digest, cache)
+        provenance[skill_key] = prompt_digest(s["prompt"])
+        rendered.append(skill_key)
+
+    return hashes, provenance, rendered, untouched
+
+
+def build(
+    registry_path: Path = REGISTRY_PATH,
+    *,
+    state_path: Path = STATE_PATH,
+    force: bool = False,
+    composed: bool | None = None,
+    shards: bool = False,
+    manifest: bool = False,
+    index: bool = False,
+    cache: RenderCache | None = None,
+    render: bool = True,
+    generator: str | None = None,
+    budget: bool = True,
+) -> dict:
+    """One incremental build; returns rendered/untouched keys and whether anything was written.
+
+    With `render=False` prompts are kept as they are (e.g. taken from the spec)
+    and only the derived fields are refreshed. `generator` names one of
+    `variants.GENERATORS`; its `render_registry` replaces the incremental
+    render stage for this build. `composed` switches the prompt mode; by
+    default the registry stays in the mode it is in. Unless `budget` is
+    false, a skill over its token budget (see `tokens`) or an artifact over
+    its size budget (`sizeBudgets` in skill-toolchain.json) fails the build
+    with SystemExit, and nothing is written.
+
+    The build holds the build lock, and the registry, manifest, shards and
+    build state are replaced together (see `artifacts`), so an interrupted
+    build leaves the previous ones in place and never a state that
+    disagrees with the prompts.
+    """
+    with build_lock(), artifact_group():
+        registry = load_registry(registry_path)
+        was_composed = is_composed(registry)
+        if composed is None:
+            composed = was_composed
+        # The manifest reports changes against the registry as last committed,
+        # not a version staged earlier in this group (watch's spec merge).
+        if is_staged(registry_path):
+            committed = load_registry(registry_path, staged=False) if registry_path.exists() else {"skills": []}
+        else:
+            committed = registry
+        previous_hashes = skill_hashes(committed)
+        manifest_file = manifest_path(registry_path)
+        with_manifest = manifest or manifest_file.exists()
+        # Runtime fields belong in the shards only; older builds left them here.
+        stripped = has_runtime_fields(registry)
+        strip_runtime_fields(registry)
+        with_index = index or "index" in registry
+        registry = materialize_registry(registry)
+
+        missing: list[str] = []
+        kept: list[str] = []
+        adopted = False
+        if generator:
+            from skill_toolchain.variants import GENERATORS, load_generator, unavailable_reason
+
+            if generator not in GENERATORS:
+                raise SystemExit(f"Unknown generator {generator!r} (have: {', '.join(GENERATORS)})")
+            reason = unavailable_reason(GENERATORS[generator])
+            if reason:
+                raise SystemExit(f"Generator {generator} is unavailable: {reason}")
+            before = {s["skillKey"]: s.get("prompt") for s in registry["skills"]}
+            missing = load_generator(GENERATORS[generator])(registry) or []
+            rendered = [s["skillKey"] for s in registry["skills"] if before[s["skillKey"]] != s.get("prompt")]
+            untouched = [s["skillKey"] for s in registry["skills"] if before[s["skillKey"]] == s.get("prompt")]
+            hashes, generated = load_state(state_path)
+            generated = {**generated, **{s["skillKey"]: prompt_digest(s.get("prompt") or "")
+                                         for s in registry["skills"] if s["skillKey"] in rendered}}
+        elif render:
+            previous, generated = load_state(state_path)
+            adopted = not previous and not force
+            hashes, generated, rendered, untouched = compile_skills(
+                registry["skills"], previous, generated, force=force, cache=cache
+            )
+            kept = [k for k in untouched if previous.get(k) not in (None, hashes[k])]
+            if cache:
+                cache.save()
+        else:
+            # The prompts as they stand are adopted: later builds only re-render
+            # skills whose inputs change from here, and only if still generated.
+            fingerprint = template_fingerprint()
+            hashes = {s["skillKey"]: skill_input_hash(s, fingerprint) for s in registry["skills"]}
+            generated = load_state(state_path)[1]
+            rendered, untouched = [], list(hashes)
+
+        if composed:
+            # Shared blocks are factored out of the prompts as they stand (as in
+            # `registry composed`); most are hand-written, not template output.
+            registry = compose_registry(registry)
+        if with_manifest:
+            stamped_before = [s.get("contentHash") for s in registry["skills"]]
+            stamp_content_hashes(registry)
+            stamped = stamped_before != [s.get("contentHash") for s in registry["skills"]]
+        else:
+            stamped = False
+        indexed = attach_index(registry) if with_index else False
+        if budget:
+            failures = check_budgets([analyze_skill(registry, s) for s in registry["skills"]], load_budgets())
+            if failures:
+                raise SystemExit("Token budget exceeded (--no-budget skips the check):\n  " + "\n  ".join(failures))
+        written = bool(rendered or stripped or stamped or indexed or composed != was_composed)
+        result = {
+            "rendered": rendered, "untouched": untouched, "missing": missing, "written": written, "manifest": None,
+            "adopted": adopted, "kept": kept,
+        }
+        if written:
+            dump_registry(registry, registry_path)
+            if with_manifest:
+                result["manifest"] = build_manifest(previous_hashes, skill_hashes(registry))
+                write_manifest(result["manifest"], manifest_file)
+            shard_dir = registry_path.parent / SHARD_DIR.name
+            shard_sizes = write_shards(registry, shard_dir) if shards or shard_dir.exists() else {}
+            if budget:
+                failures = check_sizes(len(artifacts.read(registry_path)), shard_sizes, load_config().get("sizeBudgets", {}))
+                if failures:
+                    raise SystemExit("Size budget exceeded (--no-budget skips the check):\n  " + "\n  ".join(failures))
+        known = set(hashes)
+        save_state(hashes, {k: v for k, v in generated.items() if k in known}, state_path)
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--state", type=Path, default=STATE_PATH)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render every skill, hand-written prompts included (without it, only generated prompts are re-rendered)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--composed",
+        action="store_const",
+        const=True,
+        help="store the blocks shared by the prompts once (globalPrompt, categoryPrompts) instead of in every prompt (kept once set)",
+    )
+    mode.add_argument(
+        "--materialize",
+        dest="composed",
+        action="store_const",
+        const=False,
+        help="switch a composed registry back to full prompts in every skill",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help="emit per-stage shards, with pre-rendered runtime fields, next to the registry (kept up to date once present)",
+    )
+    parser.add_argument(
+        "--manifest",
+        action="store_true",
+        help="stamp contentHash and write the changed-skills manifest (kept up to date once present)",
+    )
+    parser.add_argument(
+        "--render-cache",
+        action="store_true",
+        help="memoize renders in the on-disk render cache (slower than rendering for a catalog this size)",
+    )
+    parser.add_argument(
+        "--keep-prompts",
+        action="store_true",
+        help="refresh derived fields and adopt the current prompts into the build state without rendering",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="write the skill lookup index into the registry (kept up to date once present)",
+    )
+    parser.add_argument(
+        "--generator",
+        help="render prompts with this generator (v2, update_skills, v1) instead of the incremental v2 render",
+    )
+    parser.add_argument(
+        "--no-budget",
+        action="store_true",
+        help="write the artifacts even when a skill exceeds its token budget or an artifact its size budget",
+    )
+    args = parser.parse_args()
+
+    cache = RenderCache(template_fingerprint()) if args.render_cache else None
+    result = build(
+        args.registry,
+        state_path=args.state,
+        force=args.force,
+        composed=args.composed,
+        shards=args.shards,
+        manifest=args.manifest,
+        index=args.index,
+        cache=cache,
+        generator=args.generator,
+        render=not args.keep_prompts,
+        budget=not args.no_budget,
+    )
+    for key in result["missing"]:
+        print(f"Warning: {args.generator} has no instructions for {key}")
+    manifest = result["manifest"]
+    if manifest:
+        print(
+            f"Manifest: {len(manifest['added'])} added, {len(manifest['changed'])} changed, "
+            f"{len(manifest['removed'])} removed."
+        )
+    if result["adopted"]:
+        print(f"No build state at {args.state}: adopted the current prompts as the baseline (--force re-renders).")
+    rendered, untouched = result["rendered"], result["untouched"]
+    print(f"Rendered {len(rendered)} skill(s), {len(untouched)} untouched.")
+    for key in result["kept"]:
+        print(f"  kept       {key} (hand-written prompt; its template inputs changed, --force re-renders)")
+    if cache and rendered and not args.generator:
+        print(cache.summary())
+    for key in rendered:
+        print(f"  rendered   {key}")
+    for key in untouched:
+        print(f"  untouched  {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Toolchain configuration: skill-toolchain.json in the working directory.
+
+Besides `tokenBudgets` and `sizeBudgets` (byte limits for the registry and
+for each shard, checked by the build), the file may override where the
+toolchain reads and writes, relative to the directory the tools run from
+(studio-console):
+
+    {"paths": {"registry": "convex/skills/agentSkills.generated.json",
+               "state": ".skillbuild/compile-state.json",
+               "lock": ".skillbuild/build.lock",
+               "evals": "skill_evals",
+               "spec": "../Specs/Agent/magnetic_studio_skills_prompts_v2_with_images.md"}}
+
+SKILL_TOOLCHAIN_CONFIG points at a different config file.
+"""
+
+import json
+import os
+from functools import cache
+from pathlib import Path
+
+CONFIG_PATH = Path(os.environ.get("SKILL_TOOLCHAIN_CONFIG", "skill-toolchain.json"))
+
+DEFAULT_PATHS = {
+    "registry": "convex/skills/agentSkills.generated.json",
+    "state": ".skillbuild/compile-state.json",
+    "lock": ".skillbuild/build.lock",
+    "evals": "skill_evals",
+    "spec": "../Specs/Agent/magnetic_studio_skills_prompts_v2_with_images.md",
+}
+
+
+@cache
+def load_config(path: Path = CONFIG_PATH) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        config = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise SystemExit(f"{path}: invalid JSON: {e}") from None
+    return config if isinstance(config, dict) else {}
+
+
+def configured_path(name: str) -> Path:
+    return Path(load_config().get("paths", {}).get(name) or DEFAULT_PATHS[name])
@@ -0,0 +1,254 @@
+"""Offline skill evaluation: run a corpus of inputs and check the outputs.
+
+Cases come from JSONL files under <evals>/corpus (see config.py; one object
+per line, `{"skillKey", "id", "input"}`, with skillKey defaulting to the file
+name and id to a hash of the input; `python -m skill_toolchain corpus`
+writes this layout), or with --sample N from N seeded inputs per skill
+drawn from each inputSchema (ids are input hashes here too, so a golden
+stays with its input whatever the seed or N; repeated draws count once).
+Every case goes through the
+same request `runSkillLogic` builds (`loadtest.Backend`), at most
+--concurrency at a time, on one of these backends:
+
+- standin: an OpenAI-compatible endpoint (by default the local stand-in),
+  behind the record/replay store unless --replay off, so only cases whose
+  prompt, schema or input changed since the last run reach it;
+- replay: the replay store alone; a case without a recording fails.
+
+Each output is validated against the skill's full outputSchema (not just
+top-level `required`, as `validateOutput` does) and diffed against its
+golden output in <evals>/golden/<skillKey>.json. The exit status is 1 when
+any case fails, is invalid or drifts from its golden, so generator runs can
+be gated on it; --update-goldens accepts the current valid outputs.
+
+    python -m skill_toolchain serve --seed 1 &
+    python -m skill_toolchain.evaluate --sample 5 --update-goldens
+    python -m skill_toolchain build && python -m skill_toolchain.evaluate --sample 5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+
+from skill_toolchain.artifacts import artifact_group
+from skill_toolchain.canonical import dumps, write_json
+from skill_toolchain.config import configured_path
+from skill_toolchain.loadtest import Backend, Endpoint, RequestFailed
+from skill_toolchain.prompting import runtime_output_schema, skill_request
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.replay import REPLAY_DIR, ReplayStore
+from skill_toolchain.sampling import compile_sampler, exact, valid_instance
+from skill_toolchain.standin import DEFAULT_MODEL, DEFAULT_PORT
+from skill_toolchain.validation import validate
+
+EVALS_DIR = configured_path("evals")
+STATUSES = ("pass", "new", "drift", "invalid", "failed")
+FAILING = {"drift", "invalid", "failed"}
+MAX_DIFF_LINES = 5
+
+BACKENDS = {
+    "standin": lambda args: Backend(
+        Endpoint(args.base_url, args.timeout), model=args.model, seed=args.seed,
+        store=ReplayStore(args.replay_dir, mode=args.replay) if args.replay != "off" else None,
+    ),
+    "replay": lambda args: Backend(None, model=args.model, store=ReplayStore(args.replay_dir, mode="replay")),
+}
+
+
+def case_id(user_input) -> str:
+    return hashlib.sha256(dumps(user_input, indent=None).encode("utf-8")).hexdigest()[:12]
+
+
+def load_corpus(corpus_dir: Path) -> dict[str, list[dict]]:
+    cases: dict[str, list[dict]] = {}
+    for path in sorted(corpus_dir.glob("*.jsonl")):
+        with path.open(encoding="utf-8") as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise SystemExit(f"{path}:{lineno}: invalid JSON: {e.msg}") from None
+                if not isinstance(record, dict) or "input" not in record:
+                    raise SystemExit(f"{path}:{lineno}: expected an object with an \"input\"")
+                if record.get("valid") is False:  # near misses from `skill_toolchain corpus`
+                    continue
+                key = record.get("skillKey") or path.stem
+                cases.setdefault(key, []).append({"id": record.get("id") or case_id(record["input"]),
+                                                  "input": record["input"]})
+    return cases
+
+
+def sampled_corpus(skills: list[dict], count: int, seed: int) -> dict[str, list[dict]]:
+    cases = {}
+    for s in skills:
+        rng = random.Random(f"{seed}:{s['skillKey']}")
+        schema = json.loads(s.get("inputSchema") or "{}")
+        draw, checked = compile_sampler(schema), not exact(schema)
+        try:
+            inputs = [valid_instance(schema, draw, rng, checked=checked) for _ in range(count)]
+        except ValueError as e:
+            raise SystemExit(f"{s['skillKey']} inputSchema: {e}") from None
+        unique = {case_id(value): value for value in inputs}
+        cases[s["skillKey"]] = [{"id": key, "input": value} for key, value in unique.items()]
+    return cases
+
+
+def json_diff(golden, actual, path: str = "$") -> list[str]:
+    """Paths where `actual` differs from `golden`."""
+    if isinstance(golden, dict) and isinstance(actual, dict):
+        out = []
+        for key in sorted(golden.keys() | actual.keys()):
+            if key not in actual:
+                out.append(f"{path}.{key}: removed")
+            elif key not in golden:
+                out.append(f"{path}.{key}: added")
+            else:
+                out += json_diff(golden[key], actual[key], f"{path}.{key}")
+        return out
+    if isinstance(golden, list) and isinstance(actual, list):
+        out = []
+        for i in range(max(len(golden), len(actual))):
+            if i >= len(actual):
+                out.append(f"{path}[{i}]: removed")
+            elif i >= len(golden):
+                out.append(f"{path}[{i}]: added")
+            else:
+                out += json_diff(golden[i], actual[i], f"{path}[{i}]")
+        return out
+    if golden == actual and type(golden) is type(actual):
+        return []
+    return [f"{path}: {_short(golden)} -> {_short(actual)}"]
+
+
+def _short(value, width: int = 40) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+async def run_cases(cases: list[dict], backend: Backend, concurrency: int) -> list[dict]:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(case: dict) -> dict:
+        async with gate:
+            call = backend.invocation()
+            result = {"skill": case["skill"], "id": case["id"]}
+            start = time.perf_counter()
+            try:
+                output = await backend.invoke(call, case["skill"], case["input"], case["request"], case["schema"])
+            except (RequestFailed, ValueError) as e:
+                return {**result, "status": "failed", "errors": [str(e)], "seconds": time.perf_counter() - start}
+            errors = validate(case["fullSchema"], output)
+            diff = json_diff(case["golden"], output) if case["golden"] is not None else []
+            status = "invalid" if errors else "new" if case["golden"] is None else "drift" if diff else "pass"
+            return {**result, "status": status, "errors": errors or diff, "output": output,
+                    "replayed": call.replayed, "seconds": time.perf_counter() - start}
+
+    return await asyncio.gather(*(one(c) for c in cases))
+
+
+def goldens_path(evals_dir: Path, skill_key: str) -> Path:
+    return evals_dir / "golden" / f"{skill_key}.json"
+
+
+def load_goldens(evals_dir: Path, skill_key: str) -> dict:
+    path = goldens_path(evals_dir, skill_key)
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def print_report(results: list[dict], seconds: float) -> None:
+    by_skill: dict[str, list[dict]] = {}
+    for r in results:
+        by_skill.setdefault(r["skill"], []).append(r)
+    print(f"{'skill':36} {'cases':>6}" + "".join(f" {s:>7}" for s in STATUSES) + f" {'replay':>7}")
+    for skill, rows in sorted(by_skill.items()):
+        counts = [sum(r["status"] == s for r in rows) for s in STATUSES]
+        replayed = sum(bool(r.get("replayed")) for r in rows) / len(rows)
+        print(f"{skill:36} {len(rows):>6}" + "".join(f" {c:>7}" for c in counts) + f" {replayed:>7.0%}")
+    for r in results:
+        if r["status"] in FAILING:
+            print(f"\n{r['status']}: {r['skill']} / {r['id']}")
+            for line in r["errors"][:MAX_DIFF_LINES]:
+                print(f"  {line}")
+            if len(r["errors"]) > MAX_DIFF_LINES:
+                print(f"  ... {len(r['errors']) - MAX_DIFF_LINES} more")
+    totals = {s: sum(r["status"] == s for r in results) for s in STATUSES}
+    print(f"\n{len(results)} case(s) over {len(by_skill)} skill(s) in {seconds:.2f}s: "
+          + ", ".join(f"{n} {s}" for s, n in totals.items() if n))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the skill eval corpus and check outputs against schemas and goldens.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--evals", type=Path, default=EVALS_DIR, help="holds corpus/*.jsonl and golden/*.json")
+    parser.add_argument("--sample", type=int, metavar="N", help="use N sampled inputs per skill instead of the corpus")
+    parser.add_argument("--skill", action="append", help="only these skills (repeatable)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="standin")
+    parser.add_argument("--base-url", default=f"http://127.0.0.1:{DEFAULT_PORT}/v1")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--replay", choices=["auto", "record", "off"], default="auto",
+                        help="replay store use for the standin backend")
+    parser.add_argument("--replay-dir", type=Path, default=REPLAY_DIR)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--update-goldens", action="store_true", help="store valid outputs as the new goldens")
+    parser.add_argument("--json", type=Path, help="also write every case result here")
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry, materialize=True)
+    skills = {s["skillKey"]: s for s in registry["skills"] if not args.skill or s["skillKey"] in args.skill}
+    missing = sorted(set(args.skill or []) - set(skills))
+    if missing:
+        raise SystemExit(f"Unknown skill(s): {', '.join(missing)}")
+    if args.sample:
+        corpus = sampled_corpus(list(skills.values()), args.sample, args.seed)
+    else:
+        corpus = {k: v for k, v in load_corpus(args.evals / "corpus").items() if k in skills or not args.skill}
+        if not corpus:
+            raise SystemExit(f"No cases in {args.evals / 'corpus'}/*.jsonl; pass --sample N to use sampled inputs")
+    unknown = sorted(set(corpus) - set(skills))
+    if unknown:
+        raise SystemExit(f"Corpus has cases for unknown skill(s): {', '.join(unknown)}")
+
+    cases = []
+    for key, items in corpus.items():
+        skill, goldens = skills[key], load_goldens(args.evals, key)
+        full_schema = json.loads(skill.get("outputSchema") or "{}")
+        for item in items:
+            cases.append({
+                "skill": key, "id": item["id"], "input": item["input"],
+                "request": skill_request(registry, skill, item["input"]), "schema": runtime_output_schema(skill),
+                "fullSchema": full_schema, "golden": goldens.get(item["id"]),
+            })
+
+    backend = BACKENDS[args.backend](args)
+    start = time.perf_counter()
+    results = asyncio.run(run_cases(cases, backend, max(1, args.concurrency)))
+    print_report(results, time.perf_counter() - start)
+    if backend.store:
+        print(backend.store.summary() + f", {backend.store.evict()} evicted")
+
+    if args.update_goldens:
+        updates: dict[str, dict] = {}
+        for r in results:
+            if r["status"] in ("pass", "new", "drift"):
+                updates.setdefault(r["skill"], load_goldens(args.evals, r["skill"]))[r["id"]] = r["output"]
+        with artifact_group():
+            for key, goldens in updates.items():
+                write_json(goldens_path(args.evals, key), goldens)
+        print(f"Updated goldens for {len(updates)} skill(s) in {args.evals / 'golden'}")
+    if args.json:
+        write_json(args.json, results)
+    failing = [r for r in results if r["status"] in FAILING and not (args.update_goldens and r["status"] == "drift")]
+    if failing:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Automatic factoring of shared prompt text into global and category blocks.
+
+Works without markers: prompts are cut into paragraphs, the longest run of
+paragraphs shared by every prompt becomes the global block, and the longest
+common prefix of what follows it within each stage becomes that stage's
+category block. The result always satisfies, byte for byte,
+
+    prompt == prefix + global + categories[stage] + remainder
+
+which is the composition rule used by `skill_toolchain.registry`.
+"""
+
+import re
+from os.path import commonprefix
+
+_PARAGRAPH_END = re.compile(r"(?<=\n\n)")
+
+
+def split_paragraphs(text: str) -> list[str]:
+    # Every piece keeps its trailing blank line, so "".join() is lossless.
+    return [p for p in _PARAGRAPH_END.split(text) if p]
+
+
+def _windows(tokens: list[str], length: int) -> dict[tuple[str, ...], int]:
+    found: dict[tuple[str, ...], int] = {}
+    for i in range(len(tokens) - length + 1):
+        found.setdefault(tuple(tokens[i:i + length]), i)
+    return found
+
+
+def _shared_run(token_lists: list[list[str]]) -> tuple[str, ...]:
+    """Longest run of paragraphs (by characters) present in every list."""
+    shortest = min(token_lists, key=len)
+
+    def shared_at(length: int) -> set[tuple[str, ...]]:
+        common = set(_windows(shortest, length))
+        for tokens in token_lists:
+            if not common:
+                break
+            common &= set(_windows(tokens, length))
+        return common
+
+    # Shared runs are closed under taking sub-runs, so the feasible lengths
+    # form a prefix of 1..len(shortest) and can be binary searched.
+    lo, hi = 0, len(shortest)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if shared_at(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    if lo == 0:
+        return ()
+    return max(shared_at(lo), key=lambda run: sum(len(t) for t in run))
+
+
+def _trim_to_line(block: str) -> str:
+    cut = block.rfind("\n")
+    return block[:cut + 1] if cut != -1 else ""
+
+
+def _find_global(prompts: list[str]) -> tuple[str, list[int]]:
+    if len(prompts) < 2:
+        return "", [0] * len(prompts)
+    run = _shared_run([split_paragraphs(p) for p in prompts])
+    block = "".join(run)
+    if not block:
+        return "", [0] * len(prompts)
+    starts = [p.find(block) for p in prompts]
+
+    # Paragraph matching stops at paragraph boundaries; widen the block to
+    # every character the occurrences still agree on.
+    while all(s > 0 for s in starts) and len({p[s - 1] for p, s in zip(prompts, starts)}) == 1:
+        starts = [s - 1 for s in starts]
+        block = prompts[0][starts[0]] + block
+    tails = [p[s + len(block):] for p, s in zip(prompts, starts)]
+    block += _trim_to_line(commonprefix(tails))
+    return block, starts
+
+
+def factor_prompts(skills: list[dict]) -> tuple[str, dict[str, str], list[tuple[str, str]]]:
+    """Factor materialized skill prompts.
+
+    Returns (global block, {stage: category block}, [(prefix, remainder)])
+    with one (prefix, remainder) pair per skill, in order. Stages with a
+    single skill get no category block since it would not save anything.
+    """
+    prompts = [s.get("prompt") or "" for s in skills]
+    stages = [s.get("stage") or "" for s in skills]
+    global_block, starts = _find_global(prompts)
+    tails = [p[s + len(global_block):] for p, s in zip(prompts, starts)]
+
+    categories: dict[str, str] = {}
+    for stage in sorted(set(stages)):
+        members = [t for t, st in zip(tails, stages) if st == stage]
+        if len(members) < 2:
+            continue
+        block = _trim_to_line(commonprefix(members))
+        if block:
+            categories[stage] = block
+
+    parts = []
+    for p, s, tail, stage in zip(prompts, starts, tails, stages):
+        remainder = tail[len(categories.get(stage, "")):]
+        parts.append((p[:s], remainder))
+        if p[:s] + global_block + categories.get(stage, "") + remainder != p:
+            raise AssertionError("factoring does not reproduce the original prompt")
+    return global_block, categories, parts
+
+
+def factoring_report(skills: list[dict]) -> dict[str, int]:
+    global_block, categories, parts = factor_prompts(skills)
+    before = sum(len((s.get("prompt") or "").encode("utf-8")) for s in skills)
+    after = (
+        len(global_block.encode("utf-8"))
+        + sum(len(c.encode("utf-8")) for c in categories.values())
+        + sum(len((a + b).encode("utf-8")) for a, b in parts)
+    )
+    return {
+        "skills": len(skills),
+        "globalBytes": len(global_block.encode("utf-8")),
+        "categoryBlocks": len(categories),
+        "promptBytesBefore": before,
+        "promptBytesAfter": after,
+    }
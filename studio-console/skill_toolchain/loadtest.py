@@ -0,0 +1,370 @@
+"""Asyncio load driver: replay skill invocations against a model endpoint.
+
+Every selected skill is invoked `--per-skill` times (in a seeded shuffled
+order) against an OpenAI-compatible endpoint, normally the local stand-in
+(`python -m skill_toolchain serve`). Each invocation sends the request
+`runSkillLogic` builds for the skill: the full system prompt (`prompting`),
+the language block and JSON hints from `callChatWithJsonSchema`, an input
+drawn from the skill's inputSchema, and its runtime output schema as a strict
+json_schema format. Both retry layers of the client are replayed:
+
+- the OpenAI SDK's (2 retries on 408/409/429/5xx and connection errors,
+  honouring retry-after-ms, else 0.5s * 2^n backoff with jitter);
+- `callChatWithJsonSchema`'s (3 attempts, 500ms * attempt between them, and
+  the json_object fallback when the schema format is rejected).
+
+Outputs are then validated against the schema as `runSkillLogic` does.
+Arrivals are open-loop Poisson at `--rate` per second (closed loop when 0),
+with at most `--concurrency` in flight. Per skill it reports p50/p95/p99
+latency, retries, failures and prompt/response bytes, plus overall
+throughput.
+
+With --replay, responses come from and go to the record/replay store
+(`skill_toolchain.replay`), so only invocations whose prompt, schema or
+input changed reach the endpoint; hit ratios are reported per skill.
+
+    python -m skill_toolchain serve --latency lognormal:900,0.5 --tokens-per-second 80 &
+    python -m skill_toolchain.loadtest --concurrency 16 --rate 10 --per-skill 20
+    python -m skill_toolchain.loadtest --replay auto
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from skill_toolchain.canonical import write_json
+from skill_toolchain.prompting import runtime_output_schema, skill_request
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.replay import MODES, REPLAY_DIR, ReplayStore, replay_key
+from skill_toolchain.sampling import compile_sampler
+from skill_toolchain.standin import DEFAULT_MODEL, DEFAULT_PORT
+from skill_toolchain.validation import validate
+
+SDK_MAX_RETRIES = 2
+SDK_RETRY_STATUSES = {408, 409, 429}
+CLIENT_ATTEMPTS = 3
+CLIENT_RETRY_DELAY = 0.5
+# `shouldFallbackFromJsonSchema` in convex/lib/openai.ts.
+FALLBACK_MARKERS = ("json_schema", "response format", "invalid schema", "unsupported", "strict schema")
+
+
+class RequestFailed(Exception):
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class Endpoint:
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise SystemExit(f"Only http:// endpoints are supported (got {base_url})")
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+
+    async def post(self, path: str, body: dict) -> tuple[int, dict[str, str], bytes]:
+        raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"POST {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nAuthorization: Bearer standin\r\n"
+            f"Content-Length: {len(raw)}\r\nConnection: close\r\n\r\n"
+        )
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise RequestFailed(f"connection failed: {e or 'timeout'}") from None
+        try:
+            writer.write(head.encode("latin-1") + raw)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise RequestFailed(f"connection failed: {e or 'timeout'}") from None
+        finally:
+            writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            status = int(lines[0].split()[1])
+        except (IndexError, ValueError):
+            raise RequestFailed(f"malformed response: {lines[0][:80]!r}") from None
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:])}
+        return status, headers, payload
+
+
+def _sdk_delay(headers: dict[str, str], retry: int, rng: random.Random) -> float:
+    for name, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        try:
+            delay = float(headers[name]) / scale
+        except (KeyError, ValueError):
+            continue
+        if 0 < delay < 60:
+            return delay
+    return min(0.5 * 2 ** retry, 8.0) * (1 - rng.random() * 0.25)
+
+
+def _extract_json(text: str):
+    first, last = text.find("{"), text.rfind("}")
+    if first == -1 or last <= first:
+        raise ValueError("OpenAI response did not contain JSON")
+    return json.loads(text[first:last + 1])
+
+
+def _output_text(response: dict) -> str:
+    return "".join(
+        part.get("text", "")
+        for item in response.get("output", [])
+        if item.get("type") == "message"
+        for part in item.get("content", [])
+        if part.get("type") == "output_text"
+    )
+
+
+class Invocation:
+    """One skill run: the SDK and client retry loops around POST /responses."""
+
+    def __init__(self, endpoint: Endpoint, rng: random.Random):
+        self.endpoint = endpoint
+        self.rng = rng
+        self.sdk_retries = 0
+        self.client_retries = 0
+        self.fallbacks = 0
+        self.response_bytes = 0
+        self.output_text = ""
+        self.replayed = False
+
+    async def create(self, body: dict) -> dict:
+        for retry in range(SDK_MAX_RETRIES + 1):
+            try:
+                status, headers, payload = await self.endpoint.post("/responses", body)
+            except RequestFailed:
+                if retry == SDK_MAX_RETRIES:
+                    raise
+                headers, status = {}, None
+            else:
+                if status == 200:
+                    self.response_bytes = len(payload)
+                    return json.loads(payload)
+                if retry == SDK_MAX_RETRIES or not (status in SDK_RETRY_STATUSES or status >= 500):
+                    try:
+                        message = json.loads(payload)["error"]["message"]
+                    except (ValueError, KeyError, TypeError):
+                        message = payload[:200].decode("utf-8", "replace")
+                    raise RequestFailed(f"{status} {message}", status)
+            self.sdk_retries += 1
+            await asyncio.sleep(_sdk_delay(headers, retry, self.rng))
+        raise AssertionError("unreachable")
+
+    async def call_json_schema(self, request: dict, schema) -> object:
+        last = None
+        for attempt in range(CLIENT_ATTEMPTS):
+            try:
+                fmt = {"type": "json_schema", "name": "output", "schema": schema, "strict": True}
+                try:
+                    response = await self.create({**request, "text": {"format": fmt, "verbosity": "medium"}})
+                except RequestFailed as e:
+                    if not any(marker in str(e).lower() for marker in FALLBACK_MARKERS):
+                        raise
+                    self.fallbacks += 1
+                    fmt = {"type": "json_object"}
+                    response = await self.create({**request, "text": {"format": fmt, "verbosity": "medium"}})
+                if response.get("error"):
+                    raise RequestFailed(f"OpenAI response error: {response['error'].get('message')}")
+                text = _output_text(response)
+                if not text.strip():
+                    raise RequestFailed("OpenAI returned an empty response")
+                self.output_text = text
+                return _extract_json(text)
+            except (RequestFailed, ValueError) as e:
+                last = e
+                if attempt == CLIENT_ATTEMPTS - 1:
+                    break
+                self.client_retries += 1
+                await asyncio.sleep(CLIENT_RETRY_DELAY * (attempt + 1))
+        raise RequestFailed(f"failed after {CLIENT_ATTEMPTS} attempts: {last}")
+
+
+class Backend:
+    """Where invocations go: an endpoint, the replay store, or an endpoint behind the store."""
+
+    def __init__(self, endpoint: Endpoint | None, *, model: str, store: ReplayStore | None = None, seed: int = 0):
+        if endpoint is None and (store is None or not store.offline):
+            raise ValueError("a backend without an endpoint needs a store in replay mode")
+        self.endpoint = endpoint
+        self.model = model
+        self.store = store
+        self.rng = random.Random(seed)
+
+    def invocation(self) -> Invocation:
+        return Invocation(self.endpoint, random.Random(self.rng.random()))
+
+    async def invoke(self, call: Invocation, skill_key: str, user_input, request: dict, schema):
+        """The parsed output for one invocation; `call` collects retries, bytes and whether it was replayed."""
+        digest = replay_key(request["instructions"], schema, user_input, self.model) if self.store else None
+        recorded = self.store.get(skill_key, digest) if self.store else None
+        if recorded:
+            call.replayed = True
+            call.response_bytes = recorded["responseBytes"]
+            call.output_text = recorded["output"]
+            return _extract_json(recorded["output"])
+        if self.endpoint is None or self.store and self.store.offline:
+            raise RequestFailed("no recorded response (replay mode)")
+        body = {"model": self.model, **request, "reasoning": {"effort": "low"}, "parallel_tool_calls": True}
+        output = await call.call_json_schema(body, schema)
+        # An invalid output (a model slip, or a fault the stand-in injected) is
+        # returned to the caller but never recorded, so replays cannot repeat it.
+        if self.store and not validate(schema, output):
+            self.store.put(skill_key, digest, self.model, call.output_text, call.response_bytes)
+        return output
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def plan(registry: dict, keys: list[str] | None, per_skill: int, seed: int) -> list[tuple[dict, object, dict, object]]:
+    """(skill, input, request, output schema) per invocation, in a seeded shuffled order."""
+    skills = [s for s in registry["skills"] if not keys or s["skillKey"] in keys]
+    unknown = set(keys or ()) - {s["skillKey"] for s in skills}
+    if unknown:
+        raise SystemExit(f"Unknown skill(s): {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    runs = []
+    for s in skills:
+        draw = compile_sampler(json.loads(s.get("inputSchema") or "{}"))
+        for _ in range(per_skill):
+            user_input = draw(rng)
+            runs.append((s, user_input, skill_request(registry, s, user_input), runtime_output_schema(s)))
+    rng.shuffle(runs)
+    return runs
+
+
+async def drive(runs: list, backend: Backend, *, concurrency: int, rate: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    gate = asyncio.Semaphore(concurrency)
+    results: list[dict] = []
+
+    async def one(skill: dict, user_input, request: dict, schema, arrived: float) -> None:
+        async with gate:
+            started = time.perf_counter()
+            call = backend.invocation()
+            row = {"skill": skill["skillKey"], "queued": started - arrived, "ok": False, "invalid": False,
+                   "promptBytes": len((request["instructions"] + request["input"]).encode("utf-8"))}
+            try:
+                output = await backend.invoke(call, skill["skillKey"], user_input, request, schema)
+            except (RequestFailed, ValueError) as e:
+                row["error"] = str(e)
+            else:
+                row["invalid"] = bool(validate(schema, output))
+                row["ok"] = not row["invalid"]
+            row.update(latency=time.perf_counter() - started, sdkRetries=call.sdk_retries,
+                       clientRetries=call.client_retries, fallbacks=call.fallbacks, responseBytes=call.response_bytes,
+                       replayed=call.replayed)
+            results.append(row)
+
+    start = time.perf_counter()
+    tasks = []
+    for skill, user_input, request, schema in runs:
+        if rate:
+            await asyncio.sleep(rng.expovariate(rate))
+        tasks.append(asyncio.create_task(one(skill, user_input, request, schema, time.perf_counter())))
+    await asyncio.gather(*tasks)
+    return {"seconds": time.perf_counter() - start, "results": results}
+
+
+def summarize(results: list[dict]) -> dict:
+    latencies = [r["latency"] for r in results]
+    return {
+        "n": len(results),
+        "ok": sum(r["ok"] for r in results),
+        "failed": sum(not r["ok"] and not r["invalid"] for r in results),
+        "invalid": sum(r["invalid"] for r in results),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "sdkRetries": sum(r["sdkRetries"] for r in results),
+        "clientRetries": sum(r["clientRetries"] for r in results),
+        "fallbacks": sum(r["fallbacks"] for r in results),
+        "replayed": sum(r["replayed"] for r in results),
+        "promptBytes": round(sum(r["promptBytes"] for r in results) / max(1, len(results))),
+        "responseBytes": round(sum(r["responseBytes"] for r in results) / max(1, len(results))),
+    }
+
+
+def print_report(report: dict) -> None:
+    header = f"{'skill':36} {'n':>5} {'ok':>5} {'fail':>5} {'inval':>5} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8}"
+    header += f" {'sdkRetry':>8} {'retry':>6} {'promptB':>8} {'respB':>7} {'replay':>7}"
+    print(header)
+    rows = sorted(report["skills"].items(), key=lambda kv: -kv[1]["p50"])
+    for name, s in [*rows, ("all", report["all"])]:
+        if name == "all":
+            print("-" * len(header))
+        print(
+            f"{name:36} {s['n']:>5} {s['ok']:>5} {s['failed']:>5} {s['invalid']:>5} {s['p50'] * 1000:>8.0f} "
+            f"{s['p95'] * 1000:>8.0f} {s['p99'] * 1000:>8.0f} {s['sdkRetries']:>8} {s['clientRetries']:>6} "
+            f"{s['promptBytes']:>8} {s['responseBytes']:>7} {s['replayed'] / max(1, s['n']):>7.0%}"
+        )
+    a = report["all"]
+    print(
+        f"\n{a['n']} invocations in {report['seconds']:.2f}s: {a['n'] / report['seconds']:.1f} req/s, "
+        f"{a['ok'] / report['seconds']:.1f} ok/s (concurrency {report['concurrency']}, "
+        f"arrivals {report['rate'] or 'closed loop'}{'/s' if report['rate'] else ''}); "
+        f"queue wait p95 {report['queueP95'] * 1000:.0f}ms; {a['fallbacks']} json_object fallback(s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay skill invocations against a model endpoint and report latency.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--base-url", default=f"http://127.0.0.1:{DEFAULT_PORT}/v1")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--skill", action="append", help="only these skills (repeatable; default: all)")
+    parser.add_argument("--per-skill", type=int, default=10, help="invocations per skill")
+    parser.add_argument("--concurrency", type=int, default=8, help="invocations in flight at most")
+    parser.add_argument("--rate", type=float, default=0.0, help="Poisson arrivals per second (0: closed loop)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="per HTTP request, seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the report (and every invocation) here")
+    parser.add_argument("--replay", choices=MODES, default="off",
+                        help="serve responses from the record/replay store (auto: replay hits, record misses)")
+    parser.add_argument("--replay-dir", type=Path, default=REPLAY_DIR)
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry, materialize=True)
+    runs = plan(registry, args.skill, args.per_skill, args.seed)
+    store = ReplayStore(args.replay_dir, mode=args.replay) if args.replay != "off" else None
+    backend = Backend(Endpoint(args.base_url, args.timeout), model=args.model, store=store, seed=args.seed)
+    outcome = asyncio.run(drive(runs, backend, concurrency=max(1, args.concurrency), rate=args.rate, seed=args.seed))
+    results = outcome["results"]
+    by_skill: dict[str, list[dict]] = {}
+    for row in results:
+        by_skill.setdefault(row["skill"], []).append(row)
+    report = {
+        "baseUrl": args.base_url, "concurrency": args.concurrency, "rate": args.rate, "seconds": outcome["seconds"],
+        "queueP95": percentile([r["queued"] for r in results], 95),
+        "all": summarize(results), "skills": {k: summarize(v) for k, v in sorted(by_skill.items())},
+    }
+    print_report(report)
+    if store:
+        print(store.summary() + f", {store.evict()} evicted")
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        write_json(args.json, {**report, "invocations": results})
+        print(f"Wrote {args.json}")
+    errors = sorted({r["error"] for r in results if r.get("error")})
+    for error in errors[:5]:
+        print(f"  error: {error}")
+
+
+if __name__ == "__main__":
+    main()
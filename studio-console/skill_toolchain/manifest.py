@@ -0,0 +1,109 @@
+"""Changed-skills manifest for delta seeding.
+
+Every skill gets a `contentHash` over exactly what `seedAgentSkills` writes
+(content, schemas, stage/channel/tool metadata). `seedAgentSkills` skips rows
+whose stored hash matches and bumps `version` on the rest.
+
+The manifest (`agentSkills.manifest.json`, next to the registry) lists the
+per-skill hashes and which keys were added, changed or removed relative to
+the previous artifact. It can also be computed offline from two files:
+
+    python -m skill_toolchain.manifest diff old.json new.json
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+from skill_toolchain.artifacts import artifact_group, build_lock
+from skill_toolchain.canonical import write_json
+from skill_toolchain.prompting import build_skill_prompt, output_schema_raw
+from skill_toolchain.registry import REGISTRY_PATH, compose_prompt, dump_registry, load_registry
+
+MANIFEST_NAME = "agentSkills.manifest.json"
+
+
+def content_hash(registry: dict, skill: dict) -> str:
+    seeded = {
+        "skillKey": skill.get("skillKey"),
+        "stage": skill.get("stage"),
+        "channel": skill.get("channel"),
+        "allowedTools": skill.get("allowedTools"),
+        "inputSchema": skill.get("inputSchema") or "",
+        "outputSchema": output_schema_raw(skill),
+        "content": build_skill_prompt(compose_prompt(registry, skill), skill.get("guidelines") or ""),
+    }
+    raw = json.dumps(seeded, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def skill_hashes(registry: dict) -> dict[str, str]:
+    return {s["skillKey"]: content_hash(registry, s) for s in registry["skills"] if s.get("skillKey")}
+
+
+def stamp_content_hashes(registry: dict) -> None:
+    for s in registry["skills"]:
+        if s.get("skillKey"):
+            s["contentHash"] = content_hash(registry, s)
+
+
+def diff_hashes(old: dict[str, str], new: dict[str, str]) -> dict[str, list[str]]:
+    return {
+        "added": sorted(k for k in new if k not in old),
+        "changed": sorted(k for k in new if k in old and old[k] != new[k]),
+        "removed": sorted(k for k in old if k not in new),
+    }
+
+
+def build_manifest(previous: dict[str, str], current: dict[str, str]) -> dict:
+    return {"skills": dict(sorted(current.items())), **diff_hashes(previous, current)}
+
+
+def manifest_path(registry_path: Path) -> Path:
+    return Path(registry_path).parent / MANIFEST_NAME
+
+
+def write_manifest(manifest: dict, path: Path) -> None:
+    write_json(path, manifest, shape="manifest")
+
+
+def _print_diff(diff: dict[str, list[str]]) -> None:
+    for label in ("added", "changed", "removed"):
+        print(f"{label:8} {len(diff[label])}")
+        for key in diff[label]:
+            print(f"  {key}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stamp skill content hashes or diff two registry artifacts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stamp = sub.add_parser("stamp", help="add contentHash to each skill and write the manifest")
+    stamp.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    diff = sub.add_parser("diff", help="compare two registry files offline")
+    diff.add_argument("old", type=Path)
+    diff.add_argument("new", type=Path)
+    diff.add_argument("--out", type=Path, help="also write the manifest here")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        current = skill_hashes(load_registry(args.new))
+        manifest = build_manifest(skill_hashes(load_registry(args.old)), current)
+        _print_diff(manifest)
+        if args.out:
+            write_manifest(manifest, args.out)
+        return
+
+    with build_lock(), artifact_group():
+        registry = load_registry(args.registry)
+        path = manifest_path(args.registry)
+        previous = json.loads(path.read_text(encoding="utf-8"))["skills"] if path.exists() else {}
+        stamp_content_hashes(registry)
+        dump_registry(registry, args.registry)
+        manifest = build_manifest(previous, skill_hashes(registry))
+        write_manifest(manifest, path)
+    _print_diff(manifest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Python mirror of the system prompt the Convex runtime sends for a skill.
+
+Keep in sync with `buildSkillPrompt` (convex/skills/seed.ts, convex/lib/skills.ts),
+the `fullPrompt` template in `runSkillLogic` (convex/lib/skills.ts), and the
+instructions/input `callChatWithJsonSchema` wraps around it (convex/lib/openai.ts).
+"""
+
+import json
+
+from skill_toolchain.registry import compose_prompt
+
+DEFAULT_PROMPT = "You are a helpful assistant."
+GLOBAL_LANGUAGE_INSTRUCTIONS = "\n".join([
+    "Language requirement:",
+    "- All user-facing text must be in Hebrew (עברית).",
+    "- If returning JSON, keep keys exactly as required by the schema; do not translate keys.",
+    "- Keep code identifiers/tool names in English when necessary, but explain them in Hebrew.",
+])
+JSON_HINT = "\n\nReturn valid JSON only."
+
+
+def build_skill_prompt(prompt: str, guidelines: str) -> str:
+    blocks = [b for b in [(prompt or "").strip()] if b]
+    gl = (guidelines or "").strip()
+    if gl:
+        blocks.append("Guidelines:\n" + gl)
+    return "\n\n".join(blocks)
+
+
+def _js_number(value: float) -> str:
+    # JSON.stringify prints integral floats without a fraction ("1", not "1.0").
+    if value.is_integer() and abs(value) < 1e21:
+        return str(int(value))
+    return repr(value)
+
+
+def _js_pretty(value, indent: str = "") -> str:
+    inner = indent + "  "
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = [f"{inner}{json.dumps(k, ensure_ascii=False)}: {_js_pretty(v, inner)}" for k, v in value.items()]
+        return "{\n" + ",\n".join(items) + "\n" + indent + "}"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        return "[\n" + ",\n".join(inner + _js_pretty(v, inner) for v in value) + "\n" + indent + "]"
+    if isinstance(value, float):
+        return _js_number(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def pretty_schema(schema_raw: str) -> str:
+    """`JSON.stringify(JSON.parse(schema_raw), null, 2)`."""
+    return _js_pretty(json.loads(schema_raw or "{}"))
+
+
+def system_prompt(content: str, schema_raw: str) -> str:
+    """The `fullPrompt` string built by `runSkillLogic`."""
+    return (
+        f"{content or DEFAULT_PROMPT}\n\nRESPONSE FORMAT INSTRUCTIONS:\nYou must output a valid JSON object.\n"
+        f"The object must strictly follow this JSON Schema structure:\n```json\n{pretty_schema(schema_raw)}\n```\n"
+        'Do not include the schema keys (like "properties", "type", "required") in your output unless they are '
+        "part of the data. Output only the instance data."
+    )
+
+
+def output_schema_raw(skill: dict) -> str:
+    """The output schema seeding stores (`outputSchemaJson`)."""
+    return skill.get("outputSchema") or "{}"
+
+
+def skill_system_prompt(registry: dict, skill: dict) -> str:
+    content = build_skill_prompt(compose_prompt(registry, skill), skill.get("guidelines") or "")
+    return system_prompt(content, output_schema_raw(skill))
+
+
+def runtime_output_schema(skill: dict):
+    """The schema `runSkillLogic` passes to the model: `runtimeOutputSchema`, else the parsed outputSchema."""
+    return skill.get("runtimeOutputSchema") or json.loads(output_schema_raw(skill))
+
+
+def skill_request(registry: dict, skill: dict, user_input) -> dict:
+    """`instructions` and `input` of the Responses API call `runSkillLogic` makes for `user_input`."""
+    system = skill.get("runtimeSystemPrompt") or skill_system_prompt(registry, skill)
+    return {
+        "instructions": f"{system}\n\n{GLOBAL_LANGUAGE_INSTRUCTIONS}{JSON_HINT}",
+        "input": f"USER: {_js_pretty(user_input)}{JSON_HINT}",
+    }
@@ -0,0 +1,203 @@
+"""Shared loader for agentSkills.generated.json.
+
+The registry exists in two shapes:
+
+- a top-level array of skills (what parse-agent-skills.js and the older
+  rewrite scripts produced), and
+- an object `{globalPrompt, categoryPrompts, skills, meta}` (what
+  scripts/split_skills_json.py produces).
+
+`load_registry` accepts both and always returns the object shape. The object
+may also carry a lookup `index` (see skill_toolchain.catalog).
+
+Prompts are stored in one of two modes, recorded in `meta.promptMode`:
+
+- "materialized" (default): every `skill.prompt` is the full prompt and
+  `globalPrompt`/`categoryPrompts` are informational only.
+- "composed": shared text is stored once and each skill keeps only its own
+  text. The full prompt is
+  `skill.promptPrefix + globalPrompt + categoryPrompts[stage] + skill.prompt`,
+  plain concatenation with no separators added (see `compose_prompt`).
+"""
+
+import json
+from pathlib import Path
+
+from skill_toolchain import artifacts
+from skill_toolchain.canonical import write_json
+from skill_toolchain.config import configured_path
+from skill_toolchain.factoring import factor_prompts
+
+REGISTRY_PATH = configured_path("registry")
+
+PROMPT_MODE_MATERIALIZED = "materialized"
+PROMPT_MODE_COMPOSED = "composed"
+
+
+def normalize_registry(data) -> dict:
+    if isinstance(data, list):
+        data = {"skills": data}
+    if not isinstance(data, dict) or not isinstance(data.get("skills"), list):
+        raise ValueError("Skill registry must be an array or an object with a 'skills' array")
+    registry = {
+        "globalPrompt": data.get("globalPrompt") or "",
+        "categoryPrompts": dict(data.get("categoryPrompts") or {}),
+        "skills": data["skills"],
+        "meta": dict(data.get("meta") or {}),
+    }
+    if isinstance(data.get("index"), dict):
+        registry["index"] = data["index"]
+    return registry
+
+
+def load_registry(path: Path = REGISTRY_PATH, *, materialize: bool = False, staged: bool = True) -> dict:
+    """The registry at `path`, including a version staged in the current artifact group unless `staged=False`."""
+    registry = normalize_registry(json.loads(artifacts.read(path, staged=staged).decode("utf-8")))
+    return materialize_registry(registry) if materialize else registry
+
+
+def dump_registry(registry: dict, path: Path = REGISTRY_PATH) -> bool:
+    """Write `registry` in canonical form; returns False when the file already held those bytes."""
+    return write_json(path, registry, shape="registry")
+
+
+def is_composed(registry: dict) -> bool:
+    return registry.get("meta", {}).get("promptMode") == PROMPT_MODE_COMPOSED
+
+
+def compose_prompt(registry: dict, skill: dict) -> str:
+    """Full prompt text for `skill`, whichever mode the registry is in."""
+    if not is_composed(registry):
+        return skill.get("prompt") or ""
+    stage = skill.get("stage") or ""
+    return (
+        (skill.get("promptPrefix") or "")
+        + registry.get("globalPrompt", "")
+        + registry.get("categoryPrompts", {}).get(stage, "")
+        + (skill.get("prompt") or "")
+    )
+
+
+def materialize_registry(registry: dict) -> dict:
+    """Copy of `registry` with full prompts inlined into every skill."""
+    if not is_composed(registry):
+        return registry
+    skills = []
+    for s in registry["skills"]:
+        full = {k: v for k, v in s.items() if k != "promptPrefix"}
+        full["prompt"] = compose_prompt(registry, s)
+        skills.append(full)
+    meta = dict(registry["meta"], promptMode=PROMPT_MODE_MATERIALIZED)
+    return {**registry, "skills": skills, "meta": meta}
+
+
+def _unfence(block: str) -> str:
+    if block.startswith("```text\n") and block.rstrip().endswith("```"):
+        return block[len("```text\n"):block.rstrip().rfind("```")]
+    return block
+
+
+def _locate_block(prompts: list[str], block: str) -> str:
+    # split_skills_json.py kept the ```text fence around globalPrompt even
+    # though the skill prompts themselves are unfenced; accept either form.
+    for candidate in (block, _unfence(block)):
+        if candidate and all(candidate in p for p in prompts):
+            return candidate
+    return ""
+
+
+def _declared_blocks(
+    skills: list[dict], prompts: list[str], global_prompt: str, category_prompts: dict[str, str]
+) -> tuple[str, dict[str, str], list[tuple[str, str]]]:
+    g = _locate_block(prompts, global_prompt)
+    starts = [p.find(g) if g else 0 for p in prompts]
+    tails = [p[at + len(g):] for p, at in zip(prompts, starts)]
+
+    categories: dict[str, str] = {}
+    for stage in sorted({s.get("stage") or "" for s in skills}):
+        members = [t for s, t in zip(skills, tails) if (s.get("stage") or "") == stage]
+        block = category_prompts.get(stage, "")
+        if block and all(t.startswith(block) for t in members):
+            categories[stage] = block
+
+    parts = []
+    for s, p, at, tail in zip(skills, prompts, starts, tails):
+        c = categories.get(s.get("stage") or "", "")
+        parts.append((p[:at], tail[len(c):]))
+    return g, categories, parts
+
+
+def compose_registry(
+    registry: dict,
+    *,
+    global_prompt: str | None = None,
+    category_prompts: dict[str, str] | None = None,
+) -> dict:
+    """Convert a materialized registry into composed mode.
+
+    By default the shared blocks are discovered by `factoring.factor_prompts`.
+    When `global_prompt`/`category_prompts` are given, those blocks are used
+    instead; a given block that does not occur in every prompt of its scope
+    is dropped (stored as "") rather than guessed.
+    """
+    source = materialize_registry(registry)
+    skills = source["skills"]
+    prompts = [s.get("prompt") or "" for s in skills]
+
+    if global_prompt is None and category_prompts is None:
+        g, categories, parts = factor_prompts(skills)
+    else:
+        g, categories, parts = _declared_blocks(
+            skills,
+            prompts,
+            source["globalPrompt"] if global_prompt is None else global_prompt,
+            source["categoryPrompts"] if category_prompts is None else category_prompts,
+        )
+
+    composed = []
+    for s, (prefix, remainder) in zip(skills, parts):
+        out = dict(s)
+        if prefix:
+            out["promptPrefix"] = prefix
+        out["prompt"] = remainder
+        composed.append(out)
+
+    meta = dict(source["meta"], promptMode=PROMPT_MODE_COMPOSED)
+    unused_notes = {k: v for k, v in source["categoryPrompts"].items() if categories.get(k) != v}
+    if unused_notes:
+        meta["stageNotes"] = unused_notes
+    result = {"globalPrompt": g, "categoryPrompts": categories, "skills": composed, "meta": meta}
+    if "index" in source:
+        result["index"] = source["index"]
+
+    for s, p in zip(composed, prompts):
+        if compose_prompt(result, s) != p:
+            raise ValueError(f"Composed prompt for {s.get('skillKey')} does not round-trip")
+    return result
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert the skill registry between prompt modes.")
+    parser.add_argument("mode", choices=[PROMPT_MODE_COMPOSED, PROMPT_MODE_MATERIALIZED])
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--out", type=Path, help="defaults to --registry")
+    args = parser.parse_args()
+
+    from skill_toolchain.artifacts import build_lock
+
+    with build_lock():
+        registry = load_registry(args.registry)
+        before = len(json.dumps(registry, ensure_ascii=False).encode("utf-8"))
+        if args.mode == PROMPT_MODE_COMPOSED:
+            registry = compose_registry(registry)
+        else:
+            registry = materialize_registry(registry)
+        dump_registry(registry, args.out or args.registry)
+    after = len(json.dumps(registry, ensure_ascii=False).encode("utf-8"))
+    print(f"Wrote {len(registry['skills'])} skills ({args.mode}): {before} -> {after} bytes")
+
+
+if __name__ == "__main__":
+    main()
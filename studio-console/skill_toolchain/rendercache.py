@@ -0,0 +1,169 @@
+"""Memoized prompt rendering: in-process LRU plus a size-bounded disk cache.
+
+Entries are keyed by the template fingerprint and the render arguments
+(`compiler.skill_input_hash` already covers both for `auto_prompt`). The
+entries live in an in-process LRU (an OrderedDict), backed by one pack per
+fingerprint on disk, read on the first lookup and written back by `save()`:
+
+    .skillbuild/render-cache/<fingerprint>.json   {"entries": {key: text}}
+
+Entries within a pack are kept in least-recently-used order, and the LRU
+holds at most `max_entries` of them, so a long watch session stays bounded.
+Packs are evicted oldest-first (by mtime) once the directory exceeds
+`max_bytes`, so a template change leaves the old pack to age out.
+
+`build` uses it only with --render-cache: for the 18-skill catalog a full
+render takes under a millisecond, which loading and saving the pack does
+not beat. Watch mode keeps one cache in memory across cycles.
+
+    python -m skill_toolchain.rendercache stats
+    python -m skill_toolchain.rendercache clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path(".skillbuild/render-cache")
+MAX_BYTES = 32 * 1024 * 1024
+MAX_ENTRIES = 4096
+
+
+class RenderCache:
+    def __init__(
+        self, fingerprint: str, root: Path = CACHE_DIR, *, max_bytes: int = MAX_BYTES, max_entries: int = MAX_ENTRIES
+    ):
+        self.fingerprint = fingerprint
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # The in-process LRU: the pack's entries, least recently used first.
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self._loaded = False
+        self._unused_from_disk: set[str] = set()
+        self._added = False
+        self.stats = {"memoryHits": 0, "diskHits": 0, "misses": 0, "evicted": 0}
+
+    @property
+    def pack_path(self) -> Path:
+        return self.root / f"{self.fingerprint[:32]}.json"
+
+    def _load(self) -> None:
+        # Deferred until the first lookup, so builds that render nothing never read the pack.
+        self._loaded = True
+        try:
+            entries = json.loads(self.pack_path.read_text(encoding="utf-8")).get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return
+        os.utime(self.pack_path)  # packs are evicted by mtime
+        self.entries.update(entries)
+        self._unused_from_disk = set(entries)
+        self._trim()
+
+    def _trim(self) -> None:
+        while len(self.entries) > self.max_entries:
+            key, _ = self.entries.popitem(last=False)
+            self._unused_from_disk.discard(key)
+            self.stats["evicted"] += 1
+
+    def get(self, key: str) -> str | None:
+        if not self._loaded:
+            self._load()
+        text = self.entries.get(key)
+        if text is None:
+            self.stats["misses"] += 1
+            return None
+        self.entries.move_to_end(key)
+        if key in self._unused_from_disk:
+            self._unused_from_disk.discard(key)
+            self.stats["diskHits"] += 1
+        else:
+            self.stats["memoryHits"] += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        if not self._loaded:
+            self._load()
+        self.entries[key] = text
+        self.entries.move_to_end(key)
+        self._added = True
+        self._trim()
+
+    def render(self, fn, *args) -> str:
+        """`fn(*args)`, cached under the fingerprint, the function name and the arguments."""
+        raw = json.dumps([fn.__name__, args], ensure_ascii=False, separators=(",", ":"))
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        text = self.get(key)
+        if text is None:
+            text = fn(*args)
+            self.put(key, text)
+        return text
+
+    def save(self) -> None:
+        """Write the pack if anything was added (recency alone does not trigger a rewrite)."""
+        if not self._added:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        body = json.dumps({"entries": self.entries}, ensure_ascii=False)
+        # Drop least-recently-used entries while this pack alone is over budget.
+        while len(body.encode("utf-8")) > self.max_bytes and self.entries:
+            for _ in range(max(1, len(self.entries) // 8)):
+                self.entries.popitem(last=False)
+                self.stats["evicted"] += 1
+            body = json.dumps({"entries": self.entries}, ensure_ascii=False)
+        # One temp file per process, so concurrent builds never write into each other's.
+        tmp = self.pack_path.with_name(f"{self.pack_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(body, encoding="utf-8")
+        os.replace(tmp, self.pack_path)
+        self._added = False
+        self.stats["evicted"] += evict_packs(self.root, self.max_bytes, keep=self.pack_path)
+
+    def summary(self) -> str:
+        s = self.stats
+        lookups = s["memoryHits"] + s["diskHits"] + s["misses"]
+        ratio = (s["memoryHits"] + s["diskHits"]) / lookups if lookups else 0.0
+        return (
+            f"Render cache: {s['memoryHits']} memory hits, {s['diskHits']} disk hits, "
+            f"{s['misses']} misses ({ratio:.0%} hit rate), {s['evicted']} evicted"
+        )
+
+
+def evict_packs(root: Path, max_bytes: int, keep: Path | None = None) -> int:
+    """Delete the oldest packs until `root` fits in `max_bytes`; returns how many went."""
+    packs = sorted(root.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in packs)
+    removed = 0
+    for pack in packs:
+        if total <= max_bytes:
+            break
+        if keep is not None and pack == keep:
+            continue
+        total -= pack.stat().st_size
+        pack.unlink()
+        removed += 1
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or clear the prompt render cache.")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--dir", type=Path, default=CACHE_DIR)
+    args = parser.parse_args()
+
+    packs = sorted(args.dir.glob("*.json"), key=lambda p: -p.stat().st_mtime) if args.dir.exists() else []
+    if args.command == "clear":
+        for pack in packs:
+            pack.unlink()
+        print(f"Removed {len(packs)} pack(s) from {args.dir}")
+        return
+    for pack in packs:
+        entries = len(json.loads(pack.read_text(encoding="utf-8")).get("entries", {}))
+        print(f"{pack.name:40} {entries:>6} entries {pack.stat().st_size:>10} bytes")
+    print(f"{len(packs)} pack(s), {sum(p.stat().st_size for p in packs)} bytes (limit {MAX_BYTES})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Record/replay store for model responses to skill invocations.
+
+A response is keyed by the sha256 of the rendered instructions (the skill's
+full system prompt plus the client's language block), the output schema,
+the canonical input JSON and the model, so a prompt tweak only misses for
+the skills whose prompt it changed. Only outputs that validate against the
+output schema are recorded. Entries are zlib-compressed JSON:
+
+    .skillbuild/replay/ab/cdef...   {"skill", "model", "output", "responseBytes", "recordedAt"}
+
+Modes: `auto` replays hits and records misses, `replay` never calls the
+model (a miss is a failure), `record` always calls and overwrites, `off`
+bypasses the store. A hit refreshes the entry's mtime, and `evict` drops
+least recently used entries until the store fits in `max_bytes`. Hits and
+misses are counted per skill for the hit-ratio report.
+
+    python -m skill_toolchain.loadtest --replay auto --per-skill 20
+    python -m skill_toolchain.replay stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+
+from skill_toolchain.canonical import dumps
+
+REPLAY_DIR = Path(".skillbuild/replay")
+MAX_BYTES = 256 * 1024 * 1024
+MODES = ("auto", "replay", "record", "off")
+
+
+def replay_key(instructions: str, schema, user_input, model: str) -> str:
+    raw = dumps({"instructions": instructions, "schema": schema, "input": user_input, "model": model}, indent=None)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entries(root: Path) -> list[Path]:
+    return [p for p in root.glob("??/*") if not p.name.endswith(".tmp")] if root.exists() else []
+
+
+def _read(path: Path) -> dict:
+    return json.loads(zlib.decompress(path.read_bytes()))
+
+
+class ReplayStore:
+    def __init__(self, root: Path = REPLAY_DIR, *, mode: str = "auto", max_bytes: int = MAX_BYTES):
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode {mode!r} (have: {', '.join(MODES)})")
+        self.root = Path(root)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.stats: dict[str, dict[str, int]] = {}
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "replay"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:]
+
+    def _count(self, skill: str, name: str) -> None:
+        row = self.stats.setdefault(skill, {"hits": 0, "misses": 0, "recorded": 0})
+        row[name] += 1
+
+    def get(self, skill: str, key: str) -> dict | None:
+        if self.mode in ("off", "record"):
+            return None
+        path = self._path(key)
+        try:
+            entry = _read(path)
+        except (FileNotFoundError, zlib.error, json.JSONDecodeError):
+            self._count(skill, "misses")
+            return None
+        os.utime(path)  # entries are evicted least recently used first
+        self._count(skill, "hits")
+        return entry
+
+    def put(self, skill: str, key: str, model: str, output: str, response_bytes: int) -> None:
+        if self.mode in ("off", "replay"):
+            return
+        entry = {"skill": skill, "model": model, "output": output, "responseBytes": response_bytes,
+                 "recordedAt": int(time.time())}
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(zlib.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"), 6))
+        os.replace(tmp, path)
+        self._count(skill, "recorded")
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the store fits in `max_bytes`; returns how many went."""
+        entries = sorted(((p.stat(), p) for p in _entries(self.root)), key=lambda sp: sp[0].st_mtime)
+        total = sum(st.st_size for st, _ in entries)
+        removed = 0
+        for st, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            removed += 1
+        return removed
+
+    def hit_ratio(self, skill: str | None = None) -> float | None:
+        rows = [self.stats[skill]] if skill else list(self.stats.values())
+        lookups = sum(r["hits"] + r["misses"] for r in rows if r)
+        return sum(r["hits"] for r in rows) / lookups if lookups else None
+
+    def summary(self) -> str:
+        hits = sum(r["hits"] for r in self.stats.values())
+        misses = sum(r["misses"] for r in self.stats.values())
+        recorded = sum(r["recorded"] for r in self.stats.values())
+        ratio = self.hit_ratio()
+        return (
+            f"Replay ({self.mode}): {hits} hits, {misses} misses"
+            + (f" ({ratio:.0%} hit rate)" if ratio is not None else "")
+            + f", {recorded} recorded"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect, trim or clear the recorded model responses.")
+    parser.add_argument("command", choices=["stats", "evict", "clear"])
+    parser.add_argument("--dir", type=Path, default=REPLAY_DIR)
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES)
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        entries = _entries(args.dir)
+        for path in entries:
+            path.unlink()
+        print(f"Removed {len(entries)} recorded response(s) from {args.dir}")
+        return
+    if args.command == "evict":
+        removed = ReplayStore(args.dir, max_bytes=args.max_bytes).evict()
+        print(f"Evicted {removed} recorded response(s)")
+        return
+    per_skill: dict[str, list[int]] = {}
+    for path in _entries(args.dir):
+        try:
+            skill = _read(path).get("skill", "?")
+        except (zlib.error, json.JSONDecodeError):
+            skill = "(unreadable)"
+        row = per_skill.setdefault(skill, [0, 0])
+        row[0] += 1
+        row[1] += path.stat().st_size
+    for skill, (count, size) in sorted(per_skill.items()):
+        print(f"{skill:40} {count:>6} responses {size:>10} bytes")
+    total = sum(size for _, size in per_skill.values())
+    print(f"{sum(c for c, _ in per_skill.values())} response(s), {total} bytes (limit {args.max_bytes})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Pre-rendered runtime fields for the skill shards.
+
+For every skill in the stage shards (see `shards`) the build emits:
+
+- `runtimeContent`: `buildSkillPrompt(prompt, guidelines)`, what seeding
+  stores as the skill's content;
+- `runtimeSystemPrompt`: the complete `fullPrompt` that `runSkillLogic`
+  sends, so the hot path is a single field read;
+- `runtimeOutputSchema`: the minimal runtime schema compiled from
+  `outputSchema` (see `schemas`) as a parsed object, so the runtime does not
+  `JSON.parse` a schema string on every call. It is also the schema embedded
+  in `runtimeSystemPrompt`.
+
+They go into the shards only, which `getGeneratedAgentSkillByKey` loads
+lazily, never into agentSkills.generated.json: seeding imports that file
+whole and computes content itself, and the fields would roughly triple it.
+
+`check` recomputes the fields from prompt/guidelines/outputSchema and reports
+shard skills whose emitted values are stale; `strip` removes fields left in
+a registry by older builds. Parity with the TypeScript builder is covered
+by tests/convex/skills.test.ts.
+"""
+
+import argparse
+from pathlib import Path
+
+from skill_toolchain.artifacts import build_lock
+from skill_toolchain.prompting import build_skill_prompt, system_prompt
+from skill_toolchain.registry import REGISTRY_PATH, compose_prompt, dump_registry, load_registry
+from skill_toolchain.schemas import compile_skill_schema, to_json
+
+RUNTIME_FIELDS = ("runtimeContent", "runtimeSystemPrompt", "runtimeOutputSchema")
+
+
+def runtime_fields(registry: dict, skill: dict) -> dict:
+    content = build_skill_prompt(compose_prompt(registry, skill), skill.get("guidelines") or "")
+    schema = compile_skill_schema(skill)
+    return {
+        "runtimeContent": content,
+        "runtimeSystemPrompt": system_prompt(content, to_json(schema)),
+        "runtimeOutputSchema": schema,
+    }
+
+
+def has_runtime_fields(registry: dict) -> bool:
+    return any("runtimeSystemPrompt" in s for s in registry["skills"])
+
+
+def with_runtime_fields(registry: dict, skill: dict) -> dict:
+    return {**skill, **runtime_fields(registry, skill)}
+
+
+def strip_runtime_fields(registry: dict) -> None:
+    for s in registry["skills"]:
+        for k in RUNTIME_FIELDS:
+            s.pop(k, None)
+
+
+def check_runtime_fields(registry: dict) -> list[str]:
+    stale = []
+    for s in registry["skills"]:
+        if "runtimeSystemPrompt" not in s:
+            continue
+        fields = runtime_fields(registry, s)
+        for k, v in fields.items():
+            if s.get(k) != v:
+                stale.append(f"{s.get('skillKey')}: {k} is stale")
+    return stale
+
+
+def main() -> None:
+    from skill_toolchain.shards import SHARD_DIR
+
+    parser = argparse.ArgumentParser(description="Check the pre-rendered runtime prompts in the shards, or strip them from a registry.")
+    parser.add_argument("action", choices=["check", "strip"])
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--shard-dir", type=Path, default=SHARD_DIR)
+    args = parser.parse_args()
+
+    if args.action == "check":
+        shards = sorted(args.shard_dir.glob("*.json"))
+        stale = [f"{path.name}: {line}" for path in shards for line in check_runtime_fields(load_registry(path))]
+        for line in stale:
+            print(line)
+        if stale:
+            raise SystemExit(1)
+        print(f"Runtime prompts in {len(shards)} shard(s) match prompt/guidelines/outputSchema.")
+        return
+
+    with build_lock():
+        registry = load_registry(args.registry)
+        if has_runtime_fields(registry):
+            strip_runtime_fields(registry)
+            dump_registry(registry, args.registry)
+    print(f"No runtime fields left in {args.registry}.")
+
+
+if __name__ == "__main__":
+    main()
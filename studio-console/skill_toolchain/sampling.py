@@ -0,0 +1,348 @@
+"""Random instances of a JSON Schema, for equivalence checks and test corpora.
+
+`compile_sampler` turns a schema into a function of a `random.Random` that
+draws an instance satisfying it (for the keyword subset in
+`skill_toolchain.validation`); the schema is walked once, so drawing many
+instances of the same schema costs only the random draws. `sample` is the
+one-off form. `near_misses` derives small mutations of an instance that
+usually break exactly one constraint.
+
+Run as a module it streams a corpus of instances of every skill's
+inputSchema or outputSchema as JSONL, one `{"skillKey", "id", "input"}` (or
+`"output"`) object per line, the format `skill_toolchain.evaluate` reads.
+Instances depend only on --seed, the skill and the size knobs, so a corpus
+can be regenerated instead of committed:
+
+    python -m skill_toolchain corpus --count 1000 --out-dir skill_evals/corpus
+    python -m skill_toolchain corpus --schema output --count 200 --near-misses 2 --out outputs.jsonl
+"""
+
+import argparse
+import copy
+import json
+import math
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from skill_toolchain.artifacts import atomic_open
+from skill_toolchain.canonical import dumps
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.validation import is_valid
+
+_LATIN = string.ascii_letters + "     "
+_HEBREW = "אבגדהוזחטיכלמנסעפצקרשת" + "   "
+MAX_DEPTH = 4
+NUMBER_SPAN = 2000
+FLOAT_STEP = 0.001
+
+Sampler = Callable[[random.Random], object]
+
+# Keywords the samplers do not enforce; instances of schemas using them need checking.
+UNENFORCED = {"allOf", "not", "oneOf", "pattern", "uniqueItems", "multipleOf"}
+# Size bounds; when min > max no instance exists, and the samplers clamp to the minimum.
+SIZE_BOUNDS = (("minLength", "maxLength"), ("minItems", "maxItems"), ("minProperties", "maxProperties"))
+
+
+def _length_bounds(schema: dict, lo_key: str, hi_key: str, floor: int, spread: int) -> tuple[int, int]:
+    """[lo, hi] for a length drawn between `floor` and the schema minimum plus `spread`, within the schema's bounds."""
+    base, cap = schema.get(lo_key, 0), schema.get(hi_key)
+    lo = max(base, floor if cap is None else min(floor, cap))
+    hi = max(lo, base + spread if cap is None else min(cap, base + spread))
+    return lo, hi
+
+
+def _string_sampler(schema: dict, min_str: int, max_str: int) -> Sampler:
+    lo, hi = _length_bounds(schema, "minLength", "maxLength", min_str, max_str)
+
+    def draw(rng: random.Random) -> str:
+        alphabet = _HEBREW if rng.random() < 0.5 else _LATIN
+        return "".join(rng.choices(alphabet, k=rng.randint(lo, hi)))
+
+    return draw
+
+
+def _number_bounds(schema: dict, integer: bool) -> tuple[float, float]:
+    """Inclusive [lo, hi] to draw from; lo > hi when the schema's bounds leave nothing to draw.
+
+    Exclusive bounds are stepped inward (to the next integer, or by FLOAT_STEP,
+    the precision numbers are drawn at). A missing bound is NUMBER_SPAN away
+    from the given one, and with neither the range is centred on 0.
+    """
+    lows, highs = [], []
+    if "minimum" in schema:
+        lows.append(math.ceil(schema["minimum"]) if integer else schema["minimum"])
+    if "exclusiveMinimum" in schema:
+        bound = schema["exclusiveMinimum"]
+        lows.append(math.floor(bound) + 1 if integer else bound + FLOAT_STEP)
+    if "maximum" in schema:
+        highs.append(math.floor(schema["maximum"]) if integer else schema["maximum"])
+    if "exclusiveMaximum" in schema:
+        bound = schema["exclusiveMaximum"]
+        highs.append(math.ceil(bound) - 1 if integer else bound - FLOAT_STEP)
+    lo, hi = max(lows, default=None), min(highs, default=None)
+    if lo is None and hi is None:
+        return -NUMBER_SPAN // 2, NUMBER_SPAN // 2
+    if lo is None:
+        return hi - NUMBER_SPAN, hi
+    if hi is None:
+        return lo, lo + NUMBER_SPAN
+    return lo, hi
+
+
+def _number_sampler(schema: dict, integer: bool) -> Sampler:
+    lo, hi = _number_bounds(schema, integer)
+    if lo > hi:  # nothing satisfies the bounds; `exact` reports these schemas
+        return lambda rng: lo
+    if integer:
+        return lambda rng: rng.randint(lo, hi)
+
+    def draw(rng: random.Random) -> float:
+        value = rng.uniform(lo, hi)
+        rounded = round(value, 3)
+        return rounded if lo <= rounded <= hi else value
+
+    return draw
+
+
+def compile_sampler(schema, *, max_items: int = 3, max_str: int = 16, min_items: int = 0, min_str: int = 0,
+                    depth: int = 0) -> Sampler:
+    """A function drawing instances of `schema`.
+
+    Arrays get between `min_items` and minItems + `max_items` elements and
+    strings between `min_str` and minLength + `max_str` characters, always
+    within the schema's own bounds. Optional properties are included at
+    random, and not at all below MAX_DEPTH levels of nesting.
+    """
+    knobs = {"max_items": max_items, "max_str": max_str, "min_items": min_items, "min_str": min_str}
+    if schema is True or not isinstance(schema, dict):
+        return lambda rng: None
+    if "const" in schema:
+        const = schema["const"]
+        return lambda rng: copy.deepcopy(const)
+    if "enum" in schema:
+        enum = schema["enum"]
+        return lambda rng: copy.deepcopy(rng.choice(enum))
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            branches = [compile_sampler(sub, **knobs, depth=depth) for sub in schema[key]]
+            return lambda rng: rng.choice(branches)(rng)
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kinds = list(kind)
+        by_kind = {k: compile_sampler({**schema, "type": k}, **knobs, depth=depth) for k in kinds}
+        return lambda rng: by_kind[rng.choice(kinds)](rng)
+    if kind is None:
+        kind = "object" if "properties" in schema else "array" if "items" in schema else "string"
+
+    if kind == "object":
+        required = set(schema.get("required", []))
+        props = [
+            (name, compile_sampler(sub, **knobs, depth=depth + 1), name in required)
+            for name, sub in schema.get("properties", {}).items()
+        ]
+        optional = depth < MAX_DEPTH
+        extra = schema.get("additionalProperties", True)
+        extra_sampler = (
+            compile_sampler(extra, **knobs, depth=depth + 1) if isinstance(extra, dict) else lambda rng: "extra"
+        )
+
+        def draw_object(rng: random.Random) -> dict:
+            out = {}
+            for name, draw, is_required in props:
+                if is_required or (optional and rng.random() < 0.6):
+                    out[name] = draw(rng)
+            if extra is not False and rng.random() < 0.2:
+                out[f"x_{rng.randint(0, 999)}"] = extra_sampler(rng)
+            return out
+
+        return draw_object
+    if kind == "array":
+        lo, hi = _length_bounds(schema, "minItems", "maxItems", min_items, max_items)
+        if depth >= MAX_DEPTH:
+            hi = lo
+        item = compile_sampler(schema.get("items", {}), **knobs, depth=depth + 1)
+        if not schema.get("uniqueItems"):
+            return lambda rng: [item(rng) for _ in range(rng.randint(lo, hi))]
+
+        def draw_unique(rng: random.Random) -> list:
+            size, out, seen = rng.randint(lo, hi), [], set()
+            for _ in range(4 * size):  # duplicates are redrawn, a few times
+                if len(out) == size:
+                    break
+                value = item(rng)
+                key = json.dumps(value, sort_keys=True)
+                if key not in seen:
+                    seen.add(key)
+                    out.append(value)
+            return out
+
+        return draw_unique
+    if kind == "string":
+        return _string_sampler(schema, min_str, max_str)
+    if kind in ("integer", "number"):
+        return _number_sampler(schema, kind == "integer")
+    if kind == "boolean":
+        return lambda rng: rng.random() < 0.5
+    return lambda rng: None
+
+
+def sample(schema, rng: random.Random, *, max_items: int = 3, max_str: int = 16, depth: int = 0):
+    return compile_sampler(schema, max_items=max_items, max_str=max_str, depth=depth)(rng)
+
+
+def _paths(value, path=()):
+    yield path, value
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _paths(v, path + (k,))
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            yield from _paths(v, path + (i,))
+
+
+def _replace(root, path, new):
+    if not path:
+        return new
+    root = copy.deepcopy(root)
+    target = root
+    for step in path[:-1]:
+        target = target[step]
+    target[path[-1]] = new
+    return root
+
+
+def near_misses(instance, rng: random.Random, count: int = 8) -> list:
+    """Mutations of `instance`: wrong types, dropped keys, extra keys, resized arrays."""
+    nodes = list(_paths(instance))
+    out = []
+    for _ in range(count):
+        path, value = rng.choice(nodes)
+        move = rng.randrange(5)
+        if move == 0:
+            wrong = {str: 7, int: "7", float: "7.5", bool: "yes", list: {}, dict: [], type(None): 0}
+            out.append(_replace(instance, path, wrong.get(type(value), None)))
+        elif move == 1 and isinstance(value, dict) and value:
+            trimmed = dict(value)
+            trimmed.pop(rng.choice(list(trimmed)))
+            out.append(_replace(instance, path, trimmed))
+        elif move == 2 and isinstance(value, dict):
+            out.append(_replace(instance, path, {**value, "unexpectedKey": "x"}))
+        elif move == 3 and isinstance(value, list):
+            grown = value + value[:1] * rng.randint(1, 6) if value else [None]
+            out.append(_replace(instance, path, grown))
+        elif move == 4 and isinstance(value, list) and value:
+            out.append(_replace(instance, path, value[:-1]))
+        else:
+            out.append(_replace(instance, path, "not-in-enum"))
+    return out
+
+
+def exact(schema) -> bool:
+    """Whether every instance `compile_sampler(schema)` draws is valid, so drawing needs no validation."""
+    if not isinstance(schema, dict):
+        return True
+    if UNENFORCED & schema.keys():
+        return False
+    if any(lo in schema and hi in schema and schema[lo] > schema[hi] for lo, hi in SIZE_BOUNDS):
+        return False
+    # Only declared properties are drawn, so a required name without one is never present.
+    if set(schema.get("required", [])) - schema.get("properties", {}).keys():
+        return False
+    kinds = schema.get("type") if isinstance(schema.get("type"), list) else [schema.get("type")]
+    for kind in {"integer", "number"} & set(kinds):
+        lo, hi = _number_bounds(schema, kind == "integer")
+        if lo > hi:
+            return False
+    subs = [*schema.get("properties", {}).values(), schema.get("items"), schema.get("additionalProperties"),
+            *schema.get("anyOf", [])]
+    return all(exact(sub) for sub in subs if sub is not None)
+
+
+def valid_instance(schema, draw: Sampler, rng: random.Random, *, checked: bool = True, attempts: int = 20):
+    """An instance from `draw` that validates against `schema`; `checked=False` trusts the sampler (see `exact`)."""
+    if not checked:
+        return draw(rng)
+    for _ in range(attempts):
+        instance = draw(rng)
+        if is_valid(schema, instance):
+            return instance
+    raise ValueError(f"no valid instance in {attempts} draws")
+
+
+def corpus_lines(skill: dict, field: str, count: int, seed: int, knobs: dict, near_miss_count: int = 0):
+    """JSONL records for `count` instances of the skill's `<field>Schema`, each followed by its near misses."""
+    schema = json.loads(skill.get(f"{field}Schema") or "{}")
+    draw = compile_sampler(schema, **knobs)
+    checked = not exact(schema)
+    rng = random.Random(f"{seed}:{skill['skillKey']}:{field}")
+    for i in range(count):
+        try:
+            instance = valid_instance(schema, draw, rng, checked=checked)
+        except ValueError as e:
+            raise SystemExit(f"{skill['skillKey']} {field}Schema: {e}") from None
+        yield {"skillKey": skill["skillKey"], "id": f"{seed}-{i}", field: instance}
+        if near_miss_count:
+            misses = [m for m in near_misses(instance, rng, near_miss_count * 4) if not is_valid(schema, m)]
+            for j, miss in enumerate(misses[:near_miss_count]):
+                yield {"skillKey": skill["skillKey"], "id": f"{seed}-{i}-miss-{j}", field: miss, "valid": False}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream seeded instances of each skill's input or output schema as JSONL.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--schema", choices=["input", "output"], default="input")
+    parser.add_argument("--count", type=int, default=100, help="valid instances per skill")
+    parser.add_argument("--near-misses", type=int, default=0, metavar="K",
+                        help="also emit up to K invalid mutations of each instance, marked \"valid\": false")
+    parser.add_argument("--skill", action="append", help="only these skills (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-items", type=int, default=0)
+    parser.add_argument("--max-items", type=int, default=3, help="array elements beyond minItems")
+    parser.add_argument("--min-str", type=int, default=0)
+    parser.add_argument("--max-str", type=int, default=16, help="string characters beyond minLength")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--out", type=Path, help="one JSONL file (default: stdout)")
+    target.add_argument("--out-dir", type=Path, help="one <skillKey>.jsonl per skill, e.g. skill_evals/corpus")
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry, materialize=True)
+    skills = [s for s in registry["skills"] if not args.skill or s["skillKey"] in args.skill]
+    unknown = set(args.skill or ()) - {s["skillKey"] for s in skills}
+    if unknown:
+        raise SystemExit(f"Unknown skill(s): {', '.join(sorted(unknown))}")
+    knobs = {"min_items": args.min_items, "max_items": args.max_items, "min_str": args.min_str, "max_str": args.max_str}
+
+    start = time.perf_counter()
+    lines = size = 0
+
+    def emit(f, skill: dict) -> None:
+        nonlocal lines, size
+        for record in corpus_lines(skill, args.schema, args.count, args.seed, knobs, args.near_misses):
+            line = dumps(record, indent=None) + "\n"
+            f.write(line)
+            lines += 1
+            size += len(line)
+
+    if args.out_dir:
+        for skill in skills:
+            with atomic_open(args.out_dir / f"{skill['skillKey']}.jsonl") as f:
+                emit(f, skill)
+    elif args.out:
+        with atomic_open(args.out) as f:
+            for skill in skills:
+                emit(f, skill)
+    else:
+        for skill in skills:
+            emit(sys.stdout, skill)
+    seconds = time.perf_counter() - start
+    print(f"{lines} instance(s) of {len(skills)} skill(s) ({size / 1024:.0f} KB) in {seconds:.2f}s, "
+          f"{lines / seconds if seconds else 0:.0f}/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Runtime schema compilation: authoring schema in, minimal runtime schema out.
+
+`outputSchema` stays the authoring schema. The runtime schema is what the
+build emits as `runtimeOutputSchema` (see `runtime`): it is embedded in the
+pre-rendered system prompt and sent with the model call. Compilation:
+
+- drops annotation-only keywords (title, examples, default, $comment) and
+  descriptions that are empty or only restate the property name;
+- drops keywords set to their default value (additionalProperties: true,
+  minItems: 0, minLength: 0, uniqueItems: false, required: [], items: {});
+- orders keywords canonically (property order is kept: it drives the order
+  the model writes fields in).
+
+Every compiled schema is checked against its authoring schema on a sampled
+corpus of valid instances and near-miss mutations; both must accept and
+reject exactly the same instances.
+"""
+
+import argparse
+import json
+import random
+import re
+from pathlib import Path
+
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.sampling import compile_sampler, near_misses
+from skill_toolchain.validation import is_valid
+
+ANNOTATION_KEYWORDS = {"title", "examples", "default", "$comment"}
+DEFAULT_VALUES = {
+    "additionalProperties": True,
+    "minItems": 0,
+    "minLength": 0,
+    "uniqueItems": False,
+    "required": [],
+    "items": {},
+}
+KEYWORD_ORDER = [
+    "$schema", "$id", "$ref", "type", "const", "enum", "description",
+    "properties", "required", "additionalProperties",
+    "items", "minItems", "maxItems", "uniqueItems",
+    "minLength", "maxLength", "pattern", "format",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+    "anyOf", "oneOf", "allOf", "not",
+]
+_RANK = {k: i for i, k in enumerate(KEYWORD_ORDER)}
+
+# Keywords whose values are data (or name lists), not subschemas.
+_LITERAL_KEYWORDS = {"enum", "const", "required", "default", "examples"}
+_SCHEMA_MAP_KEYWORDS = {"properties", "patternProperties", "$defs", "definitions"}
+_SCHEMA_LIST_KEYWORDS = {"anyOf", "oneOf", "allOf", "prefixItems"}
+
+
+def _normalized(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", re.sub(r"_he$", "", text).lower())
+
+
+def _redundant_description(description, name: str | None) -> bool:
+    if not isinstance(description, str) or not description.strip():
+        return True
+    return name is not None and _normalized(description) == _normalized(name)
+
+
+def minify_schema(schema, name: str | None = None):
+    if not isinstance(schema, dict):
+        return schema
+    out = {}
+    for key, value in schema.items():
+        if key in ANNOTATION_KEYWORDS:
+            continue
+        if key == "description" and _redundant_description(value, name):
+            continue
+        if key in DEFAULT_VALUES and value == DEFAULT_VALUES[key] and type(value) is type(DEFAULT_VALUES[key]):
+            continue
+        if key in _LITERAL_KEYWORDS:
+            out[key] = value
+        elif key in _SCHEMA_MAP_KEYWORDS:
+            out[key] = {k: minify_schema(v, k) for k, v in value.items()}
+        elif key in _SCHEMA_LIST_KEYWORDS:
+            out[key] = [minify_schema(v) for v in value]
+        else:
+            out[key] = minify_schema(value)
+    # properties: {} only matters when something else refers to it.
+    if out.get("properties") == {} and "required" not in out:
+        del out["properties"]
+    return {k: out[k] for k in sorted(out, key=lambda k: (_RANK.get(k, len(_RANK)), k))}
+
+
+def to_json(schema) -> str:
+    return json.dumps(schema, ensure_ascii=False, separators=(",", ":"))
+
+
+def equivalence_failures(authoring, runtime, *, samples: int = 200, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    draws = (compile_sampler(authoring), compile_sampler(runtime))
+    failures = []
+    for i in range(samples):
+        base = draws[i % 2](rng)
+        for instance in [base, *near_misses(base, rng, count=4)]:
+            a, b = is_valid(authoring, instance), is_valid(runtime, instance)
+            if a != b:
+                failures.append(f"authoring={'accepts' if a else 'rejects'} runtime={'accepts' if b else 'rejects'}: {to_json(instance)[:200]}")
+    return failures
+
+
+# (authoring JSON, samples) -> runtime JSON. The equivalence check dominates
+# the cost, so long-running callers (watch mode) only pay for changed schemas.
+_COMPILED: dict[tuple[str, int], str] = {}
+
+
+def compile_skill_schema(skill: dict, *, samples: int = 200) -> dict:
+    """The equivalence-checked runtime schema for one skill's `outputSchema`."""
+    raw = skill.get("outputSchema") or "{}"
+    compiled = _COMPILED.get((raw, samples))
+    if compiled is None:
+        authoring = json.loads(raw)
+        runtime = minify_schema(authoring)
+        failures = equivalence_failures(authoring, runtime, samples=samples)
+        if failures:
+            raise ValueError(
+                f"Runtime schema for {skill.get('skillKey')} is not equivalent:\n  " + "\n  ".join(failures[:5])
+            )
+        compiled = _COMPILED[(raw, samples)] = to_json(runtime)
+    # A fresh object per call: callers store it in the registry.
+    return json.loads(compiled)
+
+
+def compile_runtime_schemas(registry: dict, *, samples: int = 200) -> list[tuple[str, int, int]]:
+    """Compile every skill's runtime schema; returns (key, before, after) byte sizes."""
+    return [
+        (
+            s.get("skillKey"),
+            len((s.get("outputSchema") or "").encode("utf-8")),
+            len(to_json(compile_skill_schema(s, samples=samples)).encode("utf-8")),
+        )
+        for s in registry["skills"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile and check minimal runtime output schemas (the build emits them as runtimeOutputSchema)."
+    )
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--samples", type=int, default=200, help="corpus size per skill for the equivalence check")
+    args = parser.parse_args()
+
+    sizes = compile_runtime_schemas(load_registry(args.registry), samples=args.samples)
+    for key, before, after in sizes:
+        print(f"{key:40} {before:>6} -> {after:>6} bytes")
+    total_before = sum(b for _, b, _ in sizes)
+    total_after = sum(a for _, _, a in sizes)
+    print(f"{'total':40} {total_before:>6} -> {total_after:>6} bytes (equivalence checked)")
+
+
+if __name__ == "__main__":
+    main()
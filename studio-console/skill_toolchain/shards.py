@@ -0,0 +1,114 @@
+"""Per-stage shards of the skill registry plus a key -> shard index module.
+
+`convex/skills/agentSkills.generated.json` carries every prompt and schema,
+so any Convex function importing it bundles all of them. The shards are
+self-contained registries (same object shape, composed or materialized)
+holding one stage each, with their own lookup `index` and the pre-rendered
+runtime fields (see `runtime`), and `index.ts` maps skillKey -> shard and
+loads a shard lazily:
+
+    convex/skills/generated/<stage>.json
+    convex/skills/generated/index.ts
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from skill_toolchain import artifacts
+from skill_toolchain.canonical import dump_bytes, write_bytes
+from skill_toolchain.catalog import build_index
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.runtime import with_runtime_fields
+
+SHARD_DIR = Path("convex/skills/generated")
+INDEX_MODULE = "index.ts"
+
+
+def shard_name(skill: dict) -> str:
+    return skill.get("stage") or "cross"
+
+
+def shard_registry(registry: dict) -> dict[str, dict]:
+    shards: dict[str, dict] = {}
+    for s in registry["skills"]:
+        name = shard_name(s)
+        if name not in shards:
+            category = registry["categoryPrompts"].get(name)
+            shards[name] = {
+                "globalPrompt": registry["globalPrompt"],
+                "categoryPrompts": {name: category} if category is not None else {},
+                "skills": [],
+                "meta": dict(registry["meta"], shard=name),
+            }
+        shards[name]["skills"].append(with_runtime_fields(registry, s))
+    for shard in shards.values():
+        shard["index"] = build_index(shard)
+    return shards
+
+
+def render_index_module(shards: dict[str, dict]) -> str:
+    by_key = {s["skillKey"]: name for name, shard in shards.items() for s in shard["skills"]}
+    lines = [
+        "// Generated by `python -m skill_toolchain.shards`. Do not edit.",
+        "",
+        f"export const SKILL_SHARDS = {json.dumps(sorted(shards))} as const;",
+        "",
+        "export type SkillShard = (typeof SKILL_SHARDS)[number];",
+        "",
+        "export const SKILL_SHARD_BY_KEY: Record<string, SkillShard> = {",
+        *(f"    {json.dumps(k)}: {json.dumps(v)}," for k, v in sorted(by_key.items())),
+        "};",
+        "",
+        "export async function loadSkillShard(shard: SkillShard) {",
+        "    switch (shard) {",
+        *(
+            f"        case {json.dumps(name)}:\n            return (await import(\"./{name}.json\")).default;"
+            for name in sorted(shards)
+        ),
+        "    }",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def write_shards(registry: dict, out_dir: Path = SHARD_DIR) -> dict[str, int]:
+    """Write all shards and the index as one artifact group; returns byte size per file."""
+    shards = shard_registry(registry)
+    files = {f"{name}.json": dump_bytes(shard, shape="registry") for name, shard in sorted(shards.items())}
+    files[INDEX_MODULE] = render_index_module(shards).encode("utf-8")
+    with artifacts.artifact_group():
+        for name, data in files.items():
+            write_bytes(out_dir / name, data)
+        for stale in out_dir.glob("*.json"):
+            if stale.name not in files:
+                artifacts.remove(stale)
+    return {name: len(data) for name, data in files.items()}
+
+
+def print_size_report(monolith_bytes: int, sizes: dict[str, int]) -> None:
+    shard_sizes = {k: v for k, v in sizes.items() if k.endswith(".json")}
+    print(f"{'artifact':28} {'bytes':>9} {'vs monolith':>12}")
+    print(f"{'agentSkills.generated.json':28} {monolith_bytes:>9} {'100.0%':>12}")
+    for name, size in sorted(shard_sizes.items(), key=lambda kv: -kv[1]):
+        print(f"{name:28} {size:>9} {size / monolith_bytes:>11.1%}")
+    print(f"{INDEX_MODULE:28} {sizes.get(INDEX_MODULE, 0):>9}")
+    largest = max(shard_sizes.values(), default=0) + sizes.get(INDEX_MODULE, 0)
+    print(f"\nLargest single-stage import: {largest} bytes ({largest / monolith_bytes:.1%} of the monolith)")
+    print(f"All shards together: {sum(shard_sizes.values())} bytes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Emit per-stage registry shards and a key -> shard index.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--out-dir", type=Path, default=SHARD_DIR)
+    args = parser.parse_args()
+
+    with artifacts.build_lock():
+        sizes = write_shards(load_registry(args.registry), args.out_dir)
+    print_size_report(args.registry.stat().st_size, sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Compile the skills spec markdown into registry skill records.
+
+Python port of scripts/parse-agent-skills.js. The spec is read line by line,
+once; each `## <skillKey> — Title` heading starts a section, and within it:
+
+    - **Stage:** / - **Channel:** / - **Allowed tools:**   metadata lines
+    ### Input Schema ...   followed by a ```json fence
+    ### Output Schema ...  followed by a ```json fence
+    ### Prompt (FULL)      followed by a ```text fence
+    ### Guidelines         text up to the next `---` or heading
+
+Records have the same fields as the JS output. Unlike the JS regexes, schema
+fences may be preceded by blank lines (the spec always has one, so the JS
+parser leaves every schema empty), and schemas are checked to be valid JSON.
+Malformed sections are reported as `path:line: message`, all at once.
+
+    python -m skill_toolchain.specs compile --out convex/skills/agentSkills.generated.json
+    python -m skill_toolchain.specs compile --render     # then v2 auto_prompt
+
+Compiling onto the project registry (the default --out) holds the build
+lock and refreshes its derived fields, manifest and shards with it.
+    python -m skill_toolchain.specs bench --copies 50    # vs the JS parser
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from skill_toolchain.artifacts import artifact_group, build_lock
+from skill_toolchain.config import configured_path
+from skill_toolchain.registry import REGISTRY_PATH, dump_registry, is_composed, load_registry, normalize_registry
+
+SPEC_PATH = configured_path("spec")
+JS_PARSER = Path("scripts/parse-agent-skills.js")
+
+_META_FIELDS = {
+    "- **Stage:**": "stage",
+    "- **Channel:**": "channel",
+    "- **Allowed tools:**": "allowedTools",
+}
+# Block heading prefix -> (record field, fence language).
+_BLOCKS = {
+    "### Input Schema": ("inputSchema", "json"),
+    "### Output Schema": ("outputSchema", "json"),
+    "### Prompt (FULL)": ("prompt", "text"),
+}
+_GUIDELINES = "### Guidelines"
+
+
+class SpecError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def _is_section_heading(line: str) -> bool:
+    # parse-agent-skills.js splits on /^##\s+/m, so "###" never starts a section.
+    return line.startswith("##") and line[2:3].isspace()
+
+
+def _parse_tools(raw: str) -> list[str]:
+    raw = raw.strip()
+    if not raw or raw.lower() == "none":
+        return []
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+def compile_spec(text: str, source: str = "<spec>") -> list[dict]:
+    """Skill records for every section of `text`, in order."""
+    errors: list[str] = []
+    skills: list[dict] = []
+    seen: dict[str, int] = {}
+
+    def error(lineno: int, message: str) -> None:
+        errors.append(f"{source}:{lineno}: {message}")
+
+    record: dict | None = None
+    expect: tuple[str, str, int] | None = None  # field, fence language, heading line
+    fence: tuple[str | None, str, int] | None = None  # field, fence language, opening line
+    body: list[str] = []
+    guidelines: list[str] | None = None
+
+    def close_guidelines() -> None:
+        nonlocal guidelines
+        if record is not None and guidelines is not None:
+            record["guidelines"] = "\n".join(guidelines).strip()
+        guidelines = None
+
+    def close_section(lineno: int) -> None:
+        nonlocal expect
+        close_guidelines()
+        if expect is not None:
+            error(expect[2], f"'{expect[1]}' fence expected after this heading before line {lineno}")
+            expect = None
+
+    lines = text.split("\n")
+    for lineno, line in enumerate(lines, 1):
+        if fence is not None:
+            if line.lstrip().startswith("```"):
+                field, lang, start = fence
+                content = "\n".join(body).strip()
+                if field and lang == "json" and content:
+                    try:
+                        json.loads(content)
+                    except json.JSONDecodeError as e:
+                        # body[i] is line start + i; content begins at the first non-blank one.
+                        offset = next(i for i, ln in enumerate(body) if ln.strip())
+                        error(start + offset + e.lineno - 1, f"{field}: invalid JSON: {e.msg}")
+                if field and record is not None:
+                    record[field] = content
+                fence, body = None, []
+            else:
+                body.append(line)
+            continue
+
+        if _is_section_heading(line):
+            close_section(lineno)
+            key = line[2:].strip().split(maxsplit=1)[0] if line[2:].strip() else ""
+            if not key:
+                error(lineno, "section heading has no skillKey")
+                record = None
+                continue
+            if key in seen:
+                error(lineno, f"duplicate skillKey {key!r} (first defined on line {seen[key]})")
+            seen[key] = lineno
+            record = {
+                "skillKey": key,
+                "stage": "",
+                "channel": "",
+                "allowedTools": [],
+                "inputSchema": "",
+                "outputSchema": "",
+                "prompt": "",
+                "guidelines": "",
+            }
+            skills.append(record)
+            continue
+
+        if record is None:
+            continue  # preamble before the first section
+
+        if guidelines is not None:
+            if line.startswith("---") or line.startswith("##"):
+                close_guidelines()
+            else:
+                guidelines.append(line)
+                continue
+
+        stripped = line.strip()
+        if expect is not None:
+            if not stripped:
+                continue
+            field, lang, start = expect
+            expect = None
+            if stripped.startswith("```" + lang):
+                fence, body = (field, lang, lineno), [stripped[3 + len(lang):]]
+                continue
+            error(start, f"'{lang}' fence expected after this heading, found {stripped[:40]!r} on line {lineno}")
+
+        if stripped.startswith("```"):
+            # Fences outside a known block are skipped whole.
+            fence, body = (None, stripped[3:], lineno), [""]
+            continue
+
+        for prefix, field in _META_FIELDS.items():
+            if stripped.startswith(prefix):
+                value = stripped[len(prefix):].strip()
+                record[field] = _parse_tools(value) if field == "allowedTools" else value
+                break
+        else:
+            for prefix, (field, lang) in _BLOCKS.items():
+                if stripped.startswith(prefix):
+                    if record[field]:
+                        error(lineno, f"second {prefix[4:]!r} block in section {record['skillKey']!r}")
+                    expect = (field, lang, lineno)
+                    break
+            else:
+                if stripped.startswith(_GUIDELINES):
+                    guidelines = []
+
+    if fence is not None:
+        error(fence[2], "unterminated ``` fence")
+    close_section(len(lines))
+    if errors:
+        raise SpecError(errors)
+    return skills
+
+
+def load_spec_registry(path: Path = SPEC_PATH) -> dict:
+    path = Path(path)
+    return normalize_registry(compile_spec(path.read_text(encoding="utf-8"), str(path)))
+
+
+# --- benchmark --------------------------------------------------------------
+
+
+def synthetic_spec(text: str, copies: int) -> str:
+    """`copies` renamed copies of every section in `text`."""
+    preamble, _, rest = text.partition("\n## ")
+    sections = ("## " + rest).split("\n## ")
+    out = [preamble]
+    for i in range(copies):
+        for section in sections:
+            heading, _, body = section.removeprefix("## ").partition("\n")
+            key, _, title = heading.partition(" ")
+            out.append(f"## {key}.copy{i:04d} {title}\n{body}")
+    return "\n".join(out)
+
+
+def _run_js(js_parser: Path, spec_text: str) -> tuple[float, float] | None:
+    """Wall time of the unmodified JS parser on `spec_text`, plus bare node startup."""
+    node = shutil.which("node")
+    if node is None:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        # The script resolves its paths relative to itself; mirror that layout.
+        root = Path(tmp)
+        script = root / "studio-console" / "scripts" / js_parser.name
+        script.parent.mkdir(parents=True)
+        shutil.copy(js_parser, script)
+        spec = root / "Specs" / "Agent" / SPEC_PATH.name
+        spec.parent.mkdir(parents=True)
+        spec.write_text(spec_text, encoding="utf-8")
+
+        start = time.perf_counter()
+        subprocess.run([node, str(script)], check=True, capture_output=True)
+        total = time.perf_counter() - start
+        start = time.perf_counter()
+        subprocess.run([node, "-e", ""], check=True)
+        startup = time.perf_counter() - start
+    return total, startup
+
+
+def bench(spec_path: Path, copies: list[int], repeat: int) -> None:
+    text = Path(spec_path).read_text(encoding="utf-8")
+    # The JS column covers the whole script (read, parse, write JSON); startup is node with no script.
+    print(f"{'sections':>9} {'bytes':>10} {'python':>10} {'js (wall)':>10} {'js - startup':>13}")
+    for count in copies:
+        big = synthetic_spec(text, count)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            skills = compile_spec(big)
+            best = min(best, time.perf_counter() - start)
+        js = _run_js(JS_PARSER, big)
+        js_cols = f"{js[0] * 1000:>8.1f}ms {(js[0] - js[1]) * 1000:>11.1f}ms" if js else f"{'n/a':>10} {'n/a':>13}"
+        print(f"{len(skills):>9} {len(big.encode('utf-8')):>10} {best * 1000:>8.1f}ms {js_cols}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the skills spec markdown into a registry.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    comp = sub.add_parser("compile", help="write skill records as a registry")
+    comp.add_argument("--spec", type=Path, default=SPEC_PATH)
+    comp.add_argument("--out", type=Path, default=REGISTRY_PATH)
+    comp.add_argument("--render", action="store_true", help="replace prompts with the v2 auto_prompt templates")
+    b = sub.add_parser("bench", help="time this compiler against scripts/parse-agent-skills.js")
+    b.add_argument("--spec", type=Path, default=SPEC_PATH)
+    b.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100])
+    b.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        bench(args.spec, args.copies, args.repeat)
+        return
+
+    try:
+        registry = load_spec_registry(args.spec)
+    except SpecError as e:
+        print(e, file=sys.stderr)
+        raise SystemExit(1)
+    if args.render:
+        from rewrite_agent_skills_prompts_v2 import render_registry
+
+        render_registry(registry)
+    refresh = args.out.exists() and args.out.resolve() == REGISTRY_PATH.resolve()
+    with build_lock(), artifact_group():
+        previous = load_registry(args.out) if refresh else None
+        dump_registry(registry, args.out)
+        if previous is not None:
+            # The project registry's derived fields, manifest, shards and build
+            # state follow the new records, in the same group as the records.
+            from skill_toolchain import compiler
+
+            compiler.build(
+                args.out,
+                render=False,
+                composed=is_composed(previous),
+                index="index" in previous,
+            )
+    print(f"Wrote {len(registry['skills'])} skills to {args.out}")
+    if refresh:
+        print("Refreshed its derived fields, manifest and shards.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""Local OpenAI-compatible stand-in for load-testing skill execution.
+
+Serves the calls convex/lib/openai.ts makes, without a provider:
+
+- POST /v1/responses: `callChatWithJsonSchema`/`callChatWithSchema`
+  (text.format json_schema, or json_object on their fallback path) and
+  `streamChatText` (stream: true, the SSE `response.*` events the SDK's
+  ResponseStream consumes);
+- POST /v1/chat/completions: response_format json_schema/json_object, and
+  `chat.completion.chunk` SSE streams;
+- GET /v1/models, and GET /standin/stats for the per-skill counters.
+
+Each request is attributed to a registry skill by its schema or, failing
+that, by its instructions (the skill's runtime system prompt), and JSON
+outputs are instances of that schema drawn by `sampling.compile_sampler` and checked
+with `validation`. Like the real API, strict json_schema formats that are not
+strict-compatible (objects without `additionalProperties: false`, optional
+properties) get a 400 "Invalid schema" error, which sends the client down its
+json_object fallback; --lenient-schemas accepts them.
+
+Load shaping:
+
+- --latency: time to first token, one of fixed:MS, uniform:LO,HI,
+  normal:MEAN,SD or lognormal:MEDIAN,SIGMA (milliseconds);
+- --tokens-per-second: output pacing per response; streamed deltas are
+  spaced out, non-streamed responses wait for the whole output;
+- --tpm: a server-wide token bucket; requests over it get 429
+  rate_limit_exceeded with retry-after-ms, as the SDK expects;
+- --rate-limit-rate, --error-rate, --invalid-rate: the fraction of requests
+  answered with an injected 429, a 500, or an output that violates its schema
+  (a `sampling.near_misses` mutation).
+
+With --seed a run is reproducible, and identical requests get identical
+outputs whatever order they arrive in, so outputs can serve as goldens.
+
+    python -m skill_toolchain.standin --latency lognormal:900,0.5 --tokens-per-second 80 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8787/v1 OPENAI_API_KEY=standin npx convex dev
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+from skill_toolchain.canonical import dumps
+from skill_toolchain.prompting import output_schema_raw, skill_system_prompt
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.runtime import runtime_fields
+from skill_toolchain.sampling import Sampler, compile_sampler, near_misses, valid_instance
+from skill_toolchain.tokens import estimate_tokens
+from skill_toolchain.validation import is_valid
+
+DEFAULT_PORT = 8787
+DEFAULT_MODEL = "gpt-5-mini"
+SAMPLE_ATTEMPTS = 20
+UNMATCHED = "(unmatched)"
+# Streamed deltas: one word with the whitespace before it, roughly one token each.
+_DELTAS = re.compile(r"\s*\S+|\s+$")
+_HEBREW = "אבגדהוזחטיכלמנסעפצקרשת"
+
+LATENCY_SHAPES: dict[str, tuple[int, Callable[..., float]]] = {
+    "fixed": (1, lambda rng, ms: ms),
+    "uniform": (2, lambda rng, lo, hi: rng.uniform(lo, hi)),
+    "normal": (2, lambda rng, mean, sd: rng.gauss(mean, sd)),
+    "lognormal": (2, lambda rng, median, sigma: median * math.exp(rng.gauss(0, sigma))),
+}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """`fixed:800`, `uniform:200,1500`, ... -> a function drawing a delay in seconds."""
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+    except ValueError:
+        values = []
+    if kind not in LATENCY_SHAPES or len(values) != LATENCY_SHAPES[kind][0]:
+        raise argparse.ArgumentTypeError(
+            f"expected fixed:MS, uniform:LO,HI, normal:MEAN,SD or lognormal:MEDIAN,SIGMA, got {spec!r}"
+        )
+    draw = LATENCY_SHAPES[kind][1]
+    return lambda rng: max(0.0, draw(rng, *values)) / 1000
+
+
+def strict_problem(schema, path: str = "$") -> str | None:
+    """Why the API would reject `schema` as a strict json_schema format, if it would."""
+    if not isinstance(schema, dict):
+        return None
+    if schema.get("type") == "object" or "properties" in schema:
+        if schema.get("additionalProperties") is not False:
+            return f"{path}: 'additionalProperties' is required to be supplied and to be false"
+        missing = [k for k in schema.get("properties", {}) if k not in schema.get("required", [])]
+        if missing:
+            return f"{path}: 'required' must include every key in properties. Missing '{missing[0]}'"
+    for name, sub in schema.get("properties", {}).items():
+        problem = strict_problem(sub, f"{path}.{name}")
+        if problem:
+            return problem
+    for key in ("items", "anyOf", "oneOf", "allOf"):
+        subs = schema.get(key)
+        for i, sub in enumerate(subs if isinstance(subs, list) else [subs] if subs else []):
+            problem = strict_problem(sub, f"{path}/{key}" + (f"/{i}" if isinstance(subs, list) else ""))
+            if problem:
+                return problem
+    return None
+
+
+class SkillIndex:
+    """Registry skills by the output schemas and system prompts the client sends for them."""
+
+    def __init__(self, registry: dict):
+        self.schemas: dict[str, dict] = {}
+        self._by_schema: dict[str, str] = {}
+        self._prompts: list[tuple[str, str]] = []
+        for s in registry["skills"]:
+            key = s["skillKey"]
+            self.schemas[key] = json.loads(output_schema_raw(s))
+            # Seeded rows send the full schema; the shard fallback sends the runtime fields.
+            runtime = runtime_fields(registry, s)
+            for schema in (self.schemas[key], runtime["runtimeOutputSchema"]):
+                self._by_schema[dumps(schema, indent=None)] = key
+            self._prompts.append((skill_system_prompt(registry, s), key))
+            self._prompts.append((runtime["runtimeSystemPrompt"], key))
+
+    def match(self, schema, instructions: str) -> str | None:
+        if isinstance(schema, dict):
+            key = self._by_schema.get(dumps(schema, indent=None))
+            if key:
+                return key
+        for prompt, key in self._prompts:
+            if instructions.startswith(prompt):
+                return key
+        return None
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, tokens: int) -> float:
+        """Take `tokens`, or take nothing and return the seconds until they would be available."""
+        tokens = min(tokens, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+            self.stamp = now
+            if self.level >= tokens:
+                self.level -= tokens
+                return 0.0
+            return (tokens - self.level) / self.rate
+
+
+def synthetic_text(rng: random.Random, tokens: int) -> str:
+    """Hebrew-looking prose of about `tokens` estimated tokens."""
+    words, used = [], 0
+    while used < tokens:
+        word = "".join(rng.choice(_HEBREW) for _ in range(rng.randint(2, 7)))
+        if rng.random() < 0.1:
+            word += "."
+        words.append(word)
+        used += math.ceil(len(word) / 2)
+    return " ".join(words)
+
+
+class StandIn:
+    """Request planning and counters shared by the handler threads."""
+
+    def __init__(self, index: SkillIndex, args: argparse.Namespace):
+        self.index = index
+        self.args = args
+        self.latency = args.latency
+        self.bucket = TokenBucket(args.tpm) if args.tpm else None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.stats: dict[str, dict[str, int]] = {}
+        self.samplers: dict[str, Sampler] = {}
+
+    def sampler(self, schema: dict) -> Sampler:
+        key = dumps(schema, indent=None)
+        if key not in self.samplers:
+            self.samplers[key] = compile_sampler(schema, max_items=self.args.max_items, max_str=self.args.max_str)
+        return self.samplers[key]
+
+    def rng(self) -> random.Random:
+        """Draws for latency and injected failures: reproducible per run, different for every request."""
+        with self.lock:
+            self.requests += 1
+            n = self.requests
+        return random.Random(f"{self.args.seed}:{n}") if self.args.seed is not None else random.Random()
+
+    def output_rng(self, prompt: str, fmt: dict) -> random.Random:
+        """Draws for the output: with --seed, the same request always gets the same output."""
+        if self.args.seed is None:
+            return random.Random()
+        digest = hashlib.sha256(f"{prompt}\0{dumps(fmt, indent=None)}".encode("utf-8")).hexdigest()
+        return random.Random(f"{self.args.seed}:{digest}")
+
+    def count(self, skill: str | None, **deltas: int) -> None:
+        with self.lock:
+            row = self.stats.setdefault(skill or UNMATCHED, {})
+            for name, value in deltas.items():
+                row[name] = row.get(name, 0) + value
+
+    def output(self, fmt: dict, skill: str | None, rng: random.Random, *, break_it: bool) -> tuple[str, bool]:
+        """(output text, whether it was deliberately made invalid)."""
+        kind = fmt.get("type", "text")
+        if kind == "text":
+            return synthetic_text(rng, self.args.text_tokens), False
+        schema = fmt.get("schema") if kind == "json_schema" else self.index.schemas.get(skill)
+        if not isinstance(schema, dict):
+            return "{}", False
+        draw = self.sampler(schema)
+        try:
+            instance = valid_instance(schema, draw, rng, attempts=SAMPLE_ATTEMPTS)
+        except ValueError:
+            instance = draw(rng)
+        if break_it:
+            broken = [m for m in near_misses(instance, rng, SAMPLE_ATTEMPTS) if not is_valid(schema, m)]
+            if broken:
+                return json.dumps(rng.choice(broken), ensure_ascii=False), True
+        return json.dumps(instance, ensure_ascii=False), False
+
+
+def _error(message: str, kind: str, code: str | None = None, param: str | None = None) -> dict:
+    return {"error": {"message": message, "type": kind, "param": param, "code": code}}
+
+
+def _input_text(value) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "skill-standin"
+
+    @property
+    def standin(self) -> StandIn:
+        return self.server.standin
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler's signature
+        if self.standin.args.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None) -> None:
+        raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": DEFAULT_MODEL, "object": "model", "owned_by": "standin"}]})
+        elif self.path.rstrip("/") == "/standin/stats":
+            with self.standin.lock:
+                self._send_json(200, {"requests": self.standin.requests, "skills": self.standin.stats})
+        else:
+            self._send_json(404, _error(f"Unknown path {self.path}", "invalid_request_error"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self._send_json(400, _error(f"We could not parse the JSON body of your request: {e}", "invalid_request_error"))
+            return
+        path = self.path.rstrip("/")
+        if path == "/v1/responses":
+            fmt = (body.get("text") or {}).get("format") or {"type": "text"}
+            instructions = body.get("instructions") or ""
+            prompt = instructions + _input_text(body.get("input") or "")
+            param = "text.format.schema"
+        elif path == "/v1/chat/completions":
+            rf = body.get("response_format") or {"type": "text"}
+            fmt = {"type": rf.get("type", "text"), **(rf.get("json_schema") or {})}
+            messages = body.get("messages") or []
+            instructions = "\n\n".join(
+                _input_text(m.get("content") or "") for m in messages if m.get("role") in ("system", "developer")
+            )
+            prompt = "\n\n".join(_input_text(m.get("content") or "") for m in messages)
+            param = "response_format"
+        else:
+            self._send_json(404, _error(f"Unknown path {self.path}", "invalid_request_error"))
+            return
+        self._serve(path, body, fmt, instructions, prompt, param)
+
+    def _serve(self, path: str, body: dict, fmt: dict, instructions: str, prompt: str, param: str) -> None:
+        standin, args = self.standin, self.standin.args
+        rng = standin.rng()
+        skill = standin.index.match(fmt.get("schema"), instructions)
+        standin.count(skill, requests=1)
+
+        if fmt.get("type") == "json_schema" and fmt.get("strict") and not args.lenient_schemas:
+            problem = strict_problem(fmt.get("schema"))
+            if problem:
+                standin.count(skill, rejectedSchema=1)
+                message = f"Invalid schema for response_format '{fmt.get('name', 'output')}': {problem}."
+                self._send_json(400, _error(message, "invalid_request_error", "invalid_json_schema", param))
+                return
+        roll = rng.random()
+        if roll < args.rate_limit_rate:
+            standin.count(skill, rateLimited=1)
+            self._rate_limited(1.0, "requests")
+            return
+        if roll < args.rate_limit_rate + args.error_rate:
+            standin.count(skill, errors=1)
+            self._send_json(500, _error("The server had an error while processing your request. Sorry about that!", "server_error"))
+            return
+
+        text, invalid = standin.output(
+            fmt, skill, standin.output_rng(prompt, fmt), break_it=rng.random() < args.invalid_rate
+        )
+        usage = (estimate_tokens(prompt), estimate_tokens(text))
+        if standin.bucket:
+            wait = standin.bucket.take(sum(usage))
+            if wait:
+                standin.count(skill, rateLimited=1)
+                self._rate_limited(wait, "tokens")
+                return
+
+        time.sleep(standin.latency(rng))
+        stream = bool(body.get("stream"))
+        model = body.get("model") or DEFAULT_MODEL
+        try:
+            if path == "/v1/responses":
+                self._responses(model, fmt, text, usage, stream)
+            else:
+                self._chat(model, text, usage, stream, (body.get("stream_options") or {}).get("include_usage"))
+        except (BrokenPipeError, ConnectionResetError):
+            standin.count(skill, aborted=1)
+            self.close_connection = True
+            return
+        standin.count(
+            skill, ok=1, invalid=int(invalid), streamed=int(stream), inputTokens=usage[0], outputTokens=usage[1],
+            outputBytes=len(text.encode("utf-8")),
+        )
+
+    def _rate_limited(self, wait: float, limit: str) -> None:
+        message = f"Rate limit reached for {limit} on the stand-in. Please try again in {math.ceil(wait * 1000)}ms."
+        headers = {"retry-after-ms": str(math.ceil(wait * 1000)), "retry-after": str(math.ceil(wait))}
+        self._send_json(429, _error(message, limit, "rate_limit_exceeded"), headers)
+
+    def _paced(self, text: str):
+        """`text` as streamed deltas, released no faster than --tokens-per-second."""
+        rate = self.standin.args.tokens_per_second
+        start, tokens = time.monotonic(), 0
+        for delta in _DELTAS.findall(text):
+            if rate:
+                tokens += estimate_tokens(delta)
+                time.sleep(max(0.0, start + tokens / rate - time.monotonic()))
+            yield delta
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _event(self, data: dict | str, event: str | None = None) -> None:
+        raw = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+        self.wfile.write(((f"event: {event}\n" if event else "") + f"data: {raw}\n\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def _responses(self, model: str, fmt: dict, text: str, usage: tuple[int, int], stream: bool) -> None:
+        rid, mid = f"resp_{uuid.uuid4().hex}", f"msg_{uuid.uuid4().hex}"
+        part = {"type": "output_text", "text": text, "annotations": []}
+        item = {"type": "message", "id": mid, "status": "completed", "role": "assistant", "content": [part]}
+        response = {
+            "id": rid, "object": "response", "created_at": int(time.time()), "status": "completed", "model": model,
+            "output": [item], "error": None, "incomplete_details": None, "text": {"format": fmt},
+            "usage": {
+                "input_tokens": usage[0], "output_tokens": usage[1], "total_tokens": sum(usage),
+                "input_tokens_details": {"cached_tokens": 0}, "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+        if not stream:
+            if self.standin.args.tokens_per_second:
+                time.sleep(usage[1] / self.standin.args.tokens_per_second)
+            self._send_json(200, response)
+            return
+
+        seq = iter(range(1 << 30))
+        where = {"item_id": mid, "output_index": 0, "content_index": 0}
+        pending = {**response, "status": "in_progress", "output": [], "usage": None}
+        self._start_stream()
+        for kind in ("response.created", "response.in_progress"):
+            self._event({"type": kind, "sequence_number": next(seq), "response": pending}, kind)
+        kind = "response.output_item.added"
+        self._event({"type": kind, "sequence_number": next(seq), "output_index": 0,
+                     "item": {**item, "status": "in_progress", "content": []}}, kind)
+        kind = "response.content_part.added"
+        self._event({"type": kind, "sequence_number": next(seq), **where, "part": {**part, "text": ""}}, kind)
+        for delta in self._paced(text):
+            kind = "response.output_text.delta"
+            self._event({"type": kind, "sequence_number": next(seq), **where, "delta": delta}, kind)
+        kind = "response.output_text.done"
+        self._event({"type": kind, "sequence_number": next(seq), **where, "text": text}, kind)
+        kind = "response.content_part.done"
+        self._event({"type": kind, "sequence_number": next(seq), **where, "part": part}, kind)
+        kind = "response.output_item.done"
+        self._event({"type": kind, "sequence_number": next(seq), "output_index": 0, "item": item}, kind)
+        kind = "response.completed"
+        self._event({"type": kind, "sequence_number": next(seq), "response": response}, kind)
+
+    def _chat(self, model: str, text: str, usage: tuple[int, int], stream: bool, include_usage: bool) -> None:
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "created": int(time.time()), "model": model}
+        counts = {"prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": sum(usage)}
+        if not stream:
+            if self.standin.args.tokens_per_second:
+                time.sleep(usage[1] / self.standin.args.tokens_per_second)
+            message = {"role": "assistant", "content": text, "refusal": None}
+            self._send_json(200, {**base, "object": "chat.completion", "usage": counts, "choices": [
+                {"index": 0, "message": message, "finish_reason": "stop", "logprobs": None}
+            ]})
+            return
+
+        def chunk(delta: dict, finish: str | None = None) -> dict:
+            choice = {"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}
+            return {**base, "object": "chat.completion.chunk", "choices": [choice]}
+
+        self._start_stream()
+        self._event(chunk({"role": "assistant", "content": ""}))
+        for delta in self._paced(text):
+            self._event(chunk({"content": delta}))
+        self._event(chunk({}, "stop"))
+        if include_usage:
+            self._event({**base, "object": "chat.completion.chunk", "choices": [], "usage": counts})
+        self._event("[DONE]")
+
+
+def print_stats(standin: StandIn) -> None:
+    columns = ("requests", "ok", "streamed", "rateLimited", "errors", "invalid", "rejectedSchema", "aborted", "outputTokens")
+    print(f"{'skill':36}" + "".join(f"{c:>15}" for c in columns))
+    for skill, row in sorted(standin.stats.items()):
+        print(f"{skill:36}" + "".join(f"{row.get(c, 0):>15}" for c in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve an OpenAI-compatible stand-in with synthetic skill outputs.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=parse_latency, default=parse_latency("fixed:0"),
+                        help="time to first token: fixed:MS, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="output pacing per response (0: none)")
+    parser.add_argument("--tpm", type=int, default=0, help="server-wide tokens per minute before 429s (0: unlimited)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="fraction of JSON outputs that break their schema")
+    parser.add_argument("--lenient-schemas", action="store_true", help="accept strict formats the API would reject")
+    parser.add_argument("--text-tokens", type=int, default=200, help="length of text-format (streamChatText) outputs")
+    parser.add_argument("--max-items", type=int, default=3, help="extra array items per sampled array")
+    parser.add_argument("--max-str", type=int, default=48, help="extra characters per sampled string")
+    parser.add_argument("--seed", type=int, help="make outputs and injected failures reproducible")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    standin = StandIn(SkillIndex(load_registry(args.registry, materialize=True)), args)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    server.standin = standin
+    print(f"Stand-in for {len(standin.index.schemas)} skills on http://{args.host}:{server.server_port}/v1; Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print_stats(standin)
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Streaming registry transforms with flat memory use.
+
+The registry is read one skill at a time, either from the `skills` array of
+the JSON artifact (decoded incrementally from fixed-size chunks) or from a
+JSONL variant. Transform stages are generators over skills, and output is
+written as each skill comes out, so peak memory is one skill plus one read
+chunk, not several copies of the whole catalog. Top-level fields are read in
+a first pass (`meta`, which records the prompt mode, follows the skills).
+
+JSONL registries hold one skill per line; top-level fields other than
+`skills` go on a first line of the form `{"$header": {...}}`.
+
+Factoring needs every prompt at once and is not available here; composing
+with a known global block (`--compose-global`) is.
+
+JSON output matches `registry.dump_registry` byte for byte (canonical key
+order and layout, see skill_toolchain.canonical):
+
+    python -m skill_toolchain.streaming big.json out.json --stage render --stage content-hash
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from skill_toolchain.artifacts import atomic_open
+from skill_toolchain.canonical import REGISTRY_KEYS, dumps
+from skill_toolchain.registry import (
+    PROMPT_MODE_COMPOSED,
+    PROMPT_MODE_MATERIALIZED,
+    compose_prompt,
+    is_composed,
+)
+
+CHUNK_SIZE = 1 << 16
+HEADER_KEY = "$header"
+
+_decoder = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+class _ChunkReader:
+    """Incremental JSON value reader over a text stream."""
+
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer stays chunk-sized.
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in registry stream, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self.buf) and not self.eof and isinstance(value, (int, float)):
+                if self._fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_registry_events(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, object]]:
+    """Yield ("field", (key, value)) for top-level fields and ("skill", skill) for each skill.
+
+    Events come in file order, so fields after `skills` (usually `meta`)
+    arrive after the last skill.
+    """
+    path = Path(path)
+    with path.open(encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if HEADER_KEY in record:
+                    for key, value in record[HEADER_KEY].items():
+                        yield "field", (key, value)
+                else:
+                    yield "skill", record
+            return
+
+        reader = _ChunkReader(f, chunk_size)
+        if reader.peek() == "[":
+            reader.expect("[")
+            yield from _iter_array(reader)
+            return
+        reader.expect("{")
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "skills":
+                reader.expect("[")
+                yield from _iter_array(reader)
+            else:
+                yield "field", (key, reader.value())
+            if reader.peek() == ",":
+                reader.expect(",")
+
+
+def _iter_array(reader: _ChunkReader) -> Iterator[tuple[str, object]]:
+    while reader.peek() != "]":
+        yield "skill", reader.value()
+        if reader.peek() == ",":
+            reader.expect(",")
+    reader.expect("]")
+
+
+def read_header(path: Path, chunk_size: int = CHUNK_SIZE) -> dict:
+    """All top-level fields except `skills`, in file order.
+
+    `meta` (and with it the prompt mode) is written after the skills array, so
+    this is a separate pass over the file; skills are decoded and dropped.
+    """
+    return {payload[0]: payload[1] for kind, payload in iter_registry_events(path, chunk_size) if kind == "field"}
+
+
+def _indented(value, level: int, shape: str | None = None) -> str:
+    # Strings never contain raw newlines in JSON, so re-indenting line starts is safe.
+    return dumps(value, shape=shape)[:-1].replace("\n", "\n" + "  " * level)
+
+
+def _field_shape(key: str) -> str | None:
+    return "index" if key == "index" else None
+
+
+def _header_line(header: dict) -> str:
+    return dumps({HEADER_KEY: header}, indent=None) + "\n"
+
+
+def write_registry_events(events: Iterable[tuple[str, object]], out: TextIO, *, jsonl: bool = False) -> int:
+    """Write events as a registry; returns the number of skills written.
+
+    JSONL output expects every field event before the first skill.
+    """
+    count = 0
+    if jsonl:
+        header: dict = {}
+        for kind, payload in events:
+            if kind == "field":
+                key, value = payload
+                header[key] = value
+                continue
+            if header and not count:
+                out.write(_header_line(header))
+            out.write(dumps(payload, shape="skill", indent=None) + "\n")
+            count += 1
+        if header and not count:
+            out.write(_header_line(header))
+        return count
+
+    # Same layout as canonical.dumps(registry, shape="registry"); the caller
+    # supplies fields in canonical order (see transform).
+    out.write("{")
+    fields = 0
+    in_skills = False
+    for kind, payload in events:
+        if kind == "skill":
+            if not in_skills:
+                out.write(("," if fields else "") + '\n  "skills": [')
+                fields += 1
+                in_skills = True
+            out.write(("," if count else "") + "\n    " + _indented(payload, 2, "skill"))
+            count += 1
+            continue
+        if in_skills:
+            out.write("\n  ]")
+            in_skills = False
+        key, value = payload
+        out.write(("," if fields else "") + f"\n  {json.dumps(key, ensure_ascii=False)}: " + _indented(value, 1, _field_shape(key)))
+        fields += 1
+    if in_skills:
+        out.write("\n  ]")
+    elif not count:
+        out.write(("," if fields else "") + '\n  "skills": []')
+    out.write("\n}\n")
+    return count
+
+
+# --- stages -----------------------------------------------------------------
+
+Stage = Callable[[dict, Iterator[dict]], Iterator[dict]]
+
+
+def stage_render(header: dict, skills: Iterator[dict]) -> Iterator[dict]:
+    import rewrite_agent_skills_prompts_v2 as templates
+
+    for s in skills:
+        yield {**s, "prompt": templates.auto_prompt(s["skillKey"], s.get("stage") or "cross")}
+
+
+def stage_content_hash(header: dict, skills: Iterator[dict]) -> Iterator[dict]:
+    from skill_toolchain.manifest import content_hash
+
+    for s in skills:
+        yield {**s, "contentHash": content_hash(header, s)}
+
+
+STAGES: dict[str, Stage] = {
+    "render": stage_render,
+    "content-hash": stage_content_hash,
+}
+
+
+def transform(
+    path: Path,
+    stages: list[Stage],
+    *,
+    compose_global: str | None = None,
+    fields_first: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[str, object]]:
+    """Stream the registry at `path` through `stages`, yielding output events.
+
+    Skills reach the stages materialized. Output is materialized too, unless
+    `compose_global` is given: then that block is cut out of every prompt and
+    written once as `globalPrompt`. Top-level fields come in canonical order
+    around the skills (`globalPrompt` and `categoryPrompts` before, the rest
+    after), or all first with `fields_first`.
+    """
+    header = read_header(path, chunk_size)
+    meta = header.get("meta") or {}
+    stage_header = dict(header, meta=dict(meta, promptMode=PROMPT_MODE_MATERIALIZED))
+    overrides: dict = {}
+    if is_composed(header):
+        overrides["meta"] = stage_header["meta"]
+    if compose_global is not None:
+        overrides = {
+            "globalPrompt": compose_global,
+            "categoryPrompts": {},
+            "meta": dict(meta, promptMode=PROMPT_MODE_COMPOSED),
+        }
+
+    fields = {**header, **overrides}
+    order = {key: i for i, key in enumerate(REGISTRY_KEYS)}
+    keys = sorted(fields, key=lambda k: (order.get(k, len(order)), k))
+    if fields_first:
+        before, after = keys, []
+    else:
+        before = [k for k in keys if order.get(k, len(order)) < order["skills"]]
+        after = [k for k in keys if k not in before]
+
+    skills = (payload for kind, payload in iter_registry_events(path, chunk_size) if kind == "skill")
+    if is_composed(header):
+        skills = (_materialize_one(header, s) for s in skills)
+    for stage in stages:
+        skills = stage(stage_header, skills)
+    if compose_global is not None:
+        skills = (_compose_one(s, compose_global) for s in skills)
+
+    for key in before:
+        yield "field", (key, fields[key])
+    for s in skills:
+        yield "skill", s
+    for key in after:
+        yield "field", (key, fields[key])
+
+
+def _materialize_one(header: dict, skill: dict) -> dict:
+    out = {k: v for k, v in skill.items() if k != "promptPrefix"}
+    out["prompt"] = compose_prompt(header, skill)
+    return out
+
+
+def _compose_one(skill: dict, block: str) -> dict:
+    prompt = skill.get("prompt") or ""
+    at = prompt.find(block)
+    if not block or at == -1:
+        raise ValueError(f"Global block not found in prompt for {skill.get('skillKey')}")
+    out = {k: v for k, v in skill.items() if k != "promptPrefix"}
+    if at:
+        out["promptPrefix"] = prompt[:at]
+    out["prompt"] = prompt[at + len(block):]
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream a skill registry through transform stages.")
+    parser.add_argument("source", type=Path, help=".json or .jsonl registry")
+    parser.add_argument("target", type=Path, help=".json or .jsonl output")
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), default=[],
+                        help="stage to apply, in order (repeatable)")
+    parser.add_argument("--compose-global", metavar="FILE", type=Path,
+                        help="write composed mode, factoring out the global block read from FILE")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.source.resolve() == args.target.resolve():
+        raise SystemExit("Streaming cannot rewrite a file in place; choose a different target.")
+    compose_global = args.compose_global.read_text(encoding="utf-8") if args.compose_global else None
+    jsonl = args.target.suffix == ".jsonl"
+    events = transform(
+        args.source,
+        [STAGES[name] for name in args.stage],
+        compose_global=compose_global,
+        fields_first=jsonl,
+        chunk_size=args.chunk_size,
+    )
+    with atomic_open(args.target) as out:
+        count = write_registry_events(events, out, jsonl=jsonl)
+    print(f"Streamed {count} skills to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Compiled, indexed template packs for the prompt generators.
+
+Template text lives in JSON sources under skill_toolchain/templates/ (plain
+data, so the TS side can read the same files). A source's dict-valued
+top-level fields become sections indexed by key (`prompts`, `focus`,
+`instructions`); every other field goes into the `meta` section.
+
+Sources are compiled on first use into .skillbuild/templates/<name>.pack:
+
+    b"SKTPACK1" | u32 header length | header JSON | entries (UTF-8 JSON)
+
+The header records the source's size/mtime (a changed source is recompiled
+on the next load), a digest per section, and the [offset, length] of every
+entry. The pack is memory-mapped and entries are decoded one at a time, so a
+build that renders three skills never parses the other templates.
+
+    python -m skill_toolchain.templatepack compile
+    python -m skill_toolchain.templatepack show v2 --section prompts --key router.scopeResolver
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+# argparse and hashlib are imported where they are used: generators import
+# this module on every run, but only compile and the CLI need them.
+
+SOURCE_DIR = Path(__file__).parent / "templates"
+PACK_DIR = Path(".skillbuild/templates")
+MAGIC = b"SKTPACK1"
+META_SECTION = "meta"
+
+_OPEN: dict[Path, "TemplatePack"] = {}
+
+
+def _source_stat(source: Path) -> dict:
+    st = source.stat()
+    return {"size": st.st_size, "mtimeNs": st.st_mtime_ns}
+
+
+def compile_pack(source: Path, target: Path) -> dict:
+    """Compile a JSON template source into a pack; returns the pack header."""
+    import hashlib
+    import tempfile
+
+    try:
+        data = json.loads(source.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{source}:{e.lineno}: invalid JSON: {e.msg}") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected a JSON object")
+
+    sections: dict[str, dict] = {META_SECTION: {}}
+    for name, value in data.items():
+        if isinstance(value, dict) and name != META_SECTION:
+            sections[name] = value
+        else:
+            sections[META_SECTION][name] = value
+
+    body = bytearray()
+    index: dict[str, dict[str, list[int]]] = {}
+    digests: dict[str, str] = {}
+    for name, entries in sections.items():
+        index[name] = {}
+        digest = hashlib.sha256()
+        for key, value in entries.items():
+            raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            index[name][key] = [len(body), len(raw)]
+            body += raw
+            digest.update(key.encode("utf-8") + b"\0" + raw + b"\0")
+        digests[name] = digest.hexdigest()
+
+    header = {"source": {"name": source.name, **_source_stat(source)}, "digests": digests, "index": index}
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp name per writer: parallel variant builds compile the same
+    # pack at once, and each must rename only its own complete file.
+    with tempfile.NamedTemporaryFile(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False) as f:
+        f.write(MAGIC + struct.pack("<I", len(head)) + head + body)
+    try:
+        os.replace(f.name, target)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    return header
+
+
+class TemplatePack:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path}: not a template pack")
+        (size,) = struct.unpack_from("<I", self._map, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._map[start:start + size].decode("utf-8"))
+        self.source = header["source"]
+        self.digests: dict[str, str] = header["digests"]
+        self._index: dict[str, dict[str, list[int]]] = header["index"]
+        self._data = start + size
+        self._decoded: dict[tuple[str, str], object] = {}
+
+    def sections(self) -> list[str]:
+        return list(self._index)
+
+    def keys(self, section: str) -> list[str]:
+        return list(self._index.get(section, ()))
+
+    def get(self, section: str, key: str, default=None):
+        found = self._decoded.get((section, key))
+        if found is not None:
+            return found
+        span = self._index.get(section, {}).get(key)
+        if span is None:
+            return default
+        offset, length = span
+        value = json.loads(self._map[self._data + offset:self._data + offset + length].decode("utf-8"))
+        self._decoded[(section, key)] = value
+        return value
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+
+
+def pack_path(name: str, pack_dir: Path = PACK_DIR) -> Path:
+    return Path(pack_dir) / f"{name}.pack"
+
+
+def load_pack(name: str, *, source_dir: Path = SOURCE_DIR, pack_dir: Path = PACK_DIR) -> TemplatePack:
+    """The compiled pack for templates/<name>.json, recompiled first if the source changed."""
+    source = Path(source_dir) / f"{name}.json"
+    target = pack_path(name, pack_dir)
+    if not source.exists():
+        raise SystemExit(f"No template source {source}")
+    expected = {"name": source.name, **_source_stat(source)}
+    pack = _OPEN.get(target)
+    if pack is not None and pack.source == expected:
+        return pack
+    if pack is not None:
+        pack.close()  # the file is about to be replaced (and Windows refuses while it is mapped)
+    try:
+        pack = TemplatePack(target)
+    except (FileNotFoundError, ValueError, json.JSONDecodeError, struct.error):
+        pack = None
+    if pack is None or pack.source != expected:
+        if pack is not None:
+            pack.close()
+        compile_pack(source, target)
+        pack = TemplatePack(target)
+    _OPEN[target] = pack
+    return pack
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile or inspect the generators' template packs.")
+    parser.add_argument("--pack-dir", type=Path, default=PACK_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    comp = sub.add_parser("compile", help="(re)compile template sources")
+    comp.add_argument("names", nargs="*", help="default: every source in skill_toolchain/templates")
+    show = sub.add_parser("show", help="list a pack's sections, or print one entry")
+    show.add_argument("name")
+    show.add_argument("--section")
+    show.add_argument("--key")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        names = args.names or sorted(p.stem for p in SOURCE_DIR.glob("*.json"))
+        for name in names:
+            source, target = SOURCE_DIR / f"{name}.json", pack_path(name, args.pack_dir)
+            if not source.exists():
+                raise SystemExit(f"No template source {source}")
+            header = compile_pack(source, target)
+            entries = sum(len(v) for v in header["index"].values())
+            print(f"{name:16} {entries:>4} entries {source.stat().st_size:>8} -> {target.stat().st_size:>8} bytes  {target}")
+        return
+
+    pack = load_pack(args.name, pack_dir=args.pack_dir)
+    if args.section and args.key:
+        value = pack.get(args.section, args.key)
+        if value is None:
+            raise SystemExit(f"No entry {args.key!r} in section {args.section!r}")
+        print(value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, indent=2))
+        return
+    for section in [args.section] if args.section else pack.sections():
+        keys = pack.keys(section)
+        print(f"{section:14} {len(keys):>4} entries  {pack.digests.get(section, '')[:12]}")
+        if args.section:
+            for key in keys:
+                print(f"  {key}")
+
+
+if __name__ == "__main__":
+    main()
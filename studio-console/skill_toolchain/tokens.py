@@ -0,0 +1,138 @@
+"""Offline token-budget analyzer for skill prompts and schemas.
+
+Token counts are estimated without downloading a tokenizer. Text is
+pre-split the way BPE tokenizers do (letter runs, digit runs, punctuation,
+whitespace) and each piece is costed by script: Latin words average about
+four characters per token, Hebrew words about two (Hebrew is split much more
+finely by GPT-style vocabularies), digits three, and other scripts are
+costed by UTF-8 byte length. The estimate is deliberately slightly
+pessimistic so budgets fail early rather than late.
+
+Budgets come from the "tokenBudgets" section of skill-toolchain.json:
+
+    {"tokenBudgets": {"default": 4500, "stages": {"printing": 5000}}}
+"""
+
+import argparse
+import json
+import math
+import re
+from pathlib import Path
+
+from skill_toolchain.config import CONFIG_PATH, load_config
+from skill_toolchain.prompting import build_skill_prompt, output_schema_raw, pretty_schema, skill_system_prompt
+from skill_toolchain.registry import REGISTRY_PATH, compose_prompt, load_registry
+
+
+_PIECES = re.compile(
+    r"[A-Za-zÀ-ɏ]+"  # Latin words
+    r"|[֐-׿]+"  # Hebrew words (incl. niqqud)
+    r"|\d+"
+    r"|\n+"
+    r"|[ \t]+"
+    r"|[^\sA-Za-zÀ-ɏ֐-׿\d]+"
+)
+
+
+def _piece_tokens(piece: str) -> int:
+    first = piece[0]
+    if first.isascii() and first.isalpha() or "À" <= first <= "ɏ":
+        return 1 if len(piece) <= 6 else math.ceil(len(piece) / 4)
+    if "֐" <= first <= "׿":
+        return math.ceil(len(piece) / 2)
+    if first.isdigit():
+        return math.ceil(len(piece) / 3)
+    if first in "\n \t":
+        # Whitespace runs merge into a single token (indentation in
+        # pretty-printed schemas is mostly one token per line).
+        return 1
+    if piece.isascii():
+        return math.ceil(len(piece) / 2)
+    return math.ceil(len(piece.encode("utf-8")) / 2)
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    pieces = _PIECES.findall(text)
+    # Leading spaces are absorbed into the following word in BPE vocabularies.
+    spaces = sum(1 for a, b in zip(pieces, pieces[1:]) if a == " " and not b[0].isspace())
+    return sum(_piece_tokens(p) for p in pieces) - spaces
+
+
+def measure(text: str) -> dict[str, int]:
+    return {
+        "bytes": len(text.encode("utf-8")),
+        "chars": len(text),
+        "tokens": estimate_tokens(text),
+    }
+
+
+def analyze_skill(registry: dict, skill: dict) -> dict:
+    prompt = compose_prompt(registry, skill)
+    guidelines = skill.get("guidelines") or ""
+    parts = {
+        "prompt": measure(prompt),
+        "guidelines": measure(guidelines),
+        "inputSchema": measure(skill.get("inputSchema") or ""),
+        "outputSchema": measure(pretty_schema(output_schema_raw(skill))),
+        "content": measure(build_skill_prompt(prompt, guidelines)),
+        "systemPrompt": measure(skill_system_prompt(registry, skill)),
+    }
+    return {"skillKey": skill.get("skillKey"), "stage": skill.get("stage") or "", **parts}
+
+
+def load_budgets(path: Path = CONFIG_PATH) -> dict:
+    return load_config(path).get("tokenBudgets", {})
+
+
+def budget_for(budgets: dict, stage: str) -> int | None:
+    return budgets.get("stages", {}).get(stage, budgets.get("default"))
+
+
+def check_budgets(rows: list[dict], budgets: dict) -> list[str]:
+    failures = []
+    for row in rows:
+        limit = budget_for(budgets, row["stage"])
+        used = row["systemPrompt"]["tokens"]
+        if limit is not None and used > limit:
+            failures.append(f"{row['skillKey']} ({row['stage']}): {used} tokens > budget {limit}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure skill prompt/schema size and enforce token budgets.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH)
+    parser.add_argument("--json", action="store_true", help="print machine-readable rows")
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry)
+    rows = [analyze_skill(registry, s) for s in registry["skills"]]
+    budgets = load_budgets(args.config)
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'skillKey':40} {'stage':12} {'prompt':>7} {'guide':>6} {'inSch':>6} {'outSch':>7} {'system':>7} {'budget':>7}")
+        for row in rows:
+            limit = budget_for(budgets, row["stage"])
+            print(
+                f"{row['skillKey']:40} {row['stage']:12} {row['prompt']['tokens']:>7} "
+                f"{row['guidelines']['tokens']:>6} {row['inputSchema']['tokens']:>6} "
+                f"{row['outputSchema']['tokens']:>7} {row['systemPrompt']['tokens']:>7} "
+                f"{limit if limit is not None else '-':>7}"
+            )
+        total = sum(r["systemPrompt"]["tokens"] for r in rows)
+        print(f"\n{len(rows)} skills, {total} system-prompt tokens in total (estimated)")
+
+    failures = check_budgets(rows, budgets)
+    if failures:
+        print("\nToken budget exceeded:")
+        for line in failures:
+            print(f"  {line}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Minimal JSON Schema validator for the keywords our skill schemas use.
+
+Stdlib-only, so the toolchain runs without `jsonschema`. Supported:
+type, enum, const, properties, required, additionalProperties, items,
+minItems, maxItems, uniqueItems, minLength, maxLength, pattern, minimum,
+maximum, exclusiveMinimum, exclusiveMaximum, anyOf, oneOf, allOf, not.
+Annotation keywords (description, title, examples, default, $comment) are
+ignored, as the spec requires.
+"""
+
+import re
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool)
+    or isinstance(v, float) and v.is_integer(),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+}
+
+
+def _equal(a, b) -> bool:
+    # JSON equality: 1 == 1.0 but True != 1.
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def iter_errors(schema, instance, path: str = "$"):
+    if schema is True or schema == {}:
+        return
+    if schema is False:
+        yield f"{path}: no value is allowed here"
+        return
+
+    types = schema.get("type")
+    if types is not None:
+        names = types if isinstance(types, list) else [types]
+        if not any(_TYPE_CHECKS.get(t, lambda v: False)(instance) for t in names):
+            yield f"{path}: expected {'/'.join(names)}"
+            return
+
+    if "enum" in schema and not any(_equal(instance, e) for e in schema["enum"]):
+        yield f"{path}: value not in enum"
+    if "const" in schema and not _equal(instance, schema["const"]):
+        yield f"{path}: value does not match const"
+
+    if isinstance(instance, dict):
+        props = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in instance:
+                yield f"{path}: missing required property '{key}'"
+        extra = schema.get("additionalProperties", True)
+        for key, value in instance.items():
+            if key in props:
+                yield from iter_errors(props[key], value, f"{path}.{key}")
+            elif extra is False:
+                yield f"{path}: unexpected property '{key}'"
+            elif isinstance(extra, dict):
+                yield from iter_errors(extra, value, f"{path}.{key}")
+
+    if isinstance(instance, list):
+        if "minItems" in schema and len(instance) < schema["minItems"]:
+            yield f"{path}: expected at least {schema['minItems']} items"
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            yield f"{path}: expected at most {schema['maxItems']} items"
+        if schema.get("uniqueItems"):
+            for i, item in enumerate(instance):
+                if any(_equal(item, other) for other in instance[:i]):
+                    yield f"{path}: items are not unique"
+                    break
+        items = schema.get("items")
+        if isinstance(items, (dict, bool)):
+            for i, item in enumerate(instance):
+                yield from iter_errors(items, item, f"{path}[{i}]")
+
+    if isinstance(instance, str):
+        if "minLength" in schema and len(instance) < schema["minLength"]:
+            yield f"{path}: shorter than {schema['minLength']}"
+        if "maxLength" in schema and len(instance) > schema["maxLength"]:
+            yield f"{path}: longer than {schema['maxLength']}"
+        if "pattern" in schema and not re.search(schema["pattern"], instance):
+            yield f"{path}: does not match pattern"
+
+    if _TYPE_CHECKS["number"](instance):
+        if "minimum" in schema and instance < schema["minimum"]:
+            yield f"{path}: below minimum {schema['minimum']}"
+        if "maximum" in schema and instance > schema["maximum"]:
+            yield f"{path}: above maximum {schema['maximum']}"
+        if "exclusiveMinimum" in schema and instance <= schema["exclusiveMinimum"]:
+            yield f"{path}: not above {schema['exclusiveMinimum']}"
+        if "exclusiveMaximum" in schema and instance >= schema["exclusiveMaximum"]:
+            yield f"{path}: not below {schema['exclusiveMaximum']}"
+
+    for sub in schema.get("allOf", []):
+        yield from iter_errors(sub, instance, path)
+    if "anyOf" in schema and not any(is_valid(sub, instance) for sub in schema["anyOf"]):
+        yield f"{path}: matches none of anyOf"
+    if "oneOf" in schema and sum(is_valid(sub, instance) for sub in schema["oneOf"]) != 1:
+        yield f"{path}: must match exactly one of oneOf"
+    if "not" in schema and is_valid(schema["not"], instance):
+        yield f"{path}: matches a forbidden schema"
+
+
+def validate(schema, instance) -> list[str]:
+    return list(iter_errors(schema, instance))
+
+
+def is_valid(schema, instance) -> bool:
+    return next(iter_errors(schema, instance), None) is None
@@ -0,0 +1,190 @@
+"""Build every prompt variant side by side, in parallel, and compare them.
+
+Generated variants re-render the skills of the current registry:
+
+    v2              rewrite_agent_skills_prompts_v2 (templates/v2.json, auto_prompt)
+    update_skills   update_skills (templates/update_skills.json)
+    v1              rewrite_agent_skills_prompts (STUDIO_BASE, prompt_block)
+
+Spec variants are the hand-simplified registries under ../Specs, taken as is:
+
+    simplified-v2   agentSkills.simplified.v2.json
+    simplified-v3   agentSkills.simplifiedv3.json
+
+Rendering is split into (variant, skill chunk) jobs on a process pool. Each
+variant is written to .skillbuild/variants/<name>.json (runtime fields and
+content hashes are dropped, they would be stale), then a size/token table is
+printed. Nothing under convex/ is touched.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from skill_toolchain.artifacts import artifact_group
+from skill_toolchain.registry import REGISTRY_PATH, dump_registry, load_registry
+from skill_toolchain.runtime import strip_runtime_fields
+from skill_toolchain.tokens import CONFIG_PATH, analyze_skill, check_budgets, load_budgets
+
+GENERATORS = {
+    "v2": "rewrite_agent_skills_prompts_v2",
+    "update_skills": "update_skills",
+    "v1": "rewrite_agent_skills_prompts",
+}
+SPEC_VARIANTS = {
+    "simplified-v2": Path("../Specs/simplified skills/agentSkills.simplified.v2.json"),
+    "simplified-v3": Path("../Specs/simplified skills/agentSkills.simplifiedv3.json"),
+}
+OUT_DIR = Path(".skillbuild/variants")
+
+
+def load_generator(module_name: str):
+    """The generator module's `render_registry(registry)` stage (prompts are rewritten in place)."""
+    module = importlib.import_module(module_name)
+    if hasattr(module, "render_registry"):
+        return module.render_registry
+    # v1 only builds a skillKey -> prompt table.
+    prompts = module.PROMPTS
+
+    def render(registry: dict) -> None:
+        for s in registry["skills"]:
+            if s.get("skillKey") in prompts:
+                s["prompt"] = prompts[s["skillKey"]]
+
+    return render
+
+
+def unavailable_reason(module_name: str) -> str | None:
+    try:
+        importlib.import_module(module_name)
+    except SyntaxError as e:
+        return f"{Path(e.filename or module_name).name}:{e.lineno}: {e.msg}"
+    return None
+
+
+def _render_chunk(module_name: str, skills: list[dict]) -> list[dict]:
+    # Copies: with one worker the chunks are the caller's own skill dicts.
+    registry = {"globalPrompt": "", "categoryPrompts": {}, "skills": [dict(s) for s in skills], "meta": {}}
+    load_generator(module_name)(registry)
+    return registry["skills"]
+
+
+def _chunks(items: list, count: int) -> list[list]:
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def render_variants(base: dict, names: list[str], workers: int) -> dict[str, dict]:
+    """Rendered registry per generated variant in `names`."""
+    jobs = [(name, chunk) for name in names for chunk in _chunks(base["skills"], workers)]
+    if workers == 1:
+        results = [_render_chunk(GENERATORS[name], chunk) for name, chunk in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_chunk, GENERATORS[name], chunk) for name, chunk in jobs]
+            results = [f.result() for f in futures]
+    rendered: dict[str, list[dict]] = {name: [] for name in names}
+    for (name, _), skills in zip(jobs, results):
+        rendered[name].extend(skills)
+    out = {}
+    for name, skills in rendered.items():
+        registry = {**base, "skills": skills}
+        strip_runtime_fields(registry)
+        for s in skills:
+            s.pop("contentHash", None)
+        out[name] = registry
+    return out
+
+
+def summarize(name: str, registry: dict, base: dict | None, budgets: dict) -> dict:
+    rows = [analyze_skill(registry, s) for s in registry["skills"]]
+    before = {s.get("skillKey"): s.get("prompt") for s in base["skills"]} if base else {}
+    system = [r["systemPrompt"]["tokens"] for r in rows]
+    return {
+        "variant": name,
+        "skills": len(rows),
+        "rendered": sum(1 for s in registry["skills"] if before.get(s.get("skillKey")) != s.get("prompt"))
+        if base else None,
+        "artifactBytes": len(json.dumps(registry, ensure_ascii=False, indent=2).encode("utf-8")),
+        "promptBytes": sum(r["prompt"]["bytes"] for r in rows),
+        "promptTokens": sum(r["prompt"]["tokens"] for r in rows),
+        "systemTokens": sum(system),
+        "maxSystemTokens": max(system, default=0),
+        "overBudget": len(check_budgets(rows, budgets)),
+    }
+
+
+def print_table(rows: list[dict]) -> None:
+    print(
+        f"{'variant':15} {'skills':>6} {'rendered':>8} {'artifact':>9} {'prompt B':>9} "
+        f"{'prompt tok':>10} {'system tok':>10} {'max sys':>8} {'over':>5}"
+    )
+    for r in rows:
+        if "unavailable" in r:
+            print(f"{r['variant']:15} unavailable: {r['unavailable']}")
+            continue
+        rendered = "-" if r["rendered"] is None else r["rendered"]
+        print(
+            f"{r['variant']:15} {r['skills']:>6} {rendered:>8} {r['artifactBytes']:>9} {r['promptBytes']:>9} "
+            f"{r['promptTokens']:>10} {r['systemTokens']:>10} {r['maxSystemTokens']:>8} {r['overBudget']:>5}"
+        )
+
+
+def main() -> None:
+    names = [*GENERATORS, *SPEC_VARIANTS]
+    parser = argparse.ArgumentParser(description="Render all prompt variants in parallel and compare them.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH,
+                        help="skills the generators render (.json registry or .md spec)")
+    parser.add_argument("--variant", action="append", choices=names, help="limit to these variants (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH)
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args()
+
+    selected = args.variant or names
+    if args.registry.suffix == ".md":
+        from skill_toolchain.specs import load_spec_registry
+
+        base = load_spec_registry(args.registry)
+    else:
+        base = load_registry(args.registry, materialize=True)
+    budgets = load_budgets(args.config)
+    rows = [summarize("current", base, None, budgets)]
+
+    generators = []
+    for name in (n for n in selected if n in GENERATORS):
+        reason = unavailable_reason(GENERATORS[name])
+        if reason:
+            rows.append({"variant": name, "unavailable": reason})
+        else:
+            generators.append(name)
+
+    start = time.perf_counter()
+    registries = render_variants(base, generators, max(1, args.workers))
+    elapsed = time.perf_counter() - start
+    for name in (n for n in selected if n in SPEC_VARIANTS):
+        registries[name] = load_registry(SPEC_VARIANTS[name], materialize=True)
+
+    with artifact_group():
+        for name, registry in registries.items():
+            dump_registry(registry, args.out_dir / f"{name}.json")
+    for name, registry in registries.items():
+        rows.append(summarize(name, registry, base if name in GENERATORS else None, budgets))
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    print_table(rows)
+    print(
+        f"\nRendered {len(generators)} variants x {len(base['skills'])} skills in {elapsed * 1000:.0f}ms "
+        f"on {args.workers} workers; outputs in {args.out_dir}/"
+    )
+
+
+if __name__ == "__main__":
+    main()
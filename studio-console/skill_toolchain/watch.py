@@ -0,0 +1,169 @@
+"""Watch mode: rebuild the registry incrementally while sources are edited.
+
+Watched paths are polled (mtime and size) and bursts of saves are debounced
+into one rebuild. Each cycle goes through `compiler.build` in-process, so
+the render cache and compiled schemas stay warm between cycles:
+
+- template modules (rewrite_agent_skills_prompts_v2.py) and their template
+  sources (skill_toolchain/templates/v2.json) cause a module reload, and
+  every skill whose render inputs changed is re-rendered;
+- the registry itself, when edited by hand or by another script, gets its
+  derived fields (runtime prompts/schemas, hashes, index, shards) refreshed;
+- with --spec, the spec markdown is the source of the skills: changed
+  sections are compiled (skill_toolchain.specs) and merged into the
+  registry, and their prompts are kept as written instead of re-rendered.
+
+After each cycle the changed keys, system-prompt token deltas and build
+time are printed. Files the build writes itself do not trigger a cycle.
+
+    python -m skill_toolchain.watch
+    python -m skill_toolchain.watch --spec ../Specs/Agent/magnetic_studio_skills_prompts_v2_with_images.md
+"""
+
+import argparse
+import importlib
+import time
+from pathlib import Path
+
+from skill_toolchain import compiler
+from skill_toolchain.artifacts import artifact_group, build_lock
+from skill_toolchain.registry import REGISTRY_PATH, dump_registry, load_registry
+from skill_toolchain.rendercache import RenderCache
+from skill_toolchain.templatepack import SOURCE_DIR
+from skill_toolchain.tokens import analyze_skill
+
+TEMPLATE_MODULES = ("rewrite_agent_skills_prompts_v2",)
+# Template pack sources and the module that renders them.
+TEMPLATE_SOURCES = {"v2": "rewrite_agent_skills_prompts_v2"}
+POLL_SECONDS = 0.2
+DEBOUNCE_SECONDS = 0.3
+
+
+def _signature(paths: list[Path]) -> dict[Path, tuple[int, int] | None]:
+    sig = {}
+    for path in paths:
+        try:
+            st = path.stat()
+            sig[path] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            sig[path] = None
+    return sig
+
+
+def wait_for_change(paths: list[Path], seen: dict, *, poll: float, debounce: float) -> set[Path]:
+    """Block until some path changes, then until it has been quiet for `debounce` seconds."""
+    while True:
+        current = _signature(paths)
+        if current != seen:
+            break
+        time.sleep(poll)
+    while True:
+        time.sleep(debounce)
+        settled = _signature(paths)
+        if settled == current:
+            return {p for p in paths if current[p] != seen.get(p)}
+        current = settled
+
+
+def system_tokens(registry_path: Path) -> dict[str, int]:
+    registry = load_registry(registry_path)
+    return {s["skillKey"]: analyze_skill(registry, s)["systemPrompt"]["tokens"] for s in registry["skills"]}
+
+
+def merge_spec(spec_path: Path, registry_path: Path) -> list[str]:
+    """Replace the registry's skills with the spec's; returns keys whose spec fields changed."""
+    from skill_toolchain.specs import load_spec_registry
+
+    records = load_spec_registry(spec_path)["skills"]
+    registry = load_registry(registry_path, materialize=True) if registry_path.exists() else None
+    existing = {s["skillKey"]: s for s in registry["skills"]} if registry else {}
+    changed = []
+    skills = []
+    for record in records:
+        old = existing.get(record["skillKey"])
+        if old is None or any(old.get(k) != v for k, v in record.items()):
+            changed.append(record["skillKey"])
+        # Derived fields (contentHash, runtime*) are refreshed by the build.
+        skills.append({**(old or {}), **record})
+    removed = [k for k in existing if k not in {r["skillKey"] for r in records}]
+    if changed or removed or registry is None:
+        base = registry or {"globalPrompt": "", "categoryPrompts": {}, "meta": {}}
+        dump_registry({**base, "skills": skills}, registry_path)
+    return changed + removed
+
+
+def report(reasons: list[str], result: dict, before: dict[str, int], after: dict[str, int], seconds: float,
+           *, merged: bool = False) -> None:
+    print(f"[{time.strftime('%H:%M:%S')}] {'; '.join(reasons)}")
+    for key in result["rendered"]:
+        print(f"  rendered   {key}")
+    for key in result["kept"]:
+        print(f"  kept       {key} (hand-written prompt)")
+    for key in sorted(before.keys() | after.keys()):
+        old, new = before.get(key), after.get(key)
+        if old == new:
+            continue
+        if old is None:
+            print(f"  tokens     {key}: added, {new}")
+        elif new is None:
+            print(f"  tokens     {key}: removed, was {old}")
+        else:
+            print(f"  tokens     {key}: {old} -> {new} ({new - old:+d})")
+    total = sum(after.values()) - sum(before.values())
+    print(f"  {'wrote' if result['written'] or merged else 'no changes'}; {total:+d} tokens in total; build {seconds * 1000:.0f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the skill registry whenever its sources change.")
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--state", type=Path, default=compiler.STATE_PATH)
+    parser.add_argument("--spec", type=Path, help="spec markdown to take skills from")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS)
+    parser.add_argument("--once", action="store_true", help="run one build cycle and exit")
+    args = parser.parse_args()
+
+    modules = {Path(importlib.import_module(name).__file__).resolve(): name for name in TEMPLATE_MODULES}
+    modules.update({(SOURCE_DIR / f"{name}.json").resolve(): module for name, module in TEMPLATE_SOURCES.items()})
+    watched = [args.registry.resolve(), *([args.spec.resolve()] if args.spec else []), *modules]
+    cache = RenderCache(compiler.template_fingerprint())
+    changed = {args.spec.resolve()} if args.spec else set()
+    print(f"Watching {len(watched)} file(s); Ctrl+C to stop.")
+
+    try:
+        while True:
+            start = time.perf_counter()
+            seen = _signature(watched)
+            reasons = [f"{p.name} changed" for p in sorted(changed)] or ["initial build"]
+            keys = []
+            try:
+                for path in changed & modules.keys():
+                    importlib.reload(importlib.import_module(modules[path]))
+                    cache = RenderCache(compiler.template_fingerprint())
+                # A build started from another terminal finishes before this cycle reads the
+                # registry, and the merged spec is only written together with the build.
+                with build_lock(), artifact_group():
+                    before = system_tokens(args.registry) if args.registry.exists() else {}
+                    if args.spec and args.spec.resolve() in changed:
+                        keys = merge_spec(args.spec, args.registry)
+                        reasons.append(f"{len(keys)} spec section(s) changed: {', '.join(keys[:5])}")
+                    result = compiler.build(
+                        args.registry, state_path=args.state, cache=cache, render=not args.spec
+                    )
+            except (ValueError, SyntaxError, SystemExit) as e:
+                print(f"[{time.strftime('%H:%M:%S')}] build failed: {e}")
+            else:
+                report(reasons, result, before, system_tokens(args.registry), time.perf_counter() - start,
+                       merged=bool(keys))
+            if args.once:
+                return
+            # The build's own registry write is not a change; edits made to
+            # other sources while it ran still are.
+            seen[args.registry.resolve()] = _signature([args.registry.resolve()])[args.registry.resolve()]
+            changed = wait_for_change(watched, seen, poll=args.poll, debounce=args.debounce)
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 
 import { describe, it, expect, vi } from "vitest";
-import { runSkill } from "../../convex/lib/skills"; 
+import { buildSkillSystemPrompt, runSkill } from "../../convex/lib/skills"; 
+import agentSkills from "../../convex/skills/agentSkills.generated.json";
+import { SKILL_SHARDS, loadSkillShard } from "../../convex/skills/generated";
 
 // Mock dependencies
 const mockCtx = {
@@ -47,3 +49,46 @@ describe("Skills Registry", () => {
     })).rejects.toThrow(/Validation Error/);
   });
 });
+
+describe("Generated runtime prompts", () => {
+  // Emitted into the shards by skill_toolchain.shards; must equal what runSkillLogic would build.
+  it("match what runSkillLogic builds from content and the runtime schema", async () => {
+    const skills: any[] = [];
+    for (const shard of SKILL_SHARDS) {
+      skills.push(...((await loadSkillShard(shard)) as any).skills);
+    }
+    expect(skills).toHaveLength((agentSkills as any).skills.length);
+    for (const skill of skills) {
+      // runtimeOutputSchema is compiled from outputSchema (skill_toolchain.schemas).
+      expect(skill.runtimeOutputSchema, skill.skillKey).toBeTypeOf("object");
+      const expected = buildSkillSystemPrompt(skill.runtimeContent || "You are a helpful assistant.", skill.runtimeOutputSchema);
+      expect(skill.runtimeSystemPrompt, skill.skillKey).toBe(expected);
+    }
+  });
+});
+
+describe("Generated registry", () => {
+  // Seeding imports the whole file; runtime fields live in the shards only.
+  const generated = agentSkills as any;
+
+  it("stays small", () => {
+    expect(JSON.stringify(generated).length).toBeLessThan(200_000);
+    for (const skill of generated.skills) {
+      expect(skill.runtimeSystemPrompt, skill.skillKey).toBeUndefined();
+    }
+  });
+});
+
+describe("Generated skill index", () => {
+  // Written by skill_toolchain.catalog; getGeneratedAgentSkillByKey relies on byKey.
+  const generated = agentSkills as any;
+
+  it("points every key at its own skill", () => {
+    expect(generated.index).toBeDefined();
+    const skills: any[] = generated.skills;
+    expect(Object.keys(generated.index.byKey)).toHaveLength(skills.length);
+    for (const [key, position] of Object.entries(generated.index.byKey)) {
+      expect(skills[position as number].skillKey).toBe(key);
+    }
+  });
+});
@@ -0,0 +1,32 @@
+"""Fixtures for the skill_toolchain tests.
+
+The toolchain runs from studio-console (paths in skill-toolchain.json are
+relative to it, and the compiler imports the rewrite scripts from there), so
+every test does too. Tests never touch the committed registry: they work on
+a copy in `tmp_path`.
+
+    python -m pytest tests/skill_toolchain
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+STUDIO_CONSOLE = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(STUDIO_CONSOLE))
+
+from skill_toolchain.registry import REGISTRY_PATH  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def studio_console_cwd(monkeypatch):
+    monkeypatch.chdir(STUDIO_CONSOLE)
+
+
+@pytest.fixture
+def registry_copy(tmp_path: Path) -> Path:
+    target = tmp_path / REGISTRY_PATH.name
+    shutil.copyfile(STUDIO_CONSOLE / REGISTRY_PATH, target)
+    return target
@@ -0,0 +1,36 @@
+import pytest
+
+from skill_toolchain.artifacts import artifact_group, is_staged
+from skill_toolchain.compiler import build
+from skill_toolchain.registry import dump_registry, load_registry
+
+
+def test_staged_registry_is_read_back_within_the_group(registry_copy):
+    original = registry_copy.read_bytes()
+    registry = load_registry(registry_copy)
+    registry["skills"] = registry["skills"][:1]
+
+    with artifact_group():
+        dump_registry(registry, registry_copy)
+        assert is_staged(registry_copy)
+        assert len(load_registry(registry_copy)["skills"]) == 1
+        assert load_registry(registry_copy, staged=False)["skills"] != registry["skills"]
+        assert registry_copy.read_bytes() == original
+    assert len(load_registry(registry_copy)["skills"]) == 1
+
+
+def test_failed_merge_and_build_leave_every_file(registry_copy, tmp_path):
+    state = tmp_path / "state.json"
+    build(registry_copy, state_path=state, shards=True, force=True)
+    shard_dir = registry_copy.parent / "generated"
+    before = {p: p.read_bytes() for p in [registry_copy, state, *shard_dir.iterdir()]}
+
+    registry = load_registry(registry_copy)
+    registry["skills"][0]["prompt"] += "\nEdited in the spec."
+    with pytest.raises(RuntimeError), artifact_group():
+        dump_registry(registry, registry_copy)
+        build(registry_copy, state_path=state)
+        raise RuntimeError("interrupted before the group commits")
+
+    assert {p: p.read_bytes() for p in before} == before
+    assert sorted(shard_dir.iterdir()) == sorted(p for p in before if p.parent == shard_dir)
@@ -0,0 +1,59 @@
+import json
+import random
+
+import pytest
+
+from skill_toolchain import canonical
+from skill_toolchain.canonical import REGISTRY_KEYS, SCHEMA_KEYS, SKILL_KEYS, dump_bytes, dumps
+from skill_toolchain.registry import load_registry
+
+
+def shuffled(value, rng: random.Random):
+    """`value` with its keys in random order, except inside parsed schemas, whose order is meaningful."""
+    if isinstance(value, dict):
+        items = list(value.items())
+        rng.shuffle(items)
+        return {k: v if k in SCHEMA_KEYS else shuffled(v, rng) for k, v in items}
+    if isinstance(value, list):
+        return [shuffled(v, rng) for v in value]
+    return value
+
+
+def test_key_order_does_not_change_the_bytes(registry_copy):
+    registry = load_registry(registry_copy)
+    expected = dump_bytes(registry, shape="registry")
+    for seed in range(3):
+        assert dump_bytes(shuffled(registry, random.Random(seed)), shape="registry") == expected
+
+
+def test_committed_registry_is_canonical(registry_copy):
+    assert dump_bytes(json.loads(registry_copy.read_bytes()), shape="registry") == registry_copy.read_bytes()
+
+
+def test_declared_keys_come_first():
+    registry = {"meta": {}, "zzz": 1, "skills": [{"zeta": 1, "prompt": "p", "skillKey": "k"}], "globalPrompt": ""}
+    out = json.loads(dumps(registry, shape="registry"))
+    assert list(out) == [k for k in REGISTRY_KEYS if k in registry] + ["zzz"]
+    assert list(out["skills"][0]) == [k for k in SKILL_KEYS if k in ("skillKey", "prompt")] + ["zeta"]
+
+
+def test_schema_property_order_is_kept():
+    schema = {
+        "type": "object",
+        "properties": {"summary_he": {"type": "string"}, "nextBestStage": {"type": "string"}, "a": {"type": "number"}},
+        "required": ["summary_he"],
+    }
+    skill = {"skillKey": "ux.example", "runtimeOutputSchema": schema}
+
+    for value, shape in ((skill, "skill"), ({"skills": [skill]}, "registry")):
+        out = json.loads(dumps(value, shape=shape))
+        dumped = out["runtimeOutputSchema"] if shape == "skill" else out["skills"][0]["runtimeOutputSchema"]
+        assert list(dumped) == list(schema)
+        assert list(dumped["properties"]) == ["summary_he", "nextBestStage", "a"]
+
+
+@pytest.mark.skipif(canonical.orjson is None, reason="orjson not installed")
+def test_encoders_agree(registry_copy):
+    registry = load_registry(registry_copy)
+    for indent in (None, 2):
+        assert canonical._dump(registry, "registry", indent, True) == canonical._dump(registry, "registry", indent, False)
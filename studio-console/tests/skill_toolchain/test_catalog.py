@@ -0,0 +1,24 @@
+from skill_toolchain.catalog import SkillRegistry, build_index
+from skill_toolchain.registry import compose_registry, load_registry
+
+
+def test_lookups_match_a_scan(registry_copy):
+    registry = load_registry(registry_copy)
+    skills = SkillRegistry(registry)
+    for i, s in enumerate(registry["skills"]):
+        assert skills.get(s["skillKey"]).to_dict() == s
+        assert build_index(registry)["byKey"][s["skillKey"]] == i
+        for tool in s["allowedTools"]:
+            picked = skills.query(stage=s["stage"], channel=s["channel"], tool=tool)
+            assert [r.skillKey for r in picked] == [
+                t["skillKey"] for t in registry["skills"]
+                if (t["stage"], t["channel"]) == (s["stage"], s["channel"]) and tool in t["allowedTools"]
+            ]
+    assert skills.get("no.such.skill") is None
+
+
+def test_prompts_are_composed_on_demand(registry_copy):
+    materialized = load_registry(registry_copy, materialize=True)
+    skills = SkillRegistry(compose_registry(materialized))
+    for s in materialized["skills"]:
+        assert skills.prompt(skills.get(s["skillKey"])) == s["prompt"]
@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from skill_toolchain import compiler
+from skill_toolchain.compiler import build, check_sizes
+from skill_toolchain.config import load_config
+from skill_toolchain.registry import REGISTRY_PATH, compose_registry, dump_registry, is_composed, load_registry
+from skill_toolchain.runtime import RUNTIME_FIELDS, has_runtime_fields, runtime_fields
+from skill_toolchain.shards import SHARD_DIR
+
+
+def prompts(path) -> dict[str, str]:
+    return {s["skillKey"]: s["prompt"] for s in load_registry(path, materialize=True)["skills"]}
+
+
+def test_missing_state_adopts_committed_prompts(registry_copy, tmp_path):
+    before = prompts(registry_copy)
+    state = tmp_path / "state.json"
+
+    result = build(registry_copy, state_path=state)
+
+    assert result["adopted"]
+    assert result["rendered"] == []
+    assert sorted(result["untouched"]) == sorted(before)
+    assert prompts(registry_copy) == before
+    assert set(json.loads(state.read_text(encoding="utf-8"))["skills"]) == set(before)
+
+
+def test_build_after_adoption_is_incremental(registry_copy, tmp_path):
+    state = tmp_path / "state.json"
+    build(registry_copy, state_path=state)
+    assert build(registry_copy, state_path=state)["rendered"] == []
+
+    registry = load_registry(registry_copy)
+    registry["skills"][0]["prompt"] = ""
+    dump_registry(registry, registry_copy)
+
+    result = build(registry_copy, state_path=state)
+    assert not result["adopted"]
+    assert result["rendered"] == [registry["skills"][0]["skillKey"]]
+
+
+def test_schema_edit_keeps_the_prompt(registry_copy, tmp_path):
+    state = tmp_path / "state.json"
+    build(registry_copy, state_path=state)
+    before = prompts(registry_copy)
+
+    registry = load_registry(registry_copy)
+    changed = registry["skills"][0]
+    schema = json.loads(changed["outputSchema"])
+    schema.setdefault("properties", {})["extraNote_he"] = {"type": "string"}
+    changed["outputSchema"] = json.dumps(schema, ensure_ascii=False)
+    dump_registry(registry, registry_copy)
+
+    result = build(registry_copy, state_path=state)
+    assert result["rendered"] == [] and result["kept"] == []
+    assert prompts(registry_copy) == before
+
+
+def test_template_change_only_rerenders_generated_prompts(registry_copy, tmp_path, monkeypatch):
+    state = tmp_path / "state.json"
+    registry = load_registry(registry_copy)
+    generated, edited = registry["skills"][0]["skillKey"], registry["skills"][1]["skillKey"]
+    registry["skills"][0]["prompt"] = registry["skills"][1]["prompt"] = ""
+    dump_registry(registry, registry_copy)
+    build(registry_copy, state_path=state)
+    hand_written = {k: v for k, v in prompts(registry_copy).items() if k not in (generated, edited)}
+
+    registry = load_registry(registry_copy)
+    registry["skills"][1]["prompt"] += "\nEdited by hand."
+    dump_registry(registry, registry_copy)
+    monkeypatch.setattr(compiler, "template_fingerprint", lambda: "changed templates")
+
+    result = build(registry_copy, state_path=state)
+    assert result["rendered"] == [generated]
+    assert sorted(result["kept"]) == sorted([edited, *hand_written])
+    after = prompts(registry_copy)
+    assert after[edited].endswith("\nEdited by hand.")
+    assert {k: after[k] for k in hand_written} == hand_written
+
+
+def test_force_renders_without_state(registry_copy, tmp_path):
+    result = build(registry_copy, state_path=tmp_path / "state.json", force=True)
+    assert not result["adopted"]
+    assert len(result["rendered"]) == len(prompts(registry_copy))
+
+
+def test_composed_mode_is_kept_until_materialized(registry_copy, tmp_path):
+    state = tmp_path / "state.json"
+    before = prompts(registry_copy)
+    build(registry_copy, state_path=state, composed=True)
+    assert is_composed(load_registry(registry_copy))
+
+    assert not build(registry_copy, state_path=state)["written"]
+    assert is_composed(load_registry(registry_copy))
+
+    assert build(registry_copy, state_path=state, composed=False)["written"]
+    assert not is_composed(load_registry(registry_copy))
+    assert prompts(registry_copy) == before
+
+
+def test_composed_build_factors_the_shared_blocks(registry_copy, tmp_path):
+    materialized = load_registry(registry_copy)
+    size = registry_copy.stat().st_size
+    build(registry_copy, state_path=tmp_path / "state.json", composed=True)
+
+    registry = load_registry(registry_copy)
+    assert registry["globalPrompt"]
+    expected = compose_registry(materialized)
+    assert (registry["globalPrompt"], registry["categoryPrompts"]) == (expected["globalPrompt"], expected["categoryPrompts"])
+    assert [s["prompt"] for s in registry["skills"]] == [s["prompt"] for s in expected["skills"]]
+    assert registry_copy.stat().st_size < size - 20_000
+
+
+def test_over_budget_skill_fails_the_build(registry_copy, tmp_path):
+    state = tmp_path / "state.json"
+    registry = load_registry(registry_copy)
+    over = registry["skills"][0]
+    over["prompt"] += "\n" + "Keep every answer short and specific. " * 1000
+    dump_registry(registry, registry_copy)
+    edited = registry_copy.read_bytes()
+
+    with pytest.raises(SystemExit, match=over["skillKey"]):
+        build(registry_copy, state_path=state, manifest=True)
+    assert registry_copy.read_bytes() == edited
+    assert not state.exists()
+
+    assert build(registry_copy, state_path=state, manifest=True, budget=False)["written"]
+
+
+def test_runtime_fields_go_to_the_shards_only(registry_copy, tmp_path):
+    registry = load_registry(registry_copy)
+    registry["skills"][0].update(runtime_fields(registry, registry["skills"][0]))
+    dump_registry(registry, registry_copy)
+
+    assert build(registry_copy, state_path=tmp_path / "state.json", shards=True)["written"]
+    assert not has_runtime_fields(load_registry(registry_copy))
+    shard_skills = [s for path in (tmp_path / "generated").glob("*.json") for s in load_registry(path)["skills"]]
+    assert len(shard_skills) == len(registry["skills"])
+    for s in shard_skills:
+        assert {k: s[k] for k in RUNTIME_FIELDS} == runtime_fields(registry, s)
+
+
+def test_committed_artifacts_are_within_their_size_budgets():
+    budgets = load_config().get("sizeBudgets", {})
+    shard_sizes = {p.name: p.stat().st_size for p in SHARD_DIR.glob("*.json")}
+    assert budgets["registry"] and budgets["shard"]
+    assert check_sizes(REGISTRY_PATH.stat().st_size, shard_sizes, budgets) == []
+
+
+def test_oversized_registry_fails_the_build(registry_copy, tmp_path, monkeypatch):
+    before = registry_copy.read_bytes()
+    registry = load_registry(registry_copy)
+    registry["skills"][0]["guidelines"] += " Keep it short." * 10
+    dump_registry(registry, registry_copy)
+    edited = registry_copy.read_bytes()
+    monkeypatch.setattr(compiler, "load_config", lambda: {"sizeBudgets": {"registry": len(before)}})
+
+    with pytest.raises(SystemExit, match="registry: .* bytes > budget"):
+        build(registry_copy, state_path=tmp_path / "state.json", manifest=True)
+    assert registry_copy.read_bytes() == edited
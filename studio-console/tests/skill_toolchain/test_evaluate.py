@@ -0,0 +1,36 @@
+import json
+
+from skill_toolchain.evaluate import case_id, json_diff, sampled_corpus
+from skill_toolchain.validation import is_valid
+
+
+def test_sampled_inputs_satisfy_the_input_schema():
+    # The sampler does not enforce `not`: unchecked, about a quarter of the draws are 0.
+    schema = {"type": "object", "required": ["n"], "properties": {"n": {"type": "integer", "minimum": 0,
+                                                                       "maximum": 3, "not": {"const": 0}}}}
+    skill = {"skillKey": "ux.example", "inputSchema": json.dumps(schema)}
+    cases = sampled_corpus([skill], 40, seed=0)["ux.example"]
+    assert cases and len({c["id"] for c in cases}) == len(cases) <= 40
+    assert all(is_valid(schema, c["input"]) for c in cases)
+
+
+def test_sampled_cases_are_identified_by_their_input():
+    schema = {"type": "object", "required": ["text"], "properties": {"text": {"type": "string", "minLength": 8}}}
+    skill = {"skillKey": "ux.example", "inputSchema": json.dumps(schema)}
+    few = sampled_corpus([skill], 3, seed=0)["ux.example"]
+    more = sampled_corpus([skill], 6, seed=0)["ux.example"]
+    other = sampled_corpus([skill], 6, seed=1)["ux.example"]
+
+    assert all(c["id"] == case_id(c["input"]) for c in few + more + other)
+    assert more[:3] == few
+    assert not {c["id"] for c in few} & {c["id"] for c in other}
+
+
+def test_json_diff_lists_changed_paths():
+    golden = {"a": 1, "b": [1, 2], "c": {"d": "x"}, "gone": True}
+    actual = {"a": 1, "b": [1, 3, 4], "c": {"d": "y"}, "new": None}
+    assert json_diff(golden, actual) == [
+        "$.b[1]: 2 -> 3", "$.b[2]: added", '$.c.d: "x" -> "y"', "$.gone: removed", "$.new: added",
+    ]
+    assert json_diff(golden, golden) == []
+    assert json_diff(1, True) == ["$: 1 -> true"]
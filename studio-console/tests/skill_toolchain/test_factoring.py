@@ -0,0 +1,43 @@
+from skill_toolchain.factoring import factor_prompts, factoring_report
+from skill_toolchain.registry import compose_registry, dump_registry, is_composed, load_registry, materialize_registry
+
+
+def test_factored_parts_reassemble_every_prompt(registry_copy):
+    skills = load_registry(registry_copy, materialize=True)["skills"]
+    global_block, categories, parts = factor_prompts(skills)
+    assert global_block
+    for s, (prefix, remainder) in zip(skills, parts):
+        assert prefix + global_block + categories.get(s.get("stage") or "", "") + remainder == s["prompt"]
+
+    report = factoring_report(skills)
+    assert report["skills"] == len(skills)
+    assert report["promptBytesAfter"] < report["promptBytesBefore"]
+
+
+def test_compose_and_materialize_round_trip(registry_copy):
+    original = load_registry(registry_copy, materialize=True)
+    composed = compose_registry(original)
+    assert is_composed(composed)
+
+    dump_registry(composed, registry_copy)
+    restored = load_registry(registry_copy, materialize=True)
+    assert [s["prompt"] for s in restored["skills"]] == [s["prompt"] for s in original["skills"]]
+    assert all("promptPrefix" not in s for s in restored["skills"])
+
+    # Composing composed input factors the same blocks again.
+    assert compose_registry(load_registry(registry_copy)) == composed
+    assert materialize_registry(composed)["skills"] == original["skills"]
+
+
+def test_single_skill_stages_get_no_category_block():
+    skills = [
+        {"skillKey": "a", "stage": "plan", "prompt": "Shared rules.\n\nPlan steps:\nPlan a.\n"},
+        {"skillKey": "b", "stage": "plan", "prompt": "Shared rules.\n\nPlan steps:\nPlan b.\n"},
+        {"skillKey": "c", "stage": "build", "prompt": "Shared rules.\n\nBuild c.\n"},
+    ]
+    global_block, categories, parts = factor_prompts(skills)
+    assert global_block == "Shared rules.\n\n"
+    assert categories == {"plan": "Plan steps:\n"}
+    assert [prefix + global_block + categories.get(s["stage"], "") + rest for s, (prefix, rest) in zip(skills, parts)] == [
+        s["prompt"] for s in skills
+    ]
@@ -0,0 +1,17 @@
+import importlib
+import pkgutil
+
+import pytest
+
+import skill_toolchain
+
+MODULES = sorted(m.name for m in pkgutil.iter_modules(skill_toolchain.__path__, "skill_toolchain."))
+
+
+def test_modules_found():
+    assert "skill_toolchain.compiler" in MODULES
+
+
+@pytest.mark.parametrize("name", MODULES)
+def test_module_imports(name):
+    importlib.import_module(name)
@@ -0,0 +1,29 @@
+import json
+
+from skill_toolchain.rendercache import RenderCache
+
+
+def test_memory_lru_evicts_least_recently_used(tmp_path):
+    cache = RenderCache("f" * 64, tmp_path, max_entries=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"
+    cache.put("d", "D")
+
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.get("b") is None
+    assert cache.stats["evicted"] == 1
+
+
+def test_saved_pack_is_trimmed_on_load(tmp_path):
+    cache = RenderCache("f" * 64, tmp_path)
+    for i in range(10):
+        cache.put(str(i), f"prompt {i}")
+    cache.save()
+    assert [p.name for p in tmp_path.iterdir()] == [cache.pack_path.name]
+    assert len(json.loads(cache.pack_path.read_text(encoding="utf-8"))["entries"]) == 10
+
+    reloaded = RenderCache("f" * 64, tmp_path, max_entries=4)
+    assert reloaded.get("9") == "prompt 9"
+    assert reloaded.get("0") is None
+    assert len(reloaded.entries) == 4
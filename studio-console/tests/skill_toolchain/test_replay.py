@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+from skill_toolchain.loadtest import Backend, Invocation
+from skill_toolchain.replay import ReplayStore, replay_key
+
+SCHEMA = {"type": "object", "properties": {"answer": {"type": "string"}}, "required": ["answer"]}
+REQUEST = {"instructions": "Answer in JSON.", "input": "question"}
+
+
+def invoke(backend: Backend, monkeypatch, output: dict):
+    async def call_json_schema(self, body, schema):
+        self.output_text = json.dumps(output)
+        self.response_bytes = len(self.output_text)
+        return output
+
+    monkeypatch.setattr(Invocation, "call_json_schema", call_json_schema)
+    call = backend.invocation()
+    return asyncio.run(backend.invoke(call, "ux.example", {"q": 1}, REQUEST, SCHEMA)), call
+
+
+def test_key_covers_prompt_schema_input_and_model():
+    key = replay_key("p", SCHEMA, {"q": 1}, "m")
+    assert key == replay_key("p", dict(reversed(SCHEMA.items())), {"q": 1}, "m")
+    assert len({key, replay_key("p2", SCHEMA, {"q": 1}, "m"), replay_key("p", {}, {"q": 1}, "m"),
+                replay_key("p", SCHEMA, {"q": 2}, "m"), replay_key("p", SCHEMA, {"q": 1}, "m2")}) == 5
+
+
+def test_valid_outputs_are_recorded_and_replayed(tmp_path, monkeypatch):
+    backend = Backend(object(), model="m", store=ReplayStore(tmp_path, mode="auto"))
+    invoke(backend, monkeypatch, {"answer": "yes"})
+
+    offline = Backend(None, model="m", store=ReplayStore(tmp_path, mode="replay"))
+    output, call = invoke(offline, monkeypatch, {"answer": "not called"})
+    assert output == {"answer": "yes"}
+    assert call.replayed
+
+
+def test_invalid_outputs_are_not_recorded(tmp_path, monkeypatch):
+    store = ReplayStore(tmp_path, mode="auto")
+    output, _ = invoke(Backend(object(), model="m", store=store), monkeypatch, {"wrong": 1})
+    assert output == {"wrong": 1}
+    assert store.stats["ux.example"]["recorded"] == 0
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+from skill_toolchain.registry import load_registry
+from skill_toolchain.sampling import compile_sampler, corpus_lines, exact, valid_instance
+from skill_toolchain.validation import is_valid
+
+KNOBS = {"min_items": 0, "max_items": 3, "min_str": 0, "max_str": 16}
+
+
+@pytest.mark.parametrize("schema", [
+    {"type": "integer", "minimum": 5000},
+    {"type": "number", "minimum": 5000},
+    {"type": "integer", "maximum": -5000},
+    {"type": "number", "exclusiveMaximum": -5000},
+    {"type": "integer", "exclusiveMinimum": 0, "exclusiveMaximum": 2},
+    {"type": "number", "exclusiveMinimum": 0, "exclusiveMaximum": 1},
+    {"type": "integer", "minimum": 2.5, "maximum": 3.5},
+    {"type": ["integer", "null"], "minimum": 1, "exclusiveMinimum": 3},
+])
+def test_numbers_stay_within_their_bounds(schema):
+    draw, rng = compile_sampler(schema), random.Random(0)
+    assert exact(schema)
+    assert all(is_valid(schema, draw(rng)) for _ in range(500))
+
+
+@pytest.mark.parametrize("schema", [
+    {"type": "integer", "exclusiveMinimum": 0, "exclusiveMaximum": 1},
+    {"type": "integer", "minimum": 2.5, "maximum": 2.9},
+    {"type": "string", "pattern": "^a+$"},
+    {"type": "array", "items": {"type": "integer"}, "uniqueItems": True},
+    {"type": "object", "required": ["x"]},
+    {"type": "object", "properties": {"y": {"type": "string"}}, "required": ["x", "y"]},
+    {"type": "string", "minLength": 5, "maxLength": 3},
+    {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 2},
+    {"type": "object", "minProperties": 3, "maxProperties": 1},
+    {"type": "object", "properties": {"inner": {"type": "string", "minLength": 2, "maxLength": 1}}},
+])
+def test_schemas_the_sampler_cannot_honour_are_not_exact(schema):
+    assert not exact(schema)
+
+
+@pytest.mark.parametrize("schema", [
+    {"type": "object", "required": ["x"]},
+    {"type": "string", "minLength": 5, "maxLength": 3},
+    {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 2},
+])
+def test_unsatisfiable_draws_are_caught_when_checked(schema):
+    draw = compile_sampler(schema)
+    assert not any(is_valid(schema, draw(random.Random(i))) for i in range(50))
+    with pytest.raises(ValueError):
+        valid_instance(schema, draw, random.Random(0), checked=not exact(schema))
+
+
+def test_length_knobs_respect_schema_bounds():
+    schema = {"type": "array", "minItems": 1, "maxItems": 4, "items": {"type": "string", "maxLength": 5}}
+    draw, rng = compile_sampler(schema, min_items=3, max_items=10, min_str=5, max_str=50), random.Random(0)
+    for _ in range(200):
+        value = draw(rng)
+        assert 3 <= len(value) <= 4
+        assert all(len(s) == 5 for s in value)
+
+
+def test_registry_corpus_is_valid_and_reproducible(registry_copy):
+    for skill in load_registry(registry_copy, materialize=True)["skills"]:
+        for field in ("input", "output"):
+            schema = json.loads(skill.get(f"{field}Schema") or "{}")
+            lines = list(corpus_lines(skill, field, 20, 7, KNOBS, near_miss_count=1))
+            assert lines == list(corpus_lines(skill, field, 20, 7, KNOBS, near_miss_count=1))
+            for line in lines:
+                assert is_valid(schema, line[field]) == line.get("valid", True), (skill["skillKey"], line["id"])
+
+
+def test_valid_instance_gives_up_on_unsatisfiable_schemas():
+    schema = {"type": "string", "pattern": "^never$"}
+    with pytest.raises(ValueError):
+        valid_instance(schema, compile_sampler(schema), random.Random(0))
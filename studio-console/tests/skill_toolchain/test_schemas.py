@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from skill_toolchain.registry import REGISTRY_PATH, load_registry
+from skill_toolchain.schemas import compile_skill_schema, equivalence_failures, minify_schema
+
+SKILLS = load_registry(REGISTRY_PATH)["skills"]
+
+
+@pytest.mark.parametrize("skill", SKILLS, ids=[s["skillKey"] for s in SKILLS])
+def test_minified_schema_is_equivalent(skill):
+    authoring = json.loads(skill.get("outputSchema") or "{}")
+    runtime = minify_schema(authoring)
+    assert equivalence_failures(authoring, runtime) == []
+    assert minify_schema(runtime) == runtime
+    assert list(runtime.get("properties", {})) == list(authoring.get("properties", {}))
+
+
+def test_minify_drops_annotations_and_defaults_only():
+    authoring = {
+        "title": "Out",
+        "type": "object",
+        "properties": {
+            "z_name": {"type": "string", "description": "z name", "minLength": 0},
+            "a_tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": False, "default": []},
+            "count": {"type": "integer", "minimum": 1, "description": "How many items to plan for."},
+        },
+        "required": ["z_name"],
+        "additionalProperties": True,
+    }
+    runtime = minify_schema(authoring)
+    assert runtime == {
+        "type": "object",
+        "properties": {
+            "z_name": {"type": "string"},
+            "a_tags": {"type": "array", "items": {"type": "string"}},
+            "count": {"type": "integer", "description": "How many items to plan for.", "minimum": 1},
+        },
+        "required": ["z_name"],
+    }
+    assert equivalence_failures(authoring, runtime) == []
+
+
+def test_inequivalent_runtime_schema_is_rejected():
+    authoring = {"type": "object", "properties": {"n": {"type": "integer", "maximum": 3}}, "required": ["n"]}
+    assert equivalence_failures(authoring, {"type": "object", "properties": {"n": {"type": "integer"}}, "required": ["n"]})
+
+    skill = {"skillKey": "demo", "outputSchema": json.dumps(authoring)}
+    assert compile_skill_schema(skill) == authoring
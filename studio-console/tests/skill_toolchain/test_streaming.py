@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from skill_toolchain.canonical import dump_bytes
+from skill_toolchain.registry import compose_registry, dump_registry, load_registry, materialize_registry
+from skill_toolchain.streaming import iter_registry_events, transform, write_registry_events
+
+
+def streamed(path, **kwargs) -> bytes:
+    out = io.StringIO()
+    write_registry_events(transform(path, [], **kwargs), out)
+    return out.getvalue().encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [7, 4096, 1 << 20])
+def test_streamed_registry_matches_dump_registry(registry_copy, chunk_size):
+    assert streamed(registry_copy, chunk_size=chunk_size) == registry_copy.read_bytes()
+
+
+def test_composed_input_streams_out_materialized(registry_copy):
+    registry = load_registry(registry_copy)
+    dump_registry(compose_registry(registry), registry_copy)
+    assert streamed(registry_copy) == dump_bytes(materialize_registry(load_registry(registry_copy)), shape="registry")
+
+
+def test_events_cover_every_skill_in_order(registry_copy):
+    registry = load_registry(registry_copy)
+    skills = [payload for kind, payload in iter_registry_events(registry_copy, 64) if kind == "skill"]
+    assert skills == registry["skills"]
+
+
+def test_jsonl_round_trip(registry_copy, tmp_path):
+    jsonl = tmp_path / "registry.jsonl"
+    with jsonl.open("w", encoding="utf-8") as f:
+        count = write_registry_events(transform(registry_copy, [], fields_first=True), f, jsonl=True)
+    assert count == len(load_registry(registry_copy)["skills"])
+    assert streamed(jsonl) == registry_copy.read_bytes()
@@ -0,0 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from skill_toolchain.templatepack import SOURCE_DIR, TemplatePack, compile_pack
+
+
+def test_concurrent_compiles_leave_one_complete_pack(tmp_path):
+    source = sorted(SOURCE_DIR.glob("*.json"))[0]
+    target = tmp_path / "packs" / f"{source.stem}.pack"
+
+    def compile_and_open(_):
+        header = compile_pack(source, target)
+        return TemplatePack(target).digests == header["digests"]
+
+    with ThreadPoolExecutor(8) as pool:
+        assert all(pool.map(compile_and_open, range(64)))
+    assert [p.name for p in target.parent.iterdir()] == [target.name]